@@ -4,6 +4,9 @@ from agents import Agent, Runner, WebSearchTool, ModelSettings, set_default_open
 from agents.mcp import MCPServerStdio
 from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
 from openai.types.shared import Reasoning
+from tools.write_files_tool import write_files_tool
+from workflow.mcp_pool import DEFAULT_SESSION_TIMEOUT_SECONDS
+from workflow.resilience import apply_call_policies, load_call_policies, team_agents
 
 load_dotenv(override=True)
 set_default_openai_api(os.getenv("OPENAI_API_KEY"))
@@ -12,7 +15,7 @@ async def main() -> None:
     async with MCPServerStdio(
             name="Codex CLI",
             params={"command": "codex", "args": ["mcp-server"]},
-            client_session_timeout_seconds=360000,
+            client_session_timeout_seconds=DEFAULT_SESSION_TIMEOUT_SECONDS,
     ) as codex_mcp_server:
 
         designer = Agent(
@@ -27,10 +30,11 @@ async def main() -> None:
                 "- wireframe.md – simple text/ASCII wireframe if specified\n\n"
                 "Keep the output short and implementation-friendly.\n"
                 "When complete, hand off to the Project Manager with transfer_to_project_manager.\n"
-                "When creating files, call Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
+                "When creating files, write all of them in ONE write_files call; if that is not possible, "
+                "call Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
             ),
             # model="gpt-5",
-            tools=[WebSearchTool()],
+            tools=[WebSearchTool(), write_files_tool("designer")],
             mcp_servers=[codex_mcp_server],
         )
 
@@ -43,9 +47,11 @@ async def main() -> None:
                 "- index.html\n- styles.css (or inline)\n- game.js (or main.js)\n\n"
                 "Follow the Designer’s DOM structure; no extra features.\n"
                 "When complete, hand off to the Project Manager with transfer_to_project_manager.\n"
-                "When creating files, call Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
+                "When creating files, write all of them in ONE write_files call; if that is not possible, "
+                "call Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
             ),
             # model="gpt-5",
+            tools=[write_files_tool("frontend")],
             mcp_servers=[codex_mcp_server],
         )
 
@@ -59,9 +65,11 @@ async def main() -> None:
                 "- server.js (minimal API per requirements; in-memory storage)\n\n"
                 "Keep code simple and readable; no DB.\n"
                 "When complete, hand off to the Project Manager with transfer_to_project_manager.\n"
-                "When creating files, call Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
+                "When creating files, write all of them in ONE write_files call; if that is not possible, "
+                "call Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
             ),
             # model="gpt-5",
+            tools=[write_files_tool("backend")],
             mcp_servers=[codex_mcp_server],
         )
 
@@ -74,9 +82,11 @@ async def main() -> None:
                 "- TEST_PLAN.md\n- test.sh (optional)\n\n"
                 "Keep it minimal.\n"
                 "When complete, hand off to the Project Manager with transfer_to_project_manager.\n"
-                "When creating files, call Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
+                "When creating files, write all of them in ONE write_files call; if that is not possible, "
+                "call Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
             ),
             # model="gpt-5",
+            tools=[write_files_tool("tester")],
             mcp_servers=[codex_mcp_server],
         )
 
@@ -97,7 +107,8 @@ async def main() -> None:
 
                 Process:
                 - Resolve ambiguities with minimal assumptions; be specific.
-                - Create files using Codex MCP with {"approval-policy":"never","sandbox":"workspace-write"}.
+                - Create all three files in ONE write_files call (project root only); it also reports whether they exist.
+                  Fall back to Codex MCP with {"approval-policy":"never","sandbox":"workspace-write"}.
 
                 Handoffs (gated by required files):
                 1) After the three root files exist, hand off to the Designer (transfer_to_designer).
@@ -112,6 +123,7 @@ async def main() -> None:
             ),
             model="gpt-5",
             model_settings=ModelSettings(reasoning=Reasoning(effort="medium")),
+            tools=[write_files_tool("project_manager")],
             handoffs=[designer, frontend, backend, tester],
             mcp_servers=[codex_mcp_server],
         )
@@ -143,6 +155,8 @@ Constraints:
 - All outputs should be small files saved in clearly named folders.
 """
 
+        # Per-agent call timeouts, retries and hedging (workflow/resilience.py)
+        apply_call_policies(team_agents(project_manager), load_call_policies())
         result = await Runner.run(project_manager, task_list, max_turns=30)
         print(result.final_output)
 
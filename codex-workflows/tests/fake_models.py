@@ -0,0 +1,95 @@
+"""
+Scripted stand-in for the model provider used by the workflow tests (no network).
+
+FakeModel recognises the stage agent from its instructions. On its first turn it writes
+all of the agent's deliverables with one write_files call (plus the MCP `echo` tool when
+the agent has one); once tool results are in the input it replies with a one-line summary.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+from agents import ModelResponse, Usage
+from agents.models.interface import Model, ModelProvider
+from openai.types.responses import ResponseFunctionToolCall, ResponseOutputMessage, ResponseOutputText
+
+from tools.workspace_root import workspace_root
+from workflow.team import STAGE_OUTPUTS
+
+# Instruction marker -> stage, checked in order (Frontend also mentions design_spec.md).
+ROLE_MARKERS = [
+    ("You are the Project Manager", "project_manager"),
+    ("You are the Designer", "designer"),
+    ("index.html", "frontend"),
+    ("server.js", "backend"),
+    ("TEST_PLAN.md", "tester"),
+]
+
+# Deliverables that must pass the workspace index content rules.
+CONTENT = {
+    "frontend/index.html": (
+        "<!doctype html>\n<html><head><title>Bug Busters</title></head>\n"
+        "<body><div id=\"game\"></div><script src=\"game.js\"></script></body></html>\n"
+    ),
+    "frontend/game.js": "const game = document.getElementById('game');\ngame.textContent = 'Score: 0';\n",
+    "backend/server.js": "const http = require('http');\nhttp.createServer((req, res) => res.end('[]')).listen(3000);\n",
+    "backend/package.json": '{"name": "bug-busters", "scripts": {"start": "node server.js"}}\n',
+}
+
+
+def stage_of(system_instructions: Optional[str]) -> str:
+    for marker, stage in ROLE_MARKERS:
+        if marker in (system_instructions or ""):
+            return stage
+    raise AssertionError(f"FakeModel does not know this agent: {system_instructions!r:.80}")
+
+
+def _has_tool_results(input: Any) -> bool:
+    return isinstance(input, list) and any(
+        isinstance(item, dict) and item.get("type") == "function_call_output" for item in input
+    )
+
+
+def _call(stage: str, index: int, name: str, arguments: Dict[str, Any]) -> ResponseFunctionToolCall:
+    return ResponseFunctionToolCall(
+        type="function_call", id=f"fc_{stage}_{index}", call_id=f"call_{stage}_{index}",
+        name=name, arguments=json.dumps(arguments),
+    )
+
+
+def _message(stage: str, text: str) -> ResponseOutputMessage:
+    return ResponseOutputMessage(
+        type="message", id=f"msg_{stage}", role="assistant", status="completed",
+        content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+    )
+
+
+class FakeModel(Model):
+    def __init__(self):
+        self.calls: List[str] = []
+        self.prompts: Dict[str, str] = {}  # stage -> last system instructions
+
+    async def get_response(self, system_instructions, input, model_settings, tools, *args, **kwargs) -> ModelResponse:
+        stage = stage_of(system_instructions)
+        self.calls.append(stage)
+        self.prompts[stage] = system_instructions
+        tool_names = {t.name for t in tools}
+        if _has_tool_results(input):
+            output = [_message(stage, f"Wrote {', '.join(STAGE_OUTPUTS[stage])}")]
+        else:
+            files = [{"path": path, "content": CONTENT.get(path, f"# {path}\n")} for path in STAGE_OUTPUTS[stage]]
+            output = [_call(stage, 0, "write_files", {"files": files})]
+            if "echo" in tool_names:
+                output.append(_call(stage, len(output), "echo", {"text": stage, "cwd": str(workspace_root())}))
+        usage = Usage(requests=1, input_tokens=100, output_tokens=10, total_tokens=110)
+        return ModelResponse(output=output, usage=usage, response_id=None)
+
+    def stream_response(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+class FakeModelProvider(ModelProvider):
+    def __init__(self):
+        self.model = FakeModel()
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return self.model
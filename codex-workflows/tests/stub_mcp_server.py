@@ -0,0 +1,67 @@
+"""
+Minimal MCP stdio server used by the MCP pool tests (no network, no Codex CLI).
+
+Speaks newline-delimited JSON-RPC on stdin/stdout and exposes two tools:
+- echo: returns its `text` argument plus this process's pid.
+- crash: exits the process immediately (simulates a Codex MCP crash).
+"""
+import json
+import os
+import sys
+
+TOOLS = [
+    {
+        "name": "echo",
+        "description": "Echo text back with the server pid.",
+        "inputSchema": {"type": "object", "properties": {"text": {"type": "string"}}},
+    },
+    {
+        "name": "crash",
+        "description": "Exit the server process.",
+        "inputSchema": {"type": "object", "properties": {}},
+    },
+]
+
+
+def reply(msg_id, result):
+    sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": msg_id, "result": result}) + "\n")
+    sys.stdout.flush()
+
+
+def main() -> int:
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        msg = json.loads(line)
+        method = msg.get("method")
+        msg_id = msg.get("id")
+        if msg_id is None:
+            continue  # notifications (e.g. notifications/initialized)
+        if method == "initialize":
+            reply(msg_id, {
+                "protocolVersion": msg["params"].get("protocolVersion", "2025-06-18"),
+                "capabilities": {"tools": {"listChanged": False}},
+                "serverInfo": {"name": "stub-mcp", "version": "0.1.0"},
+            })
+        elif method == "ping":
+            reply(msg_id, {})
+        elif method == "tools/list":
+            reply(msg_id, {"tools": TOOLS})
+        elif method == "tools/call":
+            params = msg.get("params") or {}
+            if params.get("name") == "crash":
+                os._exit(1)
+            text = (params.get("arguments") or {}).get("text", "")
+            reply(msg_id, {"content": [{"type": "text", "text": f"{text} pid={os.getpid()}"}], "isError": False})
+        else:
+            sys.stdout.write(json.dumps({
+                "jsonrpc": "2.0", "id": msg_id,
+                "error": {"code": -32601, "message": f"Method not found: {method}"},
+            }) + "\n")
+            sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
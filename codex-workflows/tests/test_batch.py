@@ -0,0 +1,88 @@
+"""
+Tests for batch mode and per-run workspaces (no network, no LLM calls).
+Run: python -m pytest tests/test_batch.py
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from tools.check_files_tool import check_paths
+from tools.workspace_index import _INDEXES
+from tools.workspace_root import use_workspace, workspace_root
+from tools.workspace_tools import reset_workspace
+from workflow import batch
+from workflow.dag import DagScheduler, Stage
+from workflow.mcp_pool import MCPServerPool, codex_server_factory
+
+STUB = str(Path(__file__).with_name("stub_mcp_server.py"))
+
+
+def test_workspace_root_is_isolated_per_task(tmp_path):
+    async def run(name):
+        with use_workspace(tmp_path / name):
+            reset_workspace()
+            (workspace_root() / f"{name}.md").write_text(name)
+            await asyncio.sleep(0.01)
+            return check_paths([f"{name}.md", "design"])["missing"], workspace_root().name
+
+    async def both():
+        return await asyncio.gather(run("a"), run("b"))
+
+    (missing_a, root_a), (missing_b, root_b) = asyncio.run(both())
+    assert (root_a, root_b) == ("a", "b")
+    assert missing_a == missing_b == ["design"]  # directories are not files
+    assert (tmp_path / "b" / "frontend").is_dir()
+
+
+def test_token_bucket_paces_acquisitions():
+    async def scenario():
+        bucket = batch.TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert 0.08 <= asyncio.run(scenario()) < 0.5
+
+
+def test_load_specs_defaults_and_sanitizes_ids(tmp_path):
+    specs = tmp_path / "specs.jsonl"
+    specs.write_text(json.dumps({"task_list": "a"}) + "\n\n" + json.dumps({"id": "x/y", "task_list": "b"}) + "\n")
+    assert [s["id"] for s in batch.load_specs(specs)] == ["run-0001", "x_y"]
+
+
+def test_run_batch_writes_summary(tmp_path, monkeypatch):
+    in_flight = {"now": 0, "max": 0}
+
+    async def fake_pipeline(server, task_list, max_turns=30, cache=None, invalidate=()):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.05)
+        in_flight["now"] -= 1
+        if task_list == "slow":
+            await asyncio.sleep(5)
+
+        async def write(feedback):
+            (workspace_root() / "REQUIREMENTS.md").write_text(task_list)
+
+        scheduler = DagScheduler([Stage("project_manager", write)])
+        await scheduler.run()
+        return scheduler
+
+    monkeypatch.setattr(batch, "run_stage_pipeline", fake_pipeline)
+    specs = [{"id": f"r{i}", "task_list": f"t{i}"} for i in range(5)] + [{"id": "slow", "task_list": "slow", "timeout_s": 0.2}]
+    pool = MCPServerPool(codex_server_factory(command=sys.executable, args=[STUB]), size=2)
+
+    summaries = asyncio.run(batch.run_batch(specs, tmp_path, concurrency=2, rate=100, burst=10, pool=pool))
+
+    by_id = {s["id"]: s for s in summaries}
+    assert in_flight["max"] == 2
+    assert by_id["r3"]["status"] == "ok"
+    assert by_id["slow"]["status"] == "timeout"
+    assert (tmp_path / "runs" / "r3" / "REQUIREMENTS.md").read_text() == "t3"
+    assert "REQUIREMENTS.md" not in by_id["r3"]["missing"]
+    assert not [root for root in _INDEXES if (tmp_path / "runs") in root.parents]
+    lines = (tmp_path / "summary.jsonl").read_text().splitlines()
+    assert len(lines) == 6
@@ -0,0 +1,85 @@
+"""
+Tests for checkpoint journals and resuming a failed DAG run (no network, no LLM calls).
+Run: python -m pytest tests/test_checkpoint.py
+"""
+import asyncio
+
+import pytest
+
+from tools.check_files_tool import check_paths
+from tools.workspace_root import use_workspace, workspace_root
+from workflow.checkpoint import CheckpointJournal
+from workflow.dag import DagScheduler, Stage
+
+OUTPUTS = {"pm": ["pm.md"], "designer": ["design.md"], "frontend": ["front.md"], "backend": ["back.md"]}
+DEPS = {"pm": [], "designer": ["pm"], "frontend": ["designer"], "backend": ["designer"]}
+
+
+def build(log, fail=()):
+    def runner(name):
+        async def run(feedback):
+            log.append(name)
+            if name in fail:
+                raise RuntimeError(f"{name} crashed")
+            for path in OUTPUTS[name]:
+                (workspace_root() / path).write_text(f"{name} output\n")
+            return name
+        return run
+
+    return [
+        Stage(name, runner(name), deps=DEPS[name], gate=lambda name=name: check_paths(OUTPUTS[name]),
+              outputs=OUTPUTS[name])
+        for name in DEPS
+    ]
+
+
+def test_resume_starts_at_first_incomplete_stage(tmp_path):
+    with use_workspace(tmp_path):
+        journal = CheckpointJournal.create({"task_list": "demo"})
+        log = []
+        with pytest.raises(RuntimeError):
+            asyncio.run(DagScheduler(build(log, fail={"backend"}), checkpoint=journal).run())
+        assert set(journal.passed()) >= {"pm", "designer"}
+
+        resumed = CheckpointJournal.load(journal.run_id)
+        assert resumed.meta == {"task_list": "demo"}
+        log.clear()
+        scheduler = DagScheduler(build(log), checkpoint=resumed)
+        results = asyncio.run(scheduler.run())
+
+    assert "pm" not in log and "designer" not in log and "backend" in log
+    assert results["pm"].resumed and results["designer"].resumed
+    assert not results["backend"].resumed
+    assert set(resumed.passed()) == set(DEPS)
+
+
+def test_changed_artifact_reruns_stage_and_its_dependents(tmp_path):
+    with use_workspace(tmp_path):
+        journal = CheckpointJournal.create({})
+        asyncio.run(DagScheduler(build([]), checkpoint=journal).run())
+
+        (tmp_path / "design.md").write_text("edited by hand\n")
+        log = []
+        results = asyncio.run(DagScheduler(build(log), checkpoint=CheckpointJournal.load(journal.run_id)).run())
+
+    assert sorted(log) == ["backend", "designer", "frontend"]
+    assert results["pm"].resumed
+
+
+def test_invalidated_stage_is_not_resumed(tmp_path):
+    with use_workspace(tmp_path):
+        journal = CheckpointJournal.create({})
+        asyncio.run(DagScheduler(build([]), checkpoint=journal).run())
+        log = []
+        asyncio.run(DagScheduler(build(log), checkpoint=journal, invalidate=["frontend"]).run())
+    assert log == ["frontend"]
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    with use_workspace(tmp_path):
+        journal = CheckpointJournal.create({"task_list": "demo"})
+        asyncio.run(DagScheduler(build([]), checkpoint=journal).run())
+        with journal.path.open("a") as f:
+            f.write('{"event": "stage_pa')
+        loaded = CheckpointJournal.load(journal.run_id)
+    assert set(loaded.passed()) == set(DEPS)
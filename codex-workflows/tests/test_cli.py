@@ -0,0 +1,71 @@
+"""
+Tests for the workflow CLI's lazy startup and queued logging (no network, no LLM calls).
+Run: python -m pytest tests/test_cli.py
+"""
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import threading
+from logging.handlers import QueueHandler
+from pathlib import Path
+
+import pytest
+
+from workflow.cli import parse_args
+from workflow.log_queue import setup_logging, stop_logging
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def python(*args, env=None):
+    return subprocess.run([sys.executable, *args], cwd=PROJECT_DIR, capture_output=True, text=True,
+                          env=dict(os.environ, **(env or {})))
+
+
+def test_cli_help_loads_no_sdk_and_writes_no_logs(tmp_path):
+    probe = python("-c", "import sys, workflow.cli; print(sorted({'agents', 'openai'} & set(sys.modules)))")
+    assert probe.returncode == 0 and probe.stdout.strip() == "[]"
+
+    result = python("-m", "workflow", "--help", env={"WORKFLOW_LOG_DIR": str(tmp_path / "logs")})
+    assert result.returncode == 0 and "--mode" in result.stdout
+    assert not (tmp_path / "logs").exists()
+
+
+def test_parse_args_validates_mode_specific_flags():
+    assert parse_args(["--invalidate", "backend"]).invalidate == ["backend"]
+    with pytest.raises(SystemExit):
+        parse_args(["--mode", "handoff", "--speculative"])
+    with pytest.raises(SystemExit):
+        parse_args(["--invalidate", "nope"])
+
+
+def test_records_are_written_by_the_listener_thread(tmp_path):
+    root = logging.getLogger()
+    saved = (root.level, list(root.handlers))
+    writers = set()
+
+    class ThreadRecorder(logging.Handler):
+        def emit(self, record):
+            writers.add(threading.current_thread().name)
+
+    async def log_from_loop():
+        logging.getLogger("workflow.test").info("from the loop %d", 42)
+
+    try:
+        listener = setup_logging(tmp_path, "INFO", run_id="t1")
+        assert [type(h) for h in root.handlers] == [QueueHandler]
+        listener.handlers += (ThreadRecorder(),)
+        asyncio.run(log_from_loop())
+        stop_logging(listener)
+    finally:
+        for h in list(root.handlers):
+            root.removeHandler(h)
+        root.setLevel(saved[0])
+        for h in saved[1]:
+            root.addHandler(h)
+
+    assert "from the loop 42" in (tmp_path / "workflow_t1.log").read_text()
+    assert "from the loop 42" in (tmp_path / "workflow_execution.log").read_text()
+    assert writers and threading.current_thread().name not in writers
@@ -0,0 +1,88 @@
+"""
+Tests for the shared context pack and per-agent prompt-cache reporting (no network, no LLM calls).
+Run: python -m pytest tests/test_context_pack.py
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from agents import RunConfig
+
+from fake_models import FakeModelProvider
+from tools.workspace_root import use_workspace
+from workflow.context_pack import DESIGN_DOCS, PM_DOCS, STAGE_CONTEXT, ContextPack
+from workflow.instrumentation import Tracer
+from workflow.mcp_pool import MCPServerPool, codex_server_factory
+from workflow.team import STAGE_DEPS, run_stage_pipeline
+
+STUB = str(Path(__file__).with_name("stub_mcp_server.py"))
+
+
+def write_docs(root: Path, newline: str = "\n") -> None:
+    for doc in PM_DOCS + DESIGN_DOCS:
+        (root / doc).parent.mkdir(parents=True, exist_ok=True)
+        (root / doc).write_bytes(newline.join([f"# {doc}", "", "- item one", "- item two", ""]).encode())
+
+
+def test_block_is_byte_stable_across_workspaces_and_newlines(tmp_path):
+    pack = ContextPack()
+    blocks = []
+    for name, newline in (("a", "\n"), ("b", "\r\n")):
+        write_docs(tmp_path / name, newline)
+        with use_workspace(tmp_path / name):
+            blocks.append(pack.block(STAGE_CONTEXT["frontend"]))
+            assert pack.block(STAGE_CONTEXT["frontend"]) is blocks[-1]  # memoized
+    assert blocks[0] == blocks[1] and pack.builds == 2  # different bytes on disk, same block
+    assert str(tmp_path) not in blocks[0] and "\r" not in blocks[0]
+    assert [line for line in blocks[0].splitlines() if line.startswith("## ")] == \
+        [f"## {doc}" for doc in PM_DOCS + DESIGN_DOCS]
+
+    with use_workspace(tmp_path / "a"):
+        (tmp_path / "a" / "TEST.md").write_text("# TEST.md\n- changed\n")
+        assert "- changed" in pack.block(STAGE_CONTEXT["frontend"])
+    assert pack.builds == 3
+
+
+def test_missing_and_oversized_documents(tmp_path):
+    (tmp_path / "REQUIREMENTS.md").write_text("x" * 100)
+    with use_workspace(tmp_path):
+        block = ContextPack(max_doc_bytes=10).block(["REQUIREMENTS.md", "TEST.md"])
+    assert "x" * 10 + "\n[... cut at 10 bytes ...]" in block and "x" * 11 not in block
+    assert "## TEST.md\n<<<\n(not written yet)\n>>>" in block
+
+
+def test_specialists_share_the_document_prefix(tmp_path):
+    provider = FakeModelProvider()
+
+    async def scenario():
+        factory = codex_server_factory(command=sys.executable, args=[STUB], client_session_timeout_seconds=10)
+        async with MCPServerPool(factory, size=1) as pool, pool.lease() as server:
+            await run_stage_pipeline(server, "Goal: a tiny game.", max_turns=10,
+                                     run_config=RunConfig(model_provider=provider, tracing_disabled=True))
+
+    with use_workspace(tmp_path):
+        asyncio.run(scenario())
+
+    prompts = provider.model.prompts
+    assert set(prompts) == set(STAGE_DEPS)
+    assert "Shared project context" not in prompts["project_manager"]
+    specialists = [prompts[s] for s in ("designer", "frontend", "backend", "tester")]
+    prefix = os.path.commonprefix(specialists)
+    assert all(f"## {doc}" in prefix for doc in PM_DOCS)
+    late = os.path.commonprefix([prompts[s] for s in ("frontend", "backend", "tester")])
+    assert all(f"## {doc}" in late for doc in DESIGN_DOCS)
+    assert prompts["designer"].index("You are the Designer") > prompts["designer"].index("## TEST.md")
+
+
+def test_token_summary_splits_cached_and_uncached_input():
+    tracer = Tracer()
+    for cached in (0, 800):
+        with tracer.span("llm", "model_call", agent="Frontend Developer", input_tokens=1000, cached_tokens=cached):
+            pass
+    with tracer.span("tool", "write_files", agent="Frontend Developer", input_tokens=5):
+        pass
+    (row,) = tracer.token_summary()
+    assert row["calls"] == 2 and row["input_tokens"] == 2000
+    assert row["cached_tokens"] == 800 and row["uncached_tokens"] == 1200 and row["cache_hit_pct"] == 40.0
+    assert "uncached_tokens" in tracer.format_token_summary()
@@ -0,0 +1,78 @@
+"""
+Tests for the DAG workflow scheduler (no network, no LLM calls).
+Run: python -m pytest tests/test_dag_scheduler.py
+"""
+import asyncio
+import time
+
+import pytest
+
+from workflow.dag import DagScheduler, GateFailed, Stage
+
+
+def sleeper(log, name, delay=0.0):
+    async def run(feedback):
+        log.append(("start", name, feedback))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        return name
+    return run
+
+
+def test_independent_stages_run_concurrently():
+    log = []
+    stages = [
+        Stage("pm", sleeper(log, "pm")),
+        Stage("designer", sleeper(log, "designer"), deps=["pm"]),
+        Stage("frontend", sleeper(log, "frontend", 0.2), deps=["designer"]),
+        Stage("backend", sleeper(log, "backend", 0.2), deps=["designer"]),
+        Stage("tester", sleeper(log, "tester"), deps=["frontend", "backend"]),
+    ]
+    scheduler = DagScheduler(stages)
+    assert scheduler.levels() == [["pm"], ["designer"], ["frontend", "backend"], ["tester"]]
+
+    start = time.perf_counter()
+    results = asyncio.run(scheduler.run())
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35  # sequential would be >= 0.4
+    assert all(r.ok for r in results.values())
+    order = [e[1] for e in log if e[0] == "start"]
+    assert order[:2] == ["pm", "designer"]
+    assert order[-1] == "tester"
+
+
+def test_gate_failure_retries_with_feedback():
+    log = []
+    calls = {"n": 0}
+
+    def gate():
+        calls["n"] += 1
+        return {"ok": calls["n"] > 1, "missing": [] if calls["n"] > 1 else ["design/wireframe.md"]}
+
+    scheduler = DagScheduler([Stage("designer", sleeper(log, "designer"), gate=gate)])
+    results = asyncio.run(scheduler.run())
+
+    assert results["designer"].attempts == 2
+    assert log[0] == ("start", "designer", None)
+    assert "design/wireframe.md" in log[2][2]
+
+
+def test_gate_failure_stops_dependents():
+    log = []
+    stages = [
+        Stage("pm", sleeper(log, "pm"), gate=lambda: {"ok": False, "missing": ["TEST.md"]}, max_attempts=1),
+        Stage("designer", sleeper(log, "designer"), deps=["pm"]),
+    ]
+    with pytest.raises(GateFailed) as exc:
+        asyncio.run(DagScheduler(stages).run())
+    assert exc.value.stage == "pm"
+    assert ("start", "designer", None) not in log
+
+
+def test_invalid_graphs_are_rejected():
+    noop = sleeper([], "x")
+    with pytest.raises(ValueError):
+        DagScheduler([Stage("a", noop, deps=["missing"])])
+    with pytest.raises(ValueError):
+        DagScheduler([Stage("a", noop, deps=["b"]), Stage("b", noop, deps=["a"])])
@@ -0,0 +1,109 @@
+"""
+Tests for atomic and chunked writes in the file tools.
+Run: python -m pytest tests/test_file_tools.py
+"""
+import asyncio
+import hashlib
+import json
+
+import pytest
+from agents.tool_context import ToolContext
+
+from tools.file_tools import (AtomicWriter, abort_text_file, abort_unfinished_writes, append_text_chunk,
+                              commit_text_file, open_text_file, write_text_file)
+from tools.workspace_index import workspace_index
+from tools.workspace_root import use_workspace
+from tools.workspace_tools import write_root_text_file
+
+
+def invoke(tool, **arguments):
+    """Call a function tool the way the Runner does."""
+    args = json.dumps(arguments)
+    ctx = ToolContext(context=None, tool_name=tool.name, tool_call_id="call_test", tool_arguments=args)
+    return asyncio.run(tool.on_invoke_tool(ctx, args))
+
+
+def test_write_text_file_reports_created_bytes_and_checksum(tmp_path):
+    with use_workspace(tmp_path):
+        first = invoke(write_text_file, path="frontend/game.js", content="let score = 0;\n")
+        second = invoke(write_text_file, path="frontend/game.js", content="let score = 1;\n")
+        refused = invoke(write_text_file, path="frontend/game.js", content="x", overwrite=False)
+
+    assert first["ok"] and first["created"] and not first["overwritten"]
+    assert second["created"] is False and second["overwritten"] is True
+    assert second["bytes"] == 15
+    assert second["sha256"] == hashlib.sha256(b"let score = 1;\n").hexdigest()
+    assert not refused["ok"] and refused["reason"] == "exists"
+    assert (tmp_path / "frontend" / "game.js").read_text() == "let score = 1;\n"
+    assert [p.name for p in (tmp_path / "frontend").iterdir()] == ["game.js"]  # no temp files left
+
+
+def test_chunked_write_is_invisible_until_commit(tmp_path):
+    chunks = ["// part %d\n" % i * 200 for i in range(5)]
+    with use_workspace(tmp_path):
+        handle = invoke(open_text_file, path="frontend/game.js")["handle"]
+        for i, chunk in enumerate(chunks, start=1):
+            appended = invoke(append_text_chunk, handle=handle, content=chunk)
+            assert appended["chunks"] == i
+            assert not (tmp_path / "frontend" / "game.js").exists()
+        result = invoke(commit_text_file, handle=handle)
+        entry = workspace_index().entries["frontend/game.js"]
+
+    data = "".join(chunks).encode("utf-8")
+    assert result["ok"] and result["created"] and result["chunks"] == 5
+    assert result["bytes"] == len(data) == appended["bytes"]
+    assert result["sha256"] == hashlib.sha256(data).hexdigest() == entry.sha256
+    assert (tmp_path / "frontend" / "game.js").read_bytes() == data
+    assert invoke(append_text_chunk, handle=handle, content="late")["ok"] is False
+
+
+def test_abort_and_failed_writes_leave_previous_content(tmp_path):
+    target = tmp_path / "game.js"
+    target.write_text("old")
+    with use_workspace(tmp_path):
+        handle = invoke(open_text_file, path="game.js")["handle"]
+        invoke(append_text_chunk, handle=handle, content="new, half written")
+        assert invoke(abort_text_file, handle=handle)["ok"]
+
+        writer = AtomicWriter(target)
+        writer.write(b"partial")
+        with pytest.raises(FileExistsError):
+            writer.commit(overwrite=False)
+
+    assert target.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["game.js"]
+
+
+def test_writes_left_open_by_a_run_are_aborted_when_it_ends(tmp_path):
+    with use_workspace(tmp_path):
+        with abort_unfinished_writes():
+            done = invoke(open_text_file, path="done.js")["handle"]
+            left = invoke(open_text_file, path="left.js")["handle"]
+            invoke(append_text_chunk, handle=left, content="half written")
+            assert invoke(commit_text_file, handle=done)["ok"]
+        assert invoke(append_text_chunk, handle=left, content="late")["ok"] is False
+    assert [p.name for p in tmp_path.iterdir()] == ["done.js"]
+
+
+def test_create_only_commit_without_hard_links(tmp_path, monkeypatch):
+    def no_links(src, dst):
+        raise PermissionError("hard links not supported")
+
+    monkeypatch.setattr("tools.file_tools.os.link", no_links)
+    (tmp_path / "taken.js").write_text("old")
+    with use_workspace(tmp_path):
+        for name in ("new.js", "taken.js"):
+            handle = invoke(open_text_file, path=name)["handle"]
+            invoke(append_text_chunk, handle=handle, content="new")
+            result = invoke(commit_text_file, handle=handle, overwrite=False)
+            assert result["ok"] is (name == "new.js")
+    assert (tmp_path / "new.js").read_text() == "new" and (tmp_path / "taken.js").read_text() == "old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new.js", "taken.js"]
+
+
+def test_write_root_text_file_is_atomic_and_rejects_subdirectories(tmp_path):
+    with use_workspace(tmp_path):
+        result = invoke(write_root_text_file, path="REQUIREMENTS.md", content="# Requirements\n")
+        nested = invoke(write_root_text_file, path="design/spec.md", content="x")
+    assert result["ok"] and result["created"] and result["sha256"]
+    assert not nested["ok"]
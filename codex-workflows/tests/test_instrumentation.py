@@ -0,0 +1,89 @@
+"""
+Tests for the workflow tracer and its Chrome-trace/summary exports.
+Run: python -m pytest tests/test_instrumentation.py
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from workflow.dag import DagScheduler, Stage
+from workflow.instrumentation import Tracer, TracingHooks
+from workflow.mcp_pool import MCPServerPool, codex_server_factory
+
+STUB = str(Path(__file__).with_name("stub_mcp_server.py"))
+
+
+def test_spans_export_to_chrome_trace_and_summary(tmp_path):
+    tracer = Tracer()
+    with tracer.span("tool", "check_files", agent="Designer", bytes_in=10):
+        pass
+    with tracer.span("tool", "check_files", agent="Designer"):
+        pass
+    with pytest.raises(ValueError):
+        with tracer.span("tool", "write_text_file", agent="Frontend Developer"):
+            raise ValueError("boom")
+
+    trace = json.loads(tracer.write_chrome_trace(tmp_path / "trace.json").read_text())
+    complete = [e for e in trace["traceEvents"] if e["ph"] in ("X", "i")]
+    lanes = {e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    assert len(complete) == 3
+    assert lanes == {"Designer", "Frontend Developer"}
+
+    rows = {(r["agent"], r["name"]): r for r in tracer.summary()}
+    assert rows[("Designer", "check_files")]["count"] == 2
+    assert rows[("Designer", "check_files")]["bytes_in"] == 10
+    assert rows[("Frontend Developer", "write_text_file")]["errors"] == 1
+    assert "check_files" in tracer.format_summary()
+
+
+def test_hooks_record_llm_tokens_and_tool_calls():
+    tracer = Tracer()
+    hooks = TracingHooks(tracer)
+    agent = SimpleNamespace(name="Designer")
+    tool = SimpleNamespace(name="write_text_file")
+    ctx = SimpleNamespace(tool_call_id="call_1", tool_arguments='{"path": "design/design_spec.md"}')
+    usage = SimpleNamespace(input_tokens=120, output_tokens=30,
+                            input_tokens_details=SimpleNamespace(cached_tokens=100))
+    response = SimpleNamespace(usage=usage, output=[])
+
+    async def scenario():
+        await hooks.on_llm_start(ctx, agent, "system", [{"role": "user", "content": "hi"}])
+        await hooks.on_llm_end(ctx, agent, response)
+        await hooks.on_tool_start(ctx, agent, tool)
+        await hooks.on_tool_end(ctx, agent, tool, {"ok": True})
+        await hooks.on_handoff(ctx, agent, SimpleNamespace(name="Project Manager"))
+
+    asyncio.run(scenario())
+    by_cat = {s.category: s for s in tracer.spans}
+    assert (by_cat["llm"].input_tokens, by_cat["llm"].cached_tokens) == (120, 100)
+    assert by_cat["tool"].bytes_in == len(ctx.tool_arguments)
+    assert by_cat["handoff"].name == "Designer -> Project Manager"
+
+
+def test_stage_and_mcp_spans():
+    tracer = Tracer()
+    attempts = {"n": 0}
+
+    def gate():
+        attempts["n"] += 1
+        return {"ok": attempts["n"] > 1, "missing": []}
+
+    async def stage(feedback):
+        async with pool.lease() as server:
+            await server.call_tool("echo", {"text": "hello"})
+
+    pool = MCPServerPool(codex_server_factory(command=sys.executable, args=[STUB]), size=1, tracer=tracer)
+
+    async def scenario():
+        async with pool:
+            await DagScheduler([Stage("designer", stage, gate=gate)], tracer=tracer).run()
+
+    asyncio.run(scenario())
+    stage_span = next(s for s in tracer.spans if s.category == "stage")
+    mcp_spans = [s for s in tracer.spans if s.category == "mcp"]
+    assert stage_span.retries == 1
+    assert len(mcp_spans) == 2 and mcp_spans[0].bytes_out > 0
@@ -0,0 +1,71 @@
+"""
+Tests for the backend load generator and the Backend load gate (starts local node servers).
+Run: python -m pytest tests/test_load_test_tool.py
+"""
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from tools import load_test_tool as lt
+from tools.workspace_root import use_workspace
+from workflow.team import stage_gate
+
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+needs_node = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    shutil.copytree(BACKEND, tmp_path / "backend")
+    with use_workspace(tmp_path):
+        yield tmp_path
+
+
+@needs_node
+def test_reports_throughput_latency_and_memory(workspace):
+    report = asyncio.run(lt.run_load_test("backend", duration_s=0.5, concurrency=4, warmup_requests=5))
+    assert report["requests"] > 0 and report["errors"] == 0 and report["error_rate"] == 0
+    assert report["rps"] > 0
+    latency = report["latency_ms"]
+    assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+    assert set(report["routes"]) == {"GET /scores", "POST /scores"}
+    assert report["routes"]["POST /scores"]["requests"] > 0
+    assert set(report["memory"]) == {"rss_start_mb", "rss_end_mb", "rss_peak_mb", "growth_mb"}
+
+
+@needs_node
+def test_backend_that_does_not_start_is_an_error(workspace):
+    (workspace / "backend" / "server.js").write_text("throw new Error('boom');\n")
+    result = asyncio.run(lt.load_gate("backend", lt.LoadThresholds(), duration_s=0.2))
+    assert not result["ok"] and "boom" in result["violations"][0]
+
+
+def test_thresholds_flag_each_violation():
+    report = {"rps": 50.0, "error_rate": 0.2, "latency_ms": {"p95": 120.0, "p99": 400.0},
+              "memory": {"growth_mb": 100.0}}
+    problems = lt.check_thresholds(report, lt.LoadThresholds())
+    assert len(problems) == 5 and problems[0].startswith("throughput")
+    ok = dict(report, rps=1000.0, error_rate=0.0, latency_ms={"p95": 1.0, "p99": 2.0}, memory={"growth_mb": None})
+    assert lt.check_thresholds(ok, lt.LoadThresholds()) == []
+
+
+def test_thresholds_load_from_json(tmp_path, monkeypatch):
+    path = tmp_path / "thresholds.json"
+    path.write_text('{"min_rps": 5000}')
+    monkeypatch.setenv("WORKFLOW_LOAD_THRESHOLDS", str(path))
+    assert lt.load_thresholds() == lt.LoadThresholds(min_rps=5000)
+    path.write_text('{"rps": 1}')
+    with pytest.raises(ValueError):
+        lt.load_thresholds(path)
+
+
+@needs_node
+def test_backend_gate_fails_on_missed_threshold(workspace, monkeypatch):
+    monkeypatch.setattr("workflow.team.LOAD_GATE_OPTIONS", {"duration_s": 0.3, "concurrency": 2})
+    gate = stage_gate("backend", lt.LoadThresholds(min_rps=1e9))
+    result = asyncio.run(gate())
+    assert not result["ok"]
+    assert "throughput" in result["invalid"]["backend/server.js"]
+    assert result["load_test"]["requests"] > 0
@@ -0,0 +1,72 @@
+"""
+Tests for the pooled MCP server, run against tests/stub_mcp_server.py (no network).
+Run: python -m pytest tests/test_mcp_pool.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from workflow.mcp_pool import MCPServerPool, codex_server_factory
+
+STUB = str(Path(__file__).with_name("stub_mcp_server.py"))
+
+
+def stub_factory():
+    return codex_server_factory(command=sys.executable, args=[STUB], client_session_timeout_seconds=10)
+
+
+def pid_of(result) -> str:
+    return result.content[0].text.split("pid=")[1]
+
+
+def test_servers_stay_warm_across_leases():
+    async def scenario():
+        async with MCPServerPool(stub_factory(), size=1) as pool:
+            async with pool.lease() as server:
+                first = pid_of(await server.call_tool("echo", {"text": "a"}))
+            async with pool.lease() as server:
+                second = pid_of(await server.call_tool("echo", {"text": "b"}))
+            return first, second, pool.metrics()
+
+    first, second, metrics = asyncio.run(scenario())
+    assert first == second
+    assert metrics["leases_total"] == 2
+    assert metrics["calls_total"] == 2
+    assert metrics["recycles"] == 0
+
+
+def test_concurrent_leases_use_distinct_servers():
+    async def scenario():
+        async with MCPServerPool(stub_factory(), size=2) as pool:
+            async def run():
+                async with pool.lease() as server:
+                    result = await server.call_tool("echo", {"text": "x"})
+                    await asyncio.sleep(0.05)
+                    return pid_of(result)
+            return await asyncio.gather(run(), run())
+
+    pids = asyncio.run(scenario())
+    assert len(set(pids)) == 2
+
+
+def test_recycle_after_max_calls_and_after_crash():
+    async def scenario():
+        async with MCPServerPool(stub_factory(), size=1, max_calls_per_server=2) as pool:
+            async with pool.lease() as server:
+                a = pid_of(await server.call_tool("echo", {"text": "1"}))
+                await server.call_tool("echo", {"text": "2"})
+            async with pool.lease() as server:
+                b = pid_of(await server.call_tool("echo", {"text": "3"}))
+                try:
+                    await server.call_tool("crash", {})
+                except Exception:
+                    pass
+            async with pool.lease() as server:
+                c = pid_of(await server.call_tool("echo", {"text": "4"}))
+            return a, b, c, pool.metrics()
+
+    a, b, c, metrics = asyncio.run(scenario())
+    assert a != b != c
+    assert metrics["recycles"] == 2
+    assert metrics["call_failures"] == 1
+    assert metrics["generations"] == [3]
@@ -0,0 +1,87 @@
+"""
+Tests for record/replay and the offline workflow benchmark (no network, no LLM calls).
+Run: python -m pytest tests/test_replay.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from agents import RunConfig
+
+from fake_models import FakeModelProvider
+from tools.workspace_root import use_workspace
+from workflow import benchmark
+from workflow.instrumentation import Tracer
+from workflow.mcp_pool import MCPServerPool, codex_server_factory
+from workflow.replay import Cassette, RecordingMCPServer, RecordingModelProvider, ReplayMismatch
+from workflow.team import STAGE_DEPS, run_stage_pipeline
+
+STUB = str(Path(__file__).with_name("stub_mcp_server.py"))
+TASK_LIST = "Goal: build a tiny game with a scores API."
+
+
+def record(tmp_path) -> Cassette:
+    cassette = Cassette()
+    cassette.meta = {"mode": "dag", "task_list": TASK_LIST, "max_turns": 10}
+    provider = FakeModelProvider()
+    run_config = RunConfig(model_provider=RecordingModelProvider(cassette, inner=provider), tracing_disabled=True)
+
+    async def scenario():
+        factory = codex_server_factory(command=sys.executable, args=[STUB], client_session_timeout_seconds=10)
+        async with MCPServerPool(factory, size=1) as pool, pool.lease() as server:
+            await run_stage_pipeline(RecordingMCPServer(server, cassette), TASK_LIST, max_turns=10,
+                                     run_config=run_config)
+
+    with use_workspace(tmp_path / "recorded"):
+        asyncio.run(scenario())
+    return cassette
+
+
+def test_replay_reproduces_recorded_run_offline(tmp_path):
+    cassette = record(tmp_path)
+    assert len(cassette.models) == len(STAGE_DEPS)  # one response stream per stage agent
+    assert cassette.mcp_tools and sum(len(v) for v in cassette.mcp_calls.values()) == 4
+
+    path = cassette.save(tmp_path / "cassette.json")
+    report = asyncio.run(benchmark.run_benchmark(Cassette.load(path), repeat=2))
+
+    assert set(report["stages"]) == set(STAGE_DEPS)
+    pm = report["stages"]["project_manager"]
+    assert pm["turns"] == 2
+    assert pm["tool_calls"] == {"write_files": 1}
+    assert report["stages"]["designer"]["tool_calls"] == {"echo": 1, "write_files": 1}
+    assert report["totals"]["turns"] == 2 * len(STAGE_DEPS)
+    assert report["totals"]["handoffs"] == 0
+    assert report["totals"]["repeats"] == 2
+    assert all(s["overhead_ms"] >= 0 for s in report["stages"].values())
+
+
+def test_replay_fails_loudly_when_cassette_runs_out(tmp_path):
+    cassette = record(tmp_path)
+    for stream in cassette.models.values():
+        del stream[-1]
+    with pytest.raises(ReplayMismatch):
+        asyncio.run(benchmark.replay_once(cassette))
+
+
+def test_compare_flags_count_and_overhead_regressions():
+    baseline = {"totals": {"turns": 10, "handoffs": 0, "tool_calls": 12, "overhead_ms": 100.0}}
+    same = {"totals": dict(baseline["totals"], overhead_ms=120.0)}
+    worse = {"totals": {"turns": 11, "handoffs": 0, "tool_calls": 12, "overhead_ms": 200.0}}
+    assert benchmark.compare(same, baseline, max_overhead_regression=0.5) == []
+    problems = benchmark.compare(worse, baseline, max_overhead_regression=0.5)
+    assert len(problems) == 2 and problems[0].startswith("turns regressed")
+
+
+def test_stage_report_groups_spans_by_stage():
+    tracer = Tracer()
+    with tracer.span("stage", "designer", agent="stage:designer"):
+        with tracer.span("llm", "model_call", agent="Designer"):
+            pass
+        with tracer.span("tool", "write_text_file", agent="Designer"):
+            pass
+    report = benchmark.stage_report(tracer)
+    assert report["designer"]["turns"] == 1
+    assert report["designer"]["tool_calls"] == {"write_text_file": 1}
+    assert report["designer"]["wall_ms"] >= report["designer"]["tool_ms"]
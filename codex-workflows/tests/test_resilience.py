@@ -0,0 +1,185 @@
+"""
+Tests for hedged/retried model calls and per-stage budgets, against a local fake provider
+that injects latency and failures (no network, no LLM calls).
+Run: python -m pytest tests/test_resilience.py
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import openai
+import pytest
+from agents import Agent, RunConfig
+from agents.models.interface import Model, ModelProvider
+
+from fake_models import FakeModelProvider
+from tools.workspace_root import use_workspace
+from workflow import resilience, team
+from workflow.mcp_pool import MCPServerPool, codex_server_factory
+from workflow.resilience import CallPolicy, LatencyTracker, ResilientModel, StageTimeout
+from workflow.team import STAGE_DEPS, run_stage_pipeline
+
+STUB = str(Path(__file__).with_name("stub_mcp_server.py"))
+FAST = CallPolicy(call_timeout_s=1.0, stage_timeout_s=None, retries=3, backoff_s=0.001, backoff_max_s=0.01)
+
+
+def connection_error() -> openai.APIConnectionError:
+    return openai.APIConnectionError(request=None)
+
+
+class ScriptedModel(Model):
+    """Each call pops (delay_s, error_or_None) from the script; the result is the call number."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.started = 0
+        self.cancelled = 0
+
+    async def get_response(self, *args, **kwargs):
+        self.started += 1
+        number = self.started
+        delay, error = self.script.pop(0) if self.script else (0.0, None)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if error is not None:
+            raise error
+        return number
+
+    def stream_response(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+class FaultyProvider(ModelProvider):
+    """Wraps FakeModelProvider: adds `delay_s` to every call and fails every agent's first call."""
+
+    def __init__(self, delay_s: float = 0.0):
+        self.inner = FakeModelProvider()
+        self.delay_s = delay_s
+        self.failed = set()
+
+    def get_model(self, model_name):
+        provider = self
+
+        class Faulty(Model):
+            async def get_response(self, system_instructions, *args, **kwargs):
+                await asyncio.sleep(provider.delay_s)
+                if system_instructions not in provider.failed:
+                    provider.failed.add(system_instructions)
+                    raise connection_error()
+                return await provider.inner.model.get_response(system_instructions, *args, **kwargs)
+
+            def stream_response(self, *args, **kwargs):
+                raise NotImplementedError
+
+        return Faulty()
+
+
+def test_transient_errors_are_retried_with_backoff():
+    inner = ScriptedModel([(0, connection_error()), (0, asyncio.TimeoutError()), (0, None)])
+    model = ResilientModel(inner, "Designer", FAST)
+    assert asyncio.run(model.get_response()) == 3
+    assert model.stats["retries"] == 2 and model.stats["failures"] == 0
+
+
+def test_non_transient_error_is_not_retried():
+    inner = ScriptedModel([(0, ValueError("bad request"))])
+    model = ResilientModel(inner, "Designer", FAST)
+    with pytest.raises(ValueError):
+        asyncio.run(model.get_response())
+    assert inner.started == 1 and model.stats["failures"] == 1
+
+
+def test_stalled_call_times_out_and_retries_are_bounded():
+    inner = ScriptedModel([(5, None)] * 3)
+    model = ResilientModel(inner, "Tester", CallPolicy(call_timeout_s=0.05, retries=2, backoff_s=0.001))
+    start = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(model.get_response())
+    assert time.monotonic() - start < 1.0
+    assert model.stats["timeouts"] == 3 and inner.cancelled == 3
+
+
+def test_hedged_request_wins_and_loser_is_cancelled():
+    inner = ScriptedModel([(5, None), (0.01, None)])
+    policy = CallPolicy(call_timeout_s=2.0, hedge=True, hedge_delay_s=0.05)
+    model = ResilientModel(inner, "Designer", policy)
+    start = time.monotonic()
+    assert asyncio.run(model.get_response()) == 2
+    assert time.monotonic() - start < 1.0
+    assert model.stats["hedges"] == 1 and model.stats["hedge_wins"] == 1 and inner.cancelled == 1
+
+
+def test_hedge_delay_follows_observed_p95():
+    tracker = LatencyTracker()
+    policy = CallPolicy(hedge=True, hedge_delay_s=30.0, hedge_min_samples=5)
+    for seconds in (1, 2, 3, 4):
+        tracker.record("Designer", seconds)
+    assert tracker.hedge_delay("Designer", policy) == 30.0
+    for seconds in range(5, 21):
+        tracker.record("Designer", seconds)
+    assert tracker.hedge_delay("Designer", policy) == 20
+
+
+def test_policies_load_per_agent_overrides(tmp_path):
+    path = tmp_path / "policies.json"
+    path.write_text(json.dumps({"Designer": {"call_timeout_s": 5}, "Reviewer": {"hedge": True}}))
+    policies = resilience.load_call_policies(path)
+    assert policies["Designer"].call_timeout_s == 5 and policies["Designer"].hedge  # keeps the default
+    assert policies["Reviewer"].hedge and resilience.policy_for(policies, "Nobody") == policies["*"]
+    path.write_text(json.dumps({"Designer": {"timeout": 5}}))
+    with pytest.raises(ValueError):
+        resilience.load_call_policies(path)
+
+
+def test_apply_keeps_handoff_targets_and_fingerprint():
+    worker = Agent(name="Designer", instructions="design")
+    entry = Agent(name="Project Manager", instructions="plan", handoffs=[worker])
+    models = resilience.apply_call_policies(resilience.team_agents(entry), {"*": FAST},
+                                            RunConfig(model_provider=FakeModelProvider()))
+    assert set(models) == {"Designer", "Project Manager"}
+    assert entry.handoffs[0] is worker and worker.model is models["Designer"]
+    assert str(worker.model) == "None"  # same as the unwrapped agent
+
+
+def run_pipeline(tmp_path, provider, policies):
+    async def scenario():
+        factory = codex_server_factory(command=sys.executable, args=[STUB], client_session_timeout_seconds=10)
+        async with MCPServerPool(factory, size=1) as pool, pool.lease() as server:
+            return await run_stage_pipeline(server, "Goal: a tiny game.", max_turns=10, call_policies=policies,
+                                            run_config=RunConfig(model_provider=provider, tracing_disabled=True))
+
+    with use_workspace(tmp_path):
+        return asyncio.run(scenario())
+
+
+def test_pipeline_survives_injected_failures(tmp_path):
+    scheduler = run_pipeline(tmp_path, FaultyProvider(delay_s=0.01), {"*": FAST})
+    assert all(r.ok for r in scheduler.results.values()) and set(scheduler.results) == set(STAGE_DEPS)
+
+
+def test_stage_budget_stops_a_slow_stage(tmp_path):
+    policies = {"*": FAST, "Project Manager": CallPolicy(call_timeout_s=5.0, stage_timeout_s=0.2)}
+    with pytest.raises(StageTimeout, match="project_manager"):
+        run_pipeline(tmp_path, FaultyProvider(delay_s=0.5), policies)
+
+
+def test_stage_budget_is_shared_by_all_attempts(monkeypatch):
+    async def slow_run(agent, text, **kwargs):
+        await asyncio.sleep(0.15)
+        return text
+
+    monkeypatch.setattr(team.Runner, "run", slow_run)
+    agents = {name: Agent(name=name, instructions="work") for name in STAGE_DEPS}
+    stage = team.build_stages(agents, "tasks", stage_timeouts={"designer": 0.25})[1]
+
+    async def attempts():
+        await stage.run(None)
+        await stage.run("Gate check failed.")
+
+    with pytest.raises(StageTimeout, match="designer"):
+        asyncio.run(attempts())
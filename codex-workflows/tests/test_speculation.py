@@ -0,0 +1,113 @@
+"""
+Tests for speculative stage execution in scratch workspaces (no network, no LLM calls).
+Run: python -m pytest tests/test_speculation.py
+"""
+import asyncio
+import time
+
+from tools.check_files_tool import check_paths
+from tools.workspace_index import _INDEXES
+from tools.workspace_root import use_workspace, workspace_root
+from workflow.dag import DagScheduler, Stage
+
+
+def build(events, rewrite=False, fail_speculation=False):
+    """design writes design/spec.md, then spends 0.3s on its final turn (optionally rewriting it);
+    frontend copies the spec into frontend/page.md."""
+    async def design(feedback):
+        (workspace_root() / "design").mkdir(exist_ok=True)
+        (workspace_root() / "design" / "spec.md").write_text("spec v1\n")
+        await asyncio.sleep(0.3)
+        if rewrite:
+            (workspace_root() / "design" / "spec.md").write_text("spec v2\n")
+        events.append(("design done", time.perf_counter()))
+
+    async def frontend(feedback):
+        root = workspace_root()
+        events.append(("frontend start", time.perf_counter()))
+        if fail_speculation and "speculative-" in root.name:
+            raise RuntimeError("speculative run crashed")
+        (root / "frontend").mkdir(exist_ok=True)
+        (root / "frontend" / "page.md").write_text("page from " + (root / "design" / "spec.md").read_text())
+        return root
+
+    return [
+        Stage("design", design, gate=lambda: check_paths(["design/spec.md"]), outputs=["design/spec.md"]),
+        Stage("frontend", frontend, deps=["design"], gate=lambda: check_paths(["frontend/page.md"]),
+              outputs=["frontend/page.md"]),
+    ]
+
+
+def run(tmp_path, **kwargs):
+    events = []
+    speculative = kwargs.pop("speculative", True)
+    with use_workspace(tmp_path):
+        scheduler = DagScheduler(build(events, **kwargs), speculative=speculative, speculation_poll_s=0.01)
+        results = asyncio.run(scheduler.run())
+    return scheduler, results, dict(events)
+
+
+def test_speculation_overlaps_upstream_and_is_committed(tmp_path):
+    scheduler, results, events = run(tmp_path)
+    assert events["frontend start"] < events["design done"]
+    assert results["frontend"].speculative and results["frontend"].attempts == 1
+    assert results["frontend"].output != tmp_path  # ran in the scratch workspace ...
+    assert (tmp_path / "frontend" / "page.md").read_text() == "page from spec v1\n"  # ... and was committed
+    assert not results["frontend"].output.exists()  # scratch removed
+    assert results["frontend"].output.resolve() not in _INDEXES  # and so is its index
+    assert scheduler.speculation == {"started": 1, "committed": 1, "discarded": 0}
+
+
+def test_changed_input_discards_speculation(tmp_path):
+    scheduler, results, events = run(tmp_path, rewrite=True)
+    assert not results["frontend"].speculative and results["frontend"].output == tmp_path
+    assert (tmp_path / "frontend" / "page.md").read_text() == "page from spec v2\n"
+    assert scheduler.speculation == {"started": 1, "committed": 0, "discarded": 1}
+
+
+def test_failed_speculation_reruns_normally(tmp_path):
+    scheduler, results, _ = run(tmp_path, fail_speculation=True)
+    assert not results["frontend"].speculative
+    assert (tmp_path / "frontend" / "page.md").read_text() == "page from spec v1\n"
+    assert scheduler.speculation["discarded"] == 1
+
+
+def test_without_speculation_stages_run_in_order(tmp_path):
+    scheduler, results, events = run(tmp_path, speculative=False)
+    assert events["frontend start"] > events["design done"]
+    assert scheduler.speculation["started"] == 0
+
+
+def test_stage_pipeline_runs_speculatively(tmp_path):
+    import sys
+    from pathlib import Path
+
+    from agents import RunConfig
+
+    from fake_models import FakeModelProvider, _has_tool_results
+    from workflow.mcp_pool import MCPServerPool, codex_server_factory
+    from workflow.team import STAGE_DEPS, STAGE_OUTPUTS, run_stage_pipeline
+
+    stub = str(Path(__file__).with_name("stub_mcp_server.py"))
+    provider = FakeModelProvider()
+    respond = provider.model.get_response
+
+    async def slow_summary(system_instructions, input, *args, **kwargs):
+        if _has_tool_results(input):
+            await asyncio.sleep(0.5)  # the upstream agent's last turn, after its files are written
+        return await respond(system_instructions, input, *args, **kwargs)
+
+    provider.model.get_response = slow_summary
+
+    async def scenario():
+        factory = codex_server_factory(command=sys.executable, args=[stub], client_session_timeout_seconds=10)
+        async with MCPServerPool(factory, size=1) as pool, pool.lease() as server:
+            return await run_stage_pipeline(server, "Goal: a tiny game.", max_turns=10, speculative=True,
+                                            run_config=RunConfig(model_provider=provider, tracing_disabled=True))
+
+    with use_workspace(tmp_path):
+        scheduler = asyncio.run(scenario())
+    assert all(r.ok for r in scheduler.results.values()) and set(scheduler.results) == set(STAGE_DEPS)
+    assert all((tmp_path / p).is_file() for outputs in STAGE_OUTPUTS.values() for p in outputs)
+    assert scheduler.speculation["committed"] >= 1
+    assert scheduler.speculation["started"] == scheduler.speculation["committed"] + scheduler.speculation["discarded"]
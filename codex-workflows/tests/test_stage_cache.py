@@ -0,0 +1,71 @@
+"""
+Tests for the content-addressed stage cache.
+Run: python -m pytest tests/test_stage_cache.py
+"""
+import asyncio
+
+from workflow.dag import DagScheduler, Stage
+from workflow.stage_cache import StageCache
+
+
+def test_key_tracks_instructions_and_input_contents(tmp_path):
+    (tmp_path / "REQUIREMENTS.md").write_text("v1")
+    k1 = StageCache.key(["designer", "instructions"], ["REQUIREMENTS.md"], base=tmp_path)
+    assert k1 == StageCache.key(["designer", "instructions"], ["REQUIREMENTS.md"], base=tmp_path)
+    assert k1 != StageCache.key(["designer", "instructions v2"], ["REQUIREMENTS.md"], base=tmp_path)
+    (tmp_path / "REQUIREMENTS.md").write_text("v2")
+    assert k1 != StageCache.key(["designer", "instructions"], ["REQUIREMENTS.md"], base=tmp_path)
+
+
+def test_store_and_restore_round_trip(tmp_path):
+    ws = tmp_path / "ws"
+    (ws / "design").mkdir(parents=True)
+    (ws / "design" / "design_spec.md").write_text("spec")
+    cache = StageCache(tmp_path / "cache")
+
+    cache.store("k", "designer", ["design/design_spec.md"], base=ws)
+    (ws / "design" / "design_spec.md").unlink()
+
+    assert cache.restore("k", base=ws) == ["design/design_spec.md"]
+    assert (ws / "design" / "design_spec.md").read_text() == "spec"
+    assert cache.restore("other", base=ws) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction_and_invalidate(tmp_path):
+    ws = tmp_path / "ws"
+    ws.mkdir()
+    cache = StageCache(tmp_path / "cache", max_bytes=250)
+    for name in ["a", "b", "c"]:
+        (ws / f"{name}.txt").write_text(name * 100)
+        cache.store(f"k{name}", name, [f"{name}.txt"], base=ws)
+        if name == "b":
+            cache.restore("ka", base=ws)  # touch "a" so "b" is least recently used
+
+    assert cache.size_bytes() <= 250
+    assert cache.restore("kb", base=ws) is None
+    assert cache.restore("ka", base=ws) is not None
+
+    assert cache.invalidate("a") == 1
+    assert cache.restore("ka", base=ws) is None
+
+
+def test_scheduler_skips_cached_stages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = StageCache(tmp_path / ".cache")
+    runs = []
+
+    def stage(name):
+        async def run(feedback):
+            runs.append(name)
+            (tmp_path / f"{name}.md").write_text(name)
+        return Stage(name, run, outputs=[f"{name}.md"], cache_key=lambda: f"key-{name}",
+                     gate=lambda: {"ok": (tmp_path / f"{name}.md").exists(), "missing": []})
+
+    asyncio.run(DagScheduler([stage("pm"), stage("tester")], cache=cache).run())
+    for f in tmp_path.glob("*.md"):
+        f.unlink()
+    results = asyncio.run(DagScheduler([stage("pm"), stage("tester")], cache=cache, invalidate=["tester"]).run())
+
+    assert runs == ["pm", "tester", "tester"]
+    assert results["pm"].cached and not results["tester"].cached
@@ -0,0 +1,112 @@
+"""
+Tests for adaptive per-agent model tiers (no network, no LLM calls).
+Run: python -m pytest tests/test_tiering.py
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from agents import Agent, RunConfig
+
+from fake_models import FakeModelProvider
+from tools.workspace_root import use_workspace
+from workflow.dag import StageResult
+from workflow.mcp_pool import MCPServerPool, codex_server_factory
+from workflow.team import run_stage_pipeline
+from workflow.tiering import AgentTiers, ModelRouter, TieringConfig, TierStats, load_tiering_config
+
+STUB = str(Path(__file__).with_name("stub_mcp_server.py"))
+
+
+class NamingProvider(FakeModelProvider):
+    """FakeModelProvider that remembers which model names were asked for."""
+
+    def __init__(self):
+        super().__init__()
+        self.names = []
+
+    def get_model(self, model_name):
+        self.names.append(model_name)
+        return super().get_model(model_name)
+
+
+def router(tmp_path, demote_after=2, **agents) -> ModelRouter:
+    config = TieringConfig(demote_after=demote_after)
+    config.agents.update(agents)
+    return ModelRouter(config, TierStats(tmp_path))
+
+
+def test_failure_escalates_and_passes_demote_within_bounds(tmp_path):
+    r = router(tmp_path, Tester=AgentTiers(start="standard", floor="standard", ceiling="strong"))
+    assert r.current("Designer") == "standard" and r.current("Project Manager") == "fast"
+
+    assert r.observe("Designer", first_try=False, attempts=2) == "strong"
+    assert r.observe("Designer", first_try=False, attempts=2) == "strong"  # ceiling
+    assert r.observe("Backend Developer", first_try=True) == "standard"
+    assert r.observe("Backend Developer", first_try=True) == "fast"  # demote_after=2
+    assert r.observe("Tester", first_try=True) == "standard"
+    assert r.observe("Tester", first_try=True) == "standard"  # floor
+    assert len(r.stats.agent("Designer")["history"]) == 2
+
+
+def test_failures_at_a_tier_raise_the_bar_for_returning_to_it(tmp_path):
+    r = router(tmp_path)
+    r.observe("Designer", first_try=False)  # standard fails -> strong
+    # Back to standard needs 2 * (1 + 1 failure there) passes instead of 2.
+    assert [r.observe("Designer", first_try=True) for _ in range(4)] == ["strong"] * 3 + ["standard"]
+
+
+def test_assign_sets_model_and_reasoning_and_state_persists(tmp_path):
+    r = router(tmp_path)
+    r.observe("Designer", first_try=False)
+    designer, pm = Agent(name="Designer"), Agent(name="Project Manager")
+    assert r.assign({"designer": designer, "project_manager": pm}) == {"Designer": "strong",
+                                                                       "Project Manager": "fast"}
+    assert designer.model == "gpt-5" and designer.model_settings.reasoning.effort == "high"
+    assert pm.model == "gpt-5-mini"
+
+    r.record({"designer": StageResult("designer", ok=True, attempts=1, duration_s=1.5),
+              "project_manager": StageResult("project_manager", ok=True, attempts=1, duration_s=0.1, cached=True)})
+    saved = json.loads((tmp_path / "tiers.json").read_text())
+    assert saved["Designer"]["tier"] == "strong" and saved["Designer"]["streak"] == 1
+    assert "Project Manager" not in saved or not saved["Project Manager"]["history"]  # cached: no signal
+    assert ModelRouter(TieringConfig(), TierStats(tmp_path)).current("Designer") == "strong"
+
+
+def test_config_overrides_and_rejects_unknown_tiers(tmp_path):
+    path = tmp_path / "tiers.json"
+    path.write_text(json.dumps({"agents": {"Tester": {"start": "fast"}}, "demote_after": 5}))
+    config = load_tiering_config(path)
+    assert config.bounds("Tester").start == "fast" and config.demote_after == 5
+    assert config.bounds("Designer") == AgentTiers()
+
+    path.write_text(json.dumps({"agents": {"Tester": {"start": "huge"}}}))
+    try:
+        load_tiering_config(path)
+    except ValueError as exc:
+        assert "huge" in str(exc)
+    else:
+        raise AssertionError("unknown tier accepted")
+
+
+def test_pipeline_runs_on_tiers_and_demotes_after_passing_runs(tmp_path):
+    stats_dir = tmp_path / "stats"
+
+    async def scenario(provider):
+        factory = codex_server_factory(command=sys.executable, args=[STUB], client_session_timeout_seconds=10)
+        async with MCPServerPool(factory, size=1) as pool, pool.lease() as server:
+            await run_stage_pipeline(server, "Goal: a tiny game.", max_turns=10,
+                                     run_config=RunConfig(model_provider=provider, tracing_disabled=True),
+                                     router=router(stats_dir, demote_after=1))
+
+    providers = [NamingProvider(), NamingProvider()]
+    with use_workspace(tmp_path):
+        for provider in providers:
+            asyncio.run(scenario(provider))
+
+    # The PM starts on the fast tier; every gate passes first try, so the rest follow it.
+    assert set(providers[0].names) == {"gpt-5", "gpt-5-mini"}
+    assert set(providers[1].names) == {"gpt-5-mini"}
+    saved = json.loads((stats_dir / "tiers.json").read_text())
+    assert all(saved[a]["history"][-1]["turns"] >= 1 for a in saved)
@@ -0,0 +1,83 @@
+"""
+Tests for the workspace index behind check_files / validate_expected_tree gates.
+Run: python -m pytest tests/test_workspace_index.py
+"""
+import os
+
+from tools.check_files_tool import check_paths
+from tools.project_validation_tool import validate_tree
+from tools.workspace_index import ArtifactRule, drop_workspace_index, workspace_index
+from tools.workspace_root import use_workspace
+from tools.workspace_tools import reset_workspace
+
+INDEX_HTML = "<!doctype html><html><body><div id='game'></div><script src='game.js'></script></body></html>"
+
+
+def test_writes_are_indexed_and_gates_only_rehash_changed_files(tmp_path):
+    with use_workspace(tmp_path):
+        index = workspace_index()
+        (tmp_path / "notes.md").write_text("hello")
+        first = check_paths(["notes.md"], gate="g")
+        assert first["ok"] and first["changed"] == ["notes.md"]
+        assert index.stats["hashed"] == 1
+
+        again = check_paths(["notes.md"], gate="g")
+        assert again["changed"] == [] and index.stats["hashed"] == 1  # stat only
+
+        (tmp_path / "notes.md").write_text("hello, world")
+        changed = check_paths(["notes.md"], gate="g")
+        assert changed["changed"] == ["notes.md"] and index.stats["hashed"] == 2
+
+        os.remove(tmp_path / "notes.md")
+        removed = check_paths(["notes.md"], gate="g")
+        assert removed["missing"] == ["notes.md"] and removed["removed"] == ["notes.md"]
+
+
+def test_content_rules_reject_empty_and_unparseable_artifacts(tmp_path):
+    with use_workspace(tmp_path):
+        reset_workspace()
+        (tmp_path / "frontend" / "game.js").write_text("")
+        (tmp_path / "frontend" / "index.html").write_text("just text, no markup " * 5)
+        (tmp_path / "backend" / "package.json").write_text('{"name": "x", "scripts": {"start": "node server.js"')
+        result = check_paths(["frontend/game.js", "frontend/index.html", "backend/package.json"])
+
+        assert not result["ok"] and result["all_exist"]
+        assert result["invalid"]["frontend/game.js"].startswith("too small")
+        assert result["invalid"]["frontend/index.html"].startswith("does not parse as HTML")
+        assert result["invalid"]["backend/package.json"].startswith("does not parse as JSON")
+
+        (tmp_path / "frontend" / "index.html").write_text(INDEX_HTML)
+        assert "frontend/index.html" not in check_paths(["frontend/index.html"])["invalid"]
+        custom = check_paths(["frontend/index.html"], rules={"frontend/index.html": ArtifactRule(contains="canvas")})
+        assert custom["invalid"] == {"frontend/index.html": "does not contain 'canvas'"}
+
+
+def test_content_verdicts_are_cached_per_hash(tmp_path):
+    with use_workspace(tmp_path):
+        index = workspace_index()
+        (tmp_path / "frontend").mkdir()
+        (tmp_path / "frontend" / "index.html").write_text(INDEX_HTML)
+        for _ in range(3):
+            assert check_paths(["frontend/index.html"])["ok"]
+        assert index.stats["validated"] == 1
+
+
+def test_dropped_index_is_rebuilt_on_next_use(tmp_path):
+    with use_workspace(tmp_path):
+        index = workspace_index()
+        assert workspace_index(tmp_path) is index
+        drop_workspace_index()
+        assert workspace_index() is not index
+
+
+def test_validate_tree_reports_invalid_files(tmp_path):
+    with use_workspace(tmp_path):
+        reset_workspace()
+        for path in ("AGENT_TASKS.md", "REQUIREMENTS.md", "TEST.md"):
+            (tmp_path / path).write_text("# " + path)
+        (tmp_path / "design" / "design_spec.md").write_text("")
+        result = validate_tree(["AGENT_TASKS.md", "design/design_spec.md", "design/wireframe.md"])
+    assert result["present"] == ["AGENT_TASKS.md", "design/design_spec.md"]
+    assert result["missing"] == ["design/wireframe.md"]
+    assert list(result["invalid"]) == ["design/design_spec.md"]
+    assert result["expected_count"] == 3
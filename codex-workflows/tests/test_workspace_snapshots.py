@@ -0,0 +1,82 @@
+"""
+Tests for workspace snapshots taken by reset_output_dirs.
+Run: python -m pytest tests/test_workspace_snapshots.py
+"""
+from tools import workspace_snapshots as snapshots
+from tools.workspace_root import use_workspace
+from tools.workspace_tools import reset_workspace
+
+
+def write_run(root, game_js, requirements="# Requirements\n"):
+    (root / "REQUIREMENTS.md").write_text(requirements)
+    (root / "frontend").mkdir(exist_ok=True)
+    (root / "frontend" / "game.js").write_text(game_js)
+    (root / "design").mkdir(exist_ok=True)
+    (root / "design" / "design_spec.md").write_text("# Spec\n")
+
+
+def test_reset_moves_previous_output_into_a_snapshot(tmp_path):
+    with use_workspace(tmp_path):
+        assert reset_workspace()["snapshot"] is None  # nothing to keep yet
+        write_run(tmp_path, "let v = 1;\n")
+        result = reset_workspace(label="prompt A")
+
+        manifest = snapshots.load_manifest(result["snapshot"])
+        snap = tmp_path / ".snapshots" / result["snapshot"]
+        assert manifest["label"] == "prompt A"
+        assert set(manifest["files"]) == {"REQUIREMENTS.md", "frontend/game.js", "design/design_spec.md"}
+        assert (snap / "frontend" / "game.js").read_text() == "let v = 1;\n"
+        assert list((tmp_path / "frontend").iterdir()) == []
+        assert (tmp_path / "REQUIREMENTS.md").exists()  # root files are copied, not moved
+
+
+def test_diff_and_restore_between_runs(tmp_path):
+    with use_workspace(tmp_path):
+        write_run(tmp_path, "let v = 1;\n")
+        first = reset_workspace()["snapshot"]
+        write_run(tmp_path, "let v = 2;\n")
+        (tmp_path / "backend").mkdir(exist_ok=True)
+        (tmp_path / "backend" / "server.js").write_text("// api\n")
+        second = reset_workspace()["snapshot"]
+
+        diff = snapshots.diff_snapshots(first, second)
+        assert diff["modified"] == ["frontend/game.js"]
+        assert diff["added"] == ["backend/server.js"]
+        assert diff["unchanged"] == 2
+        assert "-let v = 1;" in snapshots.diff_file(first, second, "frontend/game.js")
+
+        write_run(tmp_path, "let v = 3;\n")
+        restored = snapshots.restore_snapshot(first)
+        assert restored["saved_as"] is not None
+        assert (tmp_path / "frontend" / "game.js").read_text() == "let v = 1;\n"
+        assert not (tmp_path / "backend" / "server.js").exists()
+        assert snapshots.diff_snapshots(first)["modified"] == []
+        assert [s["id"] for s in snapshots.list_snapshots()] == [first, second, restored["saved_as"]]
+
+
+def test_in_place_edit_after_restore_leaves_the_snapshot_intact(tmp_path):
+    with use_workspace(tmp_path):
+        write_run(tmp_path, "let v = 1;\n")
+        first = reset_workspace()["snapshot"]
+        snapshots.restore_snapshot(first)
+        with open(tmp_path / "frontend" / "game.js", "r+") as f:  # as an in-place editor would
+            f.write("let v = 9;\n")
+        assert (tmp_path / ".snapshots" / first / "frontend" / "game.js").read_text() == "let v = 1;\n"
+        assert snapshots.diff_snapshots(first)["modified"] == ["frontend/game.js"]
+
+
+def test_temp_files_of_open_writes_are_not_snapshotted(tmp_path):
+    with use_workspace(tmp_path):
+        write_run(tmp_path, "let v = 1;\n")
+        (tmp_path / "frontend" / ".game.js.0123456789ab.part").write_text("half written")
+        assert set(snapshots.current_manifest()) == {"REQUIREMENTS.md", "frontend/game.js",
+                                                     "design/design_spec.md"}
+
+
+def test_prune_keeps_newest_snapshots(tmp_path):
+    with use_workspace(tmp_path):
+        ids = []
+        for i in range(4):
+            write_run(tmp_path, f"let v = {i};\n")
+            ids.append(reset_workspace(keep_snapshots=2)["snapshot"])
+        assert [s["id"] for s in snapshots.list_snapshots()] == ids[-2:]
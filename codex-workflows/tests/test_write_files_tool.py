@@ -0,0 +1,92 @@
+"""
+Tests for the multi-file write_files tool.
+Run: python -m pytest tests/test_write_files_tool.py
+"""
+import asyncio
+import json
+import os
+
+import pytest
+from agents.tool_context import ToolContext
+
+from tools import write_files_tool as wf
+from tools.workspace_root import use_workspace
+
+GAME_JS = "const game = document.getElementById('game');\ngame.textContent = 'Score: 0';\n"
+
+
+def invoke(tool, **arguments):
+    args = json.dumps(arguments)
+    ctx = ToolContext(context=None, tool_name=tool.name, tool_call_id="call_test", tool_arguments=args)
+    return asyncio.run(tool.on_invoke_tool(ctx, args))
+
+
+def test_writes_all_files_and_reports_checks(tmp_path):
+    tool = wf.write_files_tool("frontend")
+    with use_workspace(tmp_path):
+        result = invoke(tool, files=[
+            {"path": "frontend/game.js", "content": GAME_JS},
+            {"path": "frontend/styles.css", "content": "body { margin: 0; }\n"},
+            {"path": "frontend/index.html", "content": "<p>too short</p>"},
+        ])
+    assert tool.name == "write_files"
+    assert [w["path"] for w in result["written"]] == ["frontend/game.js", "frontend/styles.css", "frontend/index.html"]
+    assert all(w["created"] for w in result["written"])
+    assert result["missing"] == []
+    assert not result["ok"] and list(result["invalid"]) == ["frontend/index.html"]  # written, but flagged
+    assert (tmp_path / "frontend" / "game.js").read_text() == GAME_JS
+
+
+@pytest.mark.parametrize("role, path", [
+    ("frontend", "backend/server.js"),
+    ("project_manager", "design/spec.md"),
+    ("designer", "../outside.md"),
+    ("designer", "/etc/passwd"),
+    ("tester", "testsuite/x.md"),
+])
+def test_role_ownership_is_enforced(tmp_path, role, path):
+    with use_workspace(tmp_path):
+        result = wf.write_transaction([(path, "x"), (f"{wf.ROLE_ALLOWED_DIRS[role][0] or '.'}/ok.md", "x")],
+                                      wf.ROLE_ALLOWED_DIRS[role])
+    assert not result["ok"] and list(result["rejected"]) == [path]
+    assert not any(p.name == "ok.md" for p in tmp_path.rglob("*"))  # nothing written
+
+
+def test_failed_publish_rolls_back_every_file(tmp_path, monkeypatch):
+    (tmp_path / "REQUIREMENTS.md").write_text("old requirements")
+    real_replace = os.replace
+    calls = {"n": 0}
+
+    def flaky_replace(src, dst):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise OSError("disk full")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(wf.os, "replace", flaky_replace)
+    with use_workspace(tmp_path), pytest.raises(OSError):
+        wf.write_transaction([("REQUIREMENTS.md", "new"), ("TEST.md", "new")], wf.ROLE_ALLOWED_DIRS["project_manager"])
+    monkeypatch.undo()
+
+    assert (tmp_path / "REQUIREMENTS.md").read_text() == "old requirements"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["REQUIREMENTS.md"]  # no temp, backup or partial files
+
+
+def test_backslash_paths_are_written_where_they_were_checked(tmp_path):
+    with use_workspace(tmp_path):
+        result = wf.write_transaction([("frontend\\index.html", "<p>hi</p>")], wf.ROLE_ALLOWED_DIRS["frontend"])
+        escaped = wf.write_transaction([("frontend\\..\\backend\\server.js", "x")], wf.ROLE_ALLOWED_DIRS["frontend"])
+    assert [w["path"] for w in result["written"]] == ["frontend/index.html"]
+    assert (tmp_path / "frontend" / "index.html").read_text() == "<p>hi</p>"
+    assert [p.name for p in tmp_path.iterdir()] == ["frontend"]  # no root-level "frontend\index.html"
+    assert not escaped["ok"] and list(escaped["rejected"]) == ["frontend\\..\\backend\\server.js"]
+
+
+def test_spellings_of_the_same_path_are_duplicates(tmp_path):
+    with use_workspace(tmp_path):
+        result = wf.write_transaction([("frontend/game.js", "a"), ("./frontend/game.js", "b")],
+                                      wf.ROLE_ALLOWED_DIRS["frontend"])
+    assert not result["ok"] and result["written"] == []
+    assert result["rejected"] == {"frontend/game.js": "listed more than once",
+                                  "./frontend/game.js": "listed more than once"}
+    assert not (tmp_path / "frontend").exists()
@@ -2,48 +2,46 @@
 CheckFilesTool - Deterministic file existence verification for gated workflows.
 Eliminates flaky LLM-based file checking.
 """
-import os
+from typing import Dict, Optional
 from agents import function_tool
+from tools.workspace_index import ArtifactRule, workspace_index
+from tools.workspace_root import workspace_root
+
+
+def check_paths(paths: list[str], rules: Optional[Dict[str, ArtifactRule]] = None, gate: Optional[str] = None) -> dict:
+    """Plain (non-tool) form of check_files, used by code-driven gates.
+
+    Paths are relative to the run's workspace root (the current working directory by
+    default) or absolute. Existing files must also pass their content rules
+    (tools.workspace_index.ARTIFACT_RULES, overridable via `rules`); with `gate`, the
+    result lists what changed since that gate last ran.
+    """
+    root = workspace_root()
+    result = workspace_index(root).check(paths, rules=rules, gate=gate)
+    all_exist = len(result["missing"]) == 0
+
+    return dict(
+        result,
+        all_exist=all_exist,
+        checked_count=len(paths),
+        cwd=str(root),
+    )
 
 
 @function_tool
 def check_files(paths: list[str]) -> dict:
     """
-    Check if one or more files exist in the filesystem.
+    Check if one or more files exist in the filesystem and have valid content.
 
-    Returns {ok: true, all_exist: true} if all files exist,
-    or {ok: false, missing: [list of missing files]} if any are missing.
+    Returns {ok: true, all_exist: true} if all files exist and pass their content checks
+    (not empty; index.html parses as HTML, package.json as JSON with a start script, ...),
+    or {ok: false, missing: [...], invalid: {path: reason}} otherwise.
     Use this to verify gate conditions before proceeding to the next agent.
 
     Args:
         paths: List of file paths to check (relative or absolute)
 
     Returns:
-        Dictionary with ok (bool), all_exist (bool), missing (list), existing (list)
+        Dictionary with ok (bool), all_exist (bool), missing (list), existing (list), invalid (dict)
     """
-    missing = []
-    existing = []
-
-    for path in paths:
-        # Handle both absolute and relative paths
-        if os.path.isabs(path):
-            full_path = path
-        else:
-            # Relative to current working directory
-            full_path = os.path.join(os.getcwd(), path)
-
-        if os.path.exists(full_path) and os.path.isfile(full_path):
-            existing.append(path)
-        else:
-            missing.append(path)
-
-    all_exist = len(missing) == 0
-
-    return {
-        "ok": all_exist,
-        "all_exist": all_exist,
-        "missing": missing,
-        "existing": existing,
-        "checked_count": len(paths),
-        "cwd": os.getcwd()
-    }
+    return check_paths(paths)
@@ -1,12 +1,143 @@
 """
 File IO tools exposed to agents as deterministic function tools.
 Prefer these for writing deliverables to avoid MCP flakiness.
+
+Every write goes to a temporary file next to the target, is fsynced and then renamed
+into place, so a crashed or concurrent run never leaves a half-written file for a
+gate to pick up. Large files can be written in pieces:
+
+    open_text_file("frontend/game.js")          -> {handle: "..."}
+    append_text_chunk(handle, "...part 1...")   -> {bytes: 40960, chunks: 1}
+    append_text_chunk(handle, "...part 2...")
+    commit_text_file(handle)                    -> {path, bytes, sha256, created}
+
+A stage run wraps itself in abort_unfinished_writes(), so handles it leaves open (max_turns,
+a timeout, a gate retry or a discarded speculation) are aborted and their temp files removed.
 """
 from __future__ import annotations
+import hashlib
 import os
+import threading
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Iterator, Optional, Set
 from agents import function_tool
+from tools.workspace_index import workspace_index
+from tools.workspace_root import resolve
+
+
+def fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:  # e.g. Windows cannot open directories
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class AtomicWriter:
+    """Write a file through a hidden temp file in the same directory, then rename it into place.
+
+    Bytes and the sha256 are accumulated as chunks arrive; nothing is re-read or re-encoded.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex[:12]}.part")
+        self.bytes = 0
+        self.chunks = 0
+        self._sha = hashlib.sha256()
+        self._file = open(self.tmp_path, "xb")
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._sha.update(data)
+        self.bytes += len(data)
+        self.chunks += 1
+
+    @property
+    def sha256(self) -> str:
+        return self._sha.hexdigest()
+
+    def prepare(self) -> None:
+        """Flush and fsync the temp file; it can then be renamed into place."""
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def commit(self, overwrite: bool = True) -> Dict[str, object]:
+        """fsync and rename into place. Returns {path, bytes, sha256, created}."""
+        try:
+            self.prepare()
+            existed = self.path.exists()
+            if overwrite:
+                os.replace(self.tmp_path, self.path)
+            else:
+                try:
+                    os.link(self.tmp_path, self.path)  # atomic create; raises FileExistsError
+                except FileExistsError:
+                    raise
+                except OSError:  # no hard links on this filesystem: claim the name, then rename
+                    os.close(os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+                    os.replace(self.tmp_path, self.path)
+                else:
+                    os.unlink(self.tmp_path)
+        except BaseException:
+            self.abort()
+            raise
+        fsync_dir(self.path.parent)
+        sha256 = self.sha256
+        workspace_index().record_write(self.path, sha256)
+        return {"path": str(self.path), "bytes": self.bytes, "sha256": sha256, "created": not existed}
+
+    def abort(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.unlink(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+def atomic_write(path: Path, chunks: Iterable[bytes], overwrite: bool = True) -> Dict[str, object]:
+    """Plain (non-tool) atomic write of `chunks` to `path`; see AtomicWriter.commit."""
+    writer = AtomicWriter(path)
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.commit(overwrite=overwrite)
+
+
+# Open chunked writes, by handle. Handles outlive a single tool call, not the process.
+_OPEN_WRITES: Dict[str, AtomicWriter] = {}
+_OPEN_WRITES_LOCK = threading.Lock()
+# Handles opened inside the innermost abort_unfinished_writes() (follows asyncio tasks).
+_WRITE_SCOPE: ContextVar[Optional[Set[str]]] = ContextVar("open_write_scope", default=None)
+
+
+@contextmanager
+def abort_unfinished_writes() -> Iterator[None]:
+    """Abort the chunked writes opened in this context that are still open when it exits."""
+    handles: Set[str] = set()
+    token = _WRITE_SCOPE.set(handles)
+    try:
+        yield
+    finally:
+        _WRITE_SCOPE.reset(token)
+        with _OPEN_WRITES_LOCK:
+            writers = [_OPEN_WRITES.pop(handle) for handle in handles if handle in _OPEN_WRITES]
+        for writer in writers:
+            writer.abort()
 
 
 @function_tool
@@ -18,7 +149,7 @@ def ensure_dir(path: str) -> dict:
 
     Returns: {ok: bool, path: str, created: bool}
     """
-    p = Path(path)
+    p = resolve(path)
     created = False
     if not p.exists():
         p.mkdir(parents=True, exist_ok=True)
@@ -28,25 +159,113 @@ def ensure_dir(path: str) -> dict:
 
 @function_tool
 def write_text_file(path: str, content: str, create_dirs: bool = True, overwrite: bool = True) -> dict:
-    """Write UTF-8 text to a file safely.
+    """Write UTF-8 text to a file safely (atomically: temp file, fsync, rename).
 
     - Creates parent directories if `create_dirs`.
     - Overwrites by default; set `overwrite=False` to avoid clobbering.
+    - For large files, use open_text_file / append_text_chunk / commit_text_file instead.
 
     Args:
-        path: File path (relative to CWD or absolute).
+        path: File path (relative to the workspace root, by default the CWD, or absolute).
         content: Text content to write.
         create_dirs: Create parent directories if missing.
         overwrite: If False and file exists, returns ok=False.
 
-    Returns: {ok: bool, path: str, bytes: int, created: bool, overwritten: bool}
+    Returns: {ok: bool, path: str, bytes: int, sha256: str, created: bool, overwritten: bool}
     """
-    p = Path(path)
+    p = resolve(path)
     if create_dirs:
         p.parent.mkdir(parents=True, exist_ok=True)
     if p.exists() and not overwrite:
         return {"ok": False, "path": str(p), "reason": "exists", "bytes": p.stat().st_size, "created": False, "overwritten": False}
     data = content if isinstance(content, str) else str(content)
-    with p.open("w", encoding="utf-8") as f:
-        f.write(data)
-    return {"ok": True, "path": str(p), "bytes": len(data.encode("utf-8")), "created": not p.exists(), "overwritten": True}
+    try:
+        result = atomic_write(p, [data.encode("utf-8")], overwrite=overwrite)
+    except FileExistsError:
+        return {"ok": False, "path": str(p), "reason": "exists", "bytes": p.stat().st_size, "created": False, "overwritten": False}
+    return dict(result, ok=True, overwritten=not result["created"])
+
+
+@function_tool
+def open_text_file(path: str, create_dirs: bool = True) -> dict:
+    """Start a chunked write of a large text file. Nothing is visible at `path` until commit.
+
+    Args:
+        path: File path (relative to the workspace root, by default the CWD, or absolute).
+        create_dirs: Create parent directories if missing.
+
+    Returns: {ok: bool, handle: str, path: str}
+    """
+    p = resolve(path)
+    if create_dirs:
+        p.parent.mkdir(parents=True, exist_ok=True)
+    elif not p.parent.is_dir():
+        return {"ok": False, "path": str(p), "reason": "parent directory does not exist"}
+    handle = uuid.uuid4().hex
+    with _OPEN_WRITES_LOCK:
+        _OPEN_WRITES[handle] = AtomicWriter(p)
+    scope = _WRITE_SCOPE.get()
+    if scope is not None:
+        scope.add(handle)
+    return {"ok": True, "handle": handle, "path": str(p)}
+
+
+@function_tool
+def append_text_chunk(handle: str, content: str) -> dict:
+    """Append a chunk of UTF-8 text to a file opened with open_text_file.
+
+    Args:
+        handle: Handle returned by open_text_file.
+        content: Next piece of the file, in order.
+
+    Returns: {ok: bool, handle: str, bytes: int (total so far), chunks: int}
+    """
+    with _OPEN_WRITES_LOCK:
+        writer = _OPEN_WRITES.get(handle)
+    if writer is None:
+        return {"ok": False, "handle": handle, "reason": "unknown or already closed handle"}
+    writer.write(content.encode("utf-8"))
+    return {"ok": True, "handle": handle, "bytes": writer.bytes, "chunks": writer.chunks}
+
+
+@function_tool
+def commit_text_file(handle: str, overwrite: bool = True) -> dict:
+    """Atomically publish a chunked write (fsync, then rename into place).
+
+    Args:
+        handle: Handle returned by open_text_file.
+        overwrite: If False and the target exists, the write is discarded and ok=False.
+
+    Returns: {ok: bool, path: str, bytes: int, sha256: str, created: bool, chunks: int}
+    """
+    with _OPEN_WRITES_LOCK:
+        writer = _OPEN_WRITES.pop(handle, None)
+    if writer is None:
+        return {"ok": False, "handle": handle, "reason": "unknown or already closed handle"}
+    try:
+        result = writer.commit(overwrite=overwrite)
+    except FileExistsError:
+        return {"ok": False, "path": str(writer.path), "reason": "exists"}
+    except OSError as e:
+        return {"ok": False, "path": str(writer.path), "reason": str(e)}
+    return dict(result, ok=True, chunks=writer.chunks)
+
+
+@function_tool
+def abort_text_file(handle: str) -> dict:
+    """Discard a chunked write; the target file is left untouched.
+
+    Args:
+        handle: Handle returned by open_text_file.
+
+    Returns: {ok: bool, handle: str}
+    """
+    with _OPEN_WRITES_LOCK:
+        writer = _OPEN_WRITES.pop(handle, None)
+    if writer is None:
+        return {"ok": False, "handle": handle, "reason": "unknown or already closed handle"}
+    writer.abort()
+    return {"ok": True, "handle": handle}
+
+
+CHUNKED_WRITE_TOOLS = [open_text_file, append_text_chunk, commit_text_file, abort_text_file]
@@ -0,0 +1,423 @@
+"""
+Load test for the generated backend: start it on a free local port, drive a mix of
+GET/POST /scores at a target concurrency and report throughput, latency percentiles
+and memory growth as JSON.
+
+The client is plain asyncio (keep-alive HTTP/1.1 over asyncio streams), so no extra
+dependency is needed. Each of `concurrency` workers sends requests back to back on its
+own connection (optionally paced to `target_rps` overall). Memory is the resident set
+size of the backend process tree, sampled from /proc while the test runs (None on
+platforms without /proc).
+
+Gates compare a report against LoadThresholds (check_thresholds); the thresholds come
+from a JSON file named by WORKFLOW_LOAD_THRESHOLDS, or the defaults below.
+
+    python -m tools.load_test_tool backend --duration 10 --concurrency 32
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from agents import function_tool
+from tools.workspace_root import resolve
+
+DEFAULT_MIX: Dict[str, float] = {"GET /scores": 0.8, "POST /scores": 0.2}
+
+
+@dataclass(frozen=True)
+class LoadThresholds:
+    min_rps: float = 200.0
+    max_p95_ms: float = 100.0
+    max_p99_ms: float = 250.0
+    max_error_rate: float = 0.01
+    max_memory_growth_mb: float = 64.0
+
+
+def load_thresholds(path: Optional[str | Path] = None) -> LoadThresholds:
+    """LoadThresholds from a JSON file ({"min_rps": 500, ...}); defaults for missing fields."""
+    path = path or os.getenv("WORKFLOW_LOAD_THRESHOLDS")
+    if not path:
+        return LoadThresholds()
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    known = {f.name for f in fields(LoadThresholds)}
+    unknown = set(data) - known
+    if unknown:
+        raise ValueError(f"Unknown load threshold fields: {sorted(unknown)}")
+    return replace(LoadThresholds(), **data)
+
+
+def check_thresholds(report: Dict[str, Any], thresholds: LoadThresholds) -> List[str]:
+    """Human-readable threshold violations of a run_load_test report (empty list = pass)."""
+    if report.get("error"):
+        return [report["error"]]
+    problems = []
+    latency = report["latency_ms"]
+    if report["rps"] < thresholds.min_rps:
+        problems.append(f"throughput {report['rps']} rps < {thresholds.min_rps}")
+    if latency["p95"] > thresholds.max_p95_ms:
+        problems.append(f"p95 latency {latency['p95']} ms > {thresholds.max_p95_ms}")
+    if latency["p99"] > thresholds.max_p99_ms:
+        problems.append(f"p99 latency {latency['p99']} ms > {thresholds.max_p99_ms}")
+    if report["error_rate"] > thresholds.max_error_rate:
+        problems.append(f"error rate {report['error_rate']} > {thresholds.max_error_rate}")
+    growth = report["memory"].get("growth_mb")
+    if growth is not None and growth > thresholds.max_memory_growth_mb:
+        problems.append(f"memory grew {growth} MB > {thresholds.max_memory_growth_mb}")
+    return problems
+
+
+# -- backend process ------------------------------------------------------------
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def backend_command(backend_dir: Path) -> List[str]:
+    """The package.json start script; `node <file>` is run directly to skip npm's startup."""
+    package = json.loads((backend_dir / "package.json").read_text(encoding="utf-8"))
+    start = (package.get("scripts") or {}).get("start") or "node server.js"
+    parts = start.split()
+    if parts and parts[0] == "node" and shutil.which("node"):
+        return [shutil.which("node")] + parts[1:]
+    return [shutil.which("npm") or "npm", "start"]
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    for task in Path(f"/proc/{pid}/task").glob("*/children"):
+        try:
+            children.extend(int(c) for c in task.read_text().split())
+        except OSError:
+            pass
+    return children
+
+
+def tree_rss_kb(pid: int) -> Optional[int]:
+    """Resident set size of `pid` and its descendants, in KiB (None without /proc)."""
+    total, found, stack = 0, False, [pid]
+    while stack:
+        p = stack.pop()
+        try:
+            for line in Path(f"/proc/{p}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1])
+                    found = True
+        except OSError:
+            continue
+        stack.extend(_children(p))
+    return total if found else None
+
+
+class BackendProcess:
+    """The generated backend, started on `port` for the duration of an `async with` block."""
+
+    def __init__(self, backend_dir: Path, port: int, startup_timeout_s: float = 15.0):
+        self.backend_dir = backend_dir
+        self.port = port
+        self.startup_timeout_s = startup_timeout_s
+        self.proc: Optional[asyncio.subprocess.Process] = None
+
+    async def __aenter__(self) -> "BackendProcess":
+        self.proc = await asyncio.create_subprocess_exec(
+            *backend_command(self.backend_dir), cwd=self.backend_dir,
+            env=dict(os.environ, PORT=str(self.port)),
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + self.startup_timeout_s
+        while time.monotonic() < deadline:
+            if self.proc.returncode is not None:
+                stderr = (await self.proc.stderr.read()).decode("utf-8", errors="replace")
+                raise RuntimeError(f"backend exited with code {self.proc.returncode}: {stderr.strip()[:600]}")
+            try:
+                conn = await HttpConnection.open("127.0.0.1", self.port)
+                status, _ = await conn.request("GET", "/health")
+                await conn.close()
+                if status < 500:
+                    return self
+            except OSError:
+                pass
+            await asyncio.sleep(0.1)
+        await self.__aexit__(None, None, None)
+        raise RuntimeError(f"backend did not answer on port {self.port} within {self.startup_timeout_s:.0f}s")
+
+    async def __aexit__(self, *exc) -> None:
+        if self.proc is None or self.proc.returncode is not None:
+            return
+        try:
+            os.killpg(self.proc.pid, signal.SIGTERM)
+            await asyncio.wait_for(self.proc.wait(), 5)
+        except (ProcessLookupError, asyncio.TimeoutError):
+            try:
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await self.proc.wait()
+
+
+# -- HTTP client ------------------------------------------------------------------
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client connection (Content-Length and chunked bodies)."""
+
+    def __init__(self, host: str, port: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.host = host
+        self.port = port
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "HttpConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(host, port, reader, writer)
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None) -> Tuple[int, bytes]:
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nConnection: keep-alive\r\n"
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        self.writer.write(head.encode("ascii") + b"\r\n" + (body or b""))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by server")
+        status = int(status_line.split()[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "content-length" in headers:
+            data = await self.reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            data = b"".join(chunks)
+        else:
+            data = await self.reader.read()
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, data
+
+    @property
+    def closed(self) -> bool:
+        return self.writer.is_closing()
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+
+
+# -- load test ---------------------------------------------------------------------
+def _percentile(sorted_ms: List[float], q: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return round(sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))], 2)
+
+
+def _latency(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50": _percentile(ordered, 0.50),
+        "p95": _percentile(ordered, 0.95),
+        "p99": _percentile(ordered, 0.99),
+        "max": round(ordered[-1], 2) if ordered else 0.0,
+        "mean": round(statistics.fmean(ordered), 2) if ordered else 0.0,
+    }
+
+
+async def run_load_test(
+    backend_dir: str | Path = "backend",
+    duration_s: float = 10.0,
+    concurrency: int = 16,
+    mix: Optional[Dict[str, float]] = None,
+    target_rps: Optional[float] = None,
+    warmup_requests: int = 50,
+    port: Optional[int] = None,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Start the backend in `backend_dir` (relative to the workspace root) and load it.
+
+    `mix` maps "METHOD /path" to a weight (default 80% GET /scores, 20% POST /scores).
+    Returns {requests, errors, error_rate, rps, latency_ms: {p50, p95, p99, max, mean},
+    routes: {route: {requests, errors, latency_ms}}, status: {code: count},
+    memory: {rss_start_mb, rss_end_mb, rss_peak_mb, growth_mb}, config}; on a startup
+    failure, {error: str, config}.
+    """
+    backend_dir = resolve(backend_dir)
+    mix = mix or DEFAULT_MIX
+    port = port or free_port()
+    config = {"backend_dir": str(backend_dir), "duration_s": duration_s, "concurrency": concurrency,
+              "mix": mix, "target_rps": target_rps, "port": port}
+    routes = list(mix)
+    weights = [mix[r] for r in routes]
+    rng = random.Random(seed)
+    latencies: Dict[str, List[float]] = {r: [] for r in routes}
+    errors: Dict[str, int] = {r: 0 for r in routes}
+    status_counts: Dict[str, int] = {}
+    rss: List[int] = []
+    next_slot = 0.0
+
+    async def one(conn: HttpConnection, route: str, counter: int) -> Tuple[HttpConnection, int]:
+        method, path = route.split(" ", 1)
+        body = None
+        if method == "POST":
+            body = json.dumps({"name": f"load{counter % 1000}", "score": rng.randint(0, 500)}).encode()
+        if conn.closed:
+            conn = await HttpConnection.open("127.0.0.1", port)
+        status, _ = await conn.request(method, path, body)
+        return conn, status
+
+    try:
+        async with BackendProcess(backend_dir, port) as backend:
+            conn = await HttpConnection.open("127.0.0.1", port)
+            for i in range(warmup_requests):
+                conn, _ = await one(conn, routes[i % len(routes)], i)
+            await conn.close()
+
+            start = time.perf_counter()
+            deadline = start + duration_s
+
+            async def worker(index: int) -> None:
+                nonlocal next_slot
+                conn = await HttpConnection.open("127.0.0.1", port)
+                counter = index
+                try:
+                    while True:
+                        now = time.perf_counter()
+                        if target_rps:
+                            slot = max(now, next_slot)
+                            next_slot = slot + 1.0 / target_rps
+                            if slot >= deadline:
+                                return
+                            await asyncio.sleep(slot - now)
+                        elif now >= deadline:
+                            return
+                        route = rng.choices(routes, weights)[0]
+                        counter += concurrency
+                        t0 = time.perf_counter()
+                        try:
+                            conn, status = await one(conn, route, counter)
+                        except (OSError, ValueError, asyncio.IncompleteReadError) as exc:
+                            errors[route] += 1
+                            key = type(exc).__name__
+                            status_counts[key] = status_counts.get(key, 0) + 1
+                            conn = await HttpConnection.open("127.0.0.1", port)
+                            continue
+                        latencies[route].append((time.perf_counter() - t0) * 1000)
+                        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+                        if status >= 400:
+                            errors[route] += 1
+                finally:
+                    await conn.close()
+
+            async def sample_memory() -> None:
+                while True:
+                    value = tree_rss_kb(backend.proc.pid)
+                    if value is not None:
+                        rss.append(value)
+                    await asyncio.sleep(0.2)
+
+            sampler = asyncio.create_task(sample_memory())
+            try:
+                await asyncio.gather(*(worker(i) for i in range(concurrency)))
+            finally:
+                sampler.cancel()
+            elapsed = time.perf_counter() - start
+            final_rss = tree_rss_kb(backend.proc.pid)
+            if final_rss is not None:
+                rss.append(final_rss)
+    except (RuntimeError, OSError) as exc:
+        return {"error": f"load test failed: {exc}", "config": config}
+
+    all_latencies = [v for values in latencies.values() for v in values]
+    requests = len(all_latencies) + sum(status_counts.get(k, 0) for k in status_counts if not k.isdigit())
+    total_errors = sum(errors.values())
+
+    def mb(kb: Optional[int]) -> Optional[float]:
+        return round(kb / 1024, 2) if kb is not None else None
+
+    memory = {"rss_start_mb": None, "rss_end_mb": None, "rss_peak_mb": None, "growth_mb": None}
+    if rss:
+        memory = {"rss_start_mb": mb(rss[0]), "rss_end_mb": mb(rss[-1]), "rss_peak_mb": mb(max(rss)),
+                  "growth_mb": mb(rss[-1] - rss[0])}
+    return {
+        "requests": requests,
+        "errors": total_errors,
+        "error_rate": round(total_errors / requests, 4) if requests else 1.0,
+        "rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": _latency(all_latencies),
+        "routes": {r: {"requests": len(latencies[r]), "errors": errors[r], "latency_ms": _latency(latencies[r])}
+                   for r in routes},
+        "status": status_counts,
+        "memory": memory,
+        "config": config,
+    }
+
+
+async def load_gate(backend_dir: str | Path = "backend", thresholds: Optional[LoadThresholds] = None,
+                    **options: Any) -> Dict[str, Any]:
+    """Run a load test and judge it: the report plus {ok, violations, thresholds}."""
+    thresholds = thresholds or load_thresholds()
+    report = await run_load_test(backend_dir, **options)
+    violations = check_thresholds(report, thresholds)
+    return dict(report, ok=not violations, violations=violations, thresholds=asdict(thresholds))
+
+
+@function_tool
+async def load_test_backend(duration_s: float = 5.0, concurrency: int = 16, get_ratio: float = 0.8) -> dict:
+    """Start backend/ on a free local port, load GET/POST /scores and judge the result.
+
+    Args:
+        duration_s: How long to generate load, in seconds.
+        concurrency: Number of concurrent keep-alive connections.
+        get_ratio: Fraction of requests that are GET /scores (the rest POST /scores).
+
+    Returns: {ok: bool, violations: [...], rps, latency_ms: {p50, p95, p99, max, mean},
+        error_rate, memory: {rss_start_mb, rss_end_mb, growth_mb, ...}, thresholds}.
+        ok is false if any threshold (throughput, p95/p99 latency, errors, memory growth) is missed.
+    """
+    mix = {"GET /scores": get_ratio, "POST /scores": max(0.0, 1.0 - get_ratio)}
+    return await load_gate("backend", duration_s=duration_s, concurrency=concurrency, mix=mix)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test a generated Bug Busters backend")
+    parser.add_argument("backend_dir", nargs="?", default="backend")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load (default 10)")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent connections (default 16)")
+    parser.add_argument("--get-ratio", type=float, default=0.8, help="share of GET /scores (default 0.8)")
+    parser.add_argument("--rps", type=float, default=None, help="target requests/s (default: as fast as possible)")
+    parser.add_argument("--thresholds", default=None, help="JSON file with LoadThresholds fields")
+    args = parser.parse_args(argv)
+    mix = {"GET /scores": args.get_ratio, "POST /scores": max(0.0, 1.0 - args.get_ratio)}
+    result = asyncio.run(load_gate(args.backend_dir, load_thresholds(args.thresholds), duration_s=args.duration,
+                                   concurrency=args.concurrency, mix=mix, target_rps=args.rps))
+    print(json.dumps(result, indent=2))
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
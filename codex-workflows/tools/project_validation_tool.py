@@ -2,9 +2,10 @@
 Project validation tools exposed to agents.
 """
 from __future__ import annotations
-from pathlib import Path
 from typing import List, Optional, Dict, Any
 from agents import function_tool
+from tools.workspace_index import workspace_index
+from tools.workspace_root import workspace_root
 
 
 EXPECTED_TREE: List[str] = [
@@ -21,32 +22,29 @@ EXPECTED_TREE: List[str] = [
 ]
 
 
+def validate_tree(files: Optional[List[str]] = None, gate: Optional[str] = None) -> Dict[str, Any]:
+    """Plain (non-tool) form of validate_expected_tree, used by code-driven gates."""
+    paths = files if files else EXPECTED_TREE
+    cwd = workspace_root()
+    result = workspace_index(cwd).check(paths, gate=gate)
+
+    return dict(
+        result,
+        present=result.pop("existing"),
+        cwd=str(cwd),
+        expected_count=len(paths),
+    )
+
+
 @function_tool
 def validate_expected_tree(files: Optional[List[str]] = None) -> Dict[str, Any]:
-    """Validate the presence of the Step-5 expected project tree.
+    """Validate the presence and content of the Step-5 expected project tree.
 
     Args:
         files: Optional override list of file paths to validate. If omitted, uses the standard expected list.
 
     Returns:
-        dict with: ok (bool), present (list), missing (list), cwd (str), expected_count (int)
+        dict with: ok (bool), present (list), missing (list), invalid (dict of path -> reason),
+        cwd (str), expected_count (int)
     """
-    paths = files if files else EXPECTED_TREE
-    missing: List[str] = []
-    present: List[str] = []
-    cwd = Path.cwd()
-
-    for p in paths:
-        fp = cwd / p
-        if fp.is_file():
-            present.append(p)
-        else:
-            missing.append(p)
-
-    return {
-        "ok": len(missing) == 0,
-        "present": present,
-        "missing": missing,
-        "cwd": str(cwd),
-        "expected_count": len(paths),
-    }
+    return validate_tree(files)
@@ -0,0 +1,236 @@
+"""
+Shared index of workspace artifacts: size, mtime and content hash per file.
+
+The write tools record every file they write (with the hash computed while writing),
+so gates only stat paths and re-hash files whose size or mtime changed since the
+index last saw them (e.g. files written by Codex through MCP). Content checks
+(minimum size, required substring, JSON/HTML parse) are cached per content hash,
+so a gate costs O(changed files).
+
+    index = workspace_index()
+    result = index.check(["frontend/index.html"], gate="frontend")
+    result["invalid"]   # {"frontend/index.html": "does not parse as HTML: ..."}
+    result["changed"]   # files added/modified/removed since the last "frontend" gate
+
+There is one index per workspace root, shared by all tools running in that workspace.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from tools.workspace_root import workspace_root
+
+
+@dataclass(frozen=True)
+class ArtifactRule:
+    """Content requirements for one artifact, beyond existing as a file."""
+    min_bytes: int = 1
+    contains: Optional[str] = None
+    parse: Optional[str] = None  # "json" | "html"
+
+
+DEFAULT_RULE = ArtifactRule()
+
+# Deliverables with stricter requirements than "exists and is not empty".
+ARTIFACT_RULES: Dict[str, ArtifactRule] = {
+    "frontend/index.html": ArtifactRule(min_bytes=64, parse="html"),
+    "frontend/game.js": ArtifactRule(min_bytes=64),
+    "backend/server.js": ArtifactRule(min_bytes=64),
+    "backend/package.json": ArtifactRule(parse="json", contains='"start"'),
+}
+
+
+def rule_for(path: str) -> ArtifactRule:
+    return ARTIFACT_RULES.get(path, DEFAULT_RULE)
+
+
+@dataclass
+class IndexEntry:
+    size: int
+    mtime_ns: int
+    sha256: str
+    verdicts: Dict[ArtifactRule, Optional[str]] = field(default_factory=dict)
+
+
+class _TagCounter(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.tags = 0
+
+    def handle_starttag(self, tag, attrs) -> None:
+        self.tags += 1
+
+
+def _parse_error(data: bytes, kind: str) -> Optional[str]:
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        return f"is not valid UTF-8: {exc}"
+    if kind == "json":
+        try:
+            json.loads(text)
+        except ValueError as exc:
+            return f"does not parse as JSON: {exc}"
+    elif kind == "html":
+        parser = _TagCounter()
+        parser.feed(text)
+        parser.close()
+        if not parser.tags:
+            return "does not parse as HTML: no elements found"
+    else:
+        raise ValueError(f"Unknown parse check: {kind}")
+    return None
+
+
+def validate_content(data: bytes, rule: ArtifactRule) -> Optional[str]:
+    """Return why `data` violates `rule`, or None if it is acceptable."""
+    if len(data) < rule.min_bytes:
+        return f"too small ({len(data)} bytes, need at least {rule.min_bytes})"
+    if rule.contains is not None and rule.contains.encode("utf-8") not in data:
+        return f"does not contain {rule.contains!r}"
+    if rule.parse:
+        return _parse_error(data, rule.parse)
+    return None
+
+
+class WorkspaceIndex:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.entries: Dict[str, IndexEntry] = {}
+        self.stats = {"stats": 0, "hashed": 0, "recorded": 0, "validated": 0}
+        self._marks: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def key(self, path: str | Path) -> str:
+        p = Path(path)
+        if not p.is_absolute():
+            return p.as_posix()
+        try:
+            return p.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(p)
+
+    def _full(self, key: str) -> Path:
+        p = Path(key)
+        return p if p.is_absolute() else self.root / p
+
+    def record_write(self, path: str | Path, sha256: str) -> IndexEntry:
+        """Record a file the caller just wrote, with the sha256 of what it wrote (no re-read)."""
+        key = self.key(path)
+        st = os.stat(self._full(key))
+        entry = IndexEntry(size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=sha256)
+        with self._lock:
+            self.entries[key] = entry
+            self.stats["recorded"] += 1
+        return entry
+
+    def forget(self, prefix: str = "") -> None:
+        """Drop entries under `prefix` (all entries if empty), e.g. after a directory reset."""
+        prefix = prefix.rstrip("/")
+        with self._lock:
+            for key in [k for k in self.entries if not prefix or k == prefix or k.startswith(prefix + "/")]:
+                del self.entries[key]
+
+    def refresh(self, path: str | Path) -> Optional[IndexEntry]:
+        """Current entry for `path`: a stat, plus a re-hash only if size or mtime changed."""
+        key = self.key(path)
+        full = self._full(key)
+        self.stats["stats"] += 1
+        try:
+            st = os.stat(full)
+        except OSError:
+            st = None
+        if st is None or not os.path.isfile(full):
+            with self._lock:
+                self.entries.pop(key, None)
+            return None
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is not None and entry.size == st.st_size and entry.mtime_ns == st.st_mtime_ns:
+            return entry
+        entry = IndexEntry(size=st.st_size, mtime_ns=st.st_mtime_ns,
+                           sha256=hashlib.sha256(full.read_bytes()).hexdigest())
+        with self._lock:
+            self.entries[key] = entry
+            self.stats["hashed"] += 1
+        return entry
+
+    def verdict(self, path: str | Path, entry: IndexEntry, rule: ArtifactRule) -> Optional[str]:
+        """Content check for `rule`, cached on the entry (i.e. per content hash)."""
+        if rule in entry.verdicts:
+            return entry.verdicts[rule]
+        if rule.contains is None and rule.parse is None:
+            # Size-only rules never need the file contents.
+            result = None if entry.size >= rule.min_bytes else (
+                f"too small ({entry.size} bytes, need at least {rule.min_bytes})")
+        else:
+            result = validate_content(self._full(self.key(path)).read_bytes(), rule)
+            self.stats["validated"] += 1
+        entry.verdicts[rule] = result
+        return result
+
+    def check(
+        self,
+        paths: List[str],
+        rules: Optional[Dict[str, ArtifactRule]] = None,
+        gate: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Existence + content checks for `paths`.
+
+        `rules` overrides ARTIFACT_RULES per path. With `gate`, also reports which of
+        `paths` changed since the previous check under the same gate name.
+        """
+        existing: List[str] = []
+        missing: List[str] = []
+        invalid: Dict[str, str] = {}
+        seen: Dict[str, str] = {}
+        for path in paths:
+            entry = self.refresh(path)
+            if entry is None:
+                missing.append(path)
+                continue
+            existing.append(path)
+            seen[self.key(path)] = entry.sha256
+            reason = self.verdict(path, entry, (rules or {}).get(path) or rule_for(self.key(path)))
+            if reason:
+                invalid[path] = reason
+
+        result: Dict[str, Any] = {
+            "ok": not missing and not invalid,
+            "missing": missing,
+            "existing": existing,
+            "invalid": invalid,
+        }
+        if gate is not None:
+            with self._lock:
+                previous = self._marks.get(gate, {})
+                self._marks[gate] = seen
+            result["changed"] = sorted(k for k, sha in seen.items() if previous.get(k) != sha)
+            result["removed"] = sorted(k for k in previous if k not in seen)
+        return result
+
+
+_INDEXES: Dict[Path, WorkspaceIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def workspace_index(root: Optional[Path] = None) -> WorkspaceIndex:
+    """The index for `root` (default: the active workspace root)."""
+    root = Path(root or workspace_root()).resolve()
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(root)
+        if index is None:
+            index = _INDEXES[root] = WorkspaceIndex(root)
+        return index
+
+
+def drop_workspace_index(root: Optional[Path] = None) -> None:
+    """Forget the index for `root` (default: the active workspace root), e.g. once it is deleted."""
+    root = Path(root or workspace_root()).resolve()
+    with _INDEXES_LOCK:
+        _INDEXES.pop(root, None)
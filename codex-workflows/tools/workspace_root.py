@@ -0,0 +1,39 @@
+"""
+Per-run workspace root shared by all tools.
+
+Tools resolve relative paths against workspace_root() instead of the process cwd,
+so several workflow runs can execute concurrently in one process, each in its own
+directory. The root is a ContextVar: it follows asyncio tasks, and each run sets it
+with use_workspace(). It defaults to the current working directory.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Optional
+
+_WORKSPACE_ROOT: ContextVar[Optional[Path]] = ContextVar("workspace_root", default=None)
+
+
+def workspace_root() -> Path:
+    """The active run's workspace root (the current working directory if none is set)."""
+    root = _WORKSPACE_ROOT.get()
+    return root if root is not None else Path.cwd()
+
+
+def resolve(path: str | Path) -> Path:
+    """Resolve `path` against the workspace root (absolute paths are returned unchanged)."""
+    p = Path(path)
+    return p if p.is_absolute() else workspace_root() / p
+
+
+@contextmanager
+def use_workspace(root: str | Path) -> Iterator[Path]:
+    """Make `root` the workspace for tools called in this context (and tasks it spawns)."""
+    root = Path(root).resolve()
+    root.mkdir(parents=True, exist_ok=True)
+    token = _WORKSPACE_ROOT.set(root)
+    try:
+        yield root
+    finally:
+        _WORKSPACE_ROOT.reset(token)
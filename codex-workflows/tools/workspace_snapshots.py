@@ -0,0 +1,224 @@
+"""
+Versioned snapshots of the workspace output tree.
+
+reset_output_dirs() no longer deletes the previous run's output: the output dirs
+(design/, frontend/, backend/, tests/) are renamed into .snapshots/<id>/ (O(1) per
+directory) and the few project-root files are copied next to them. Each snapshot has
+a manifest.json with size and sha256 per file, taken from the workspace index, so
+files already written by the tools are not re-read.
+
+Restores copy files back out of the snapshot, so a restored file shares nothing with the
+snapshot: the stage agents' Codex MCP server edits files in place, and a hard link would
+let such an edit change the saved run (and invalidate its manifest hashes).
+
+    python -m tools.workspace_snapshots list
+    python -m tools.workspace_snapshots diff 20250101-120000-0001 20250101-130000-0002
+    python -m tools.workspace_snapshots diff 20250101-120000-0001 --file frontend/game.js
+    python -m tools.workspace_snapshots restore 20250101-120000-0001
+"""
+from __future__ import annotations
+import argparse
+import difflib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from tools.workspace_index import workspace_index
+from tools.workspace_root import workspace_root
+
+SNAPSHOT_DIR = ".snapshots"
+OUTPUT_DIRS = ["design", "frontend", "backend", "tests"]
+ROOT_FILES = ["REQUIREMENTS.md", "TEST.md", "AGENT_TASKS.md"]
+
+
+def snapshots_dir(root: Optional[Path] = None) -> Path:
+    return Path(root or workspace_root()) / SNAPSHOT_DIR
+
+
+def _copy_out(src: Path, dst: Path) -> None:
+    """Copy a snapshot file into the workspace; never a hard link (see module docstring)."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dst)
+
+
+def _files_under(root: Path, names: List[str]) -> List[str]:
+    files = []
+    for name in names:
+        p = root / name
+        if p.is_file():
+            files.append(name)
+        elif p.is_dir():
+            # Skips the temp files of chunked writes still in progress (tools.file_tools).
+            files.extend(sorted(f.relative_to(root).as_posix() for f in p.rglob("*")
+                                if f.is_file() and not f.name.endswith(".part")))
+    return files
+
+
+def current_manifest(root: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    """{path: {size, sha256}} for the live output tree (hashes come from the workspace index)."""
+    root = Path(root or workspace_root())
+    index = workspace_index(root)
+    files = {}
+    for path in _files_under(root, ROOT_FILES + OUTPUT_DIRS):
+        entry = index.refresh(path)
+        if entry is not None:
+            files[path] = {"size": entry.size, "sha256": entry.sha256}
+    return files
+
+
+def _new_snapshot_dir(base: Path) -> Path:
+    base.mkdir(parents=True, exist_ok=True)
+    seq = len([p for p in base.iterdir() if p.is_dir()]) + 1
+    while True:
+        path = base / f"{datetime.now():%Y%m%d-%H%M%S}-{seq:04d}"
+        try:
+            path.mkdir()
+            return path
+        except FileExistsError:
+            seq += 1
+
+
+def take_snapshot(label: Optional[str] = None, root: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Move the output dirs into a new snapshot and copy the root files next to them.
+
+    Returns the manifest, or None if there was nothing to snapshot. The output dirs no
+    longer exist afterwards; callers recreate them.
+    """
+    root = Path(root or workspace_root())
+    moved = [name for name in OUTPUT_DIRS if (root / name).is_dir() and any((root / name).iterdir())]
+    copied = [name for name in ROOT_FILES if (root / name).is_file()]
+    if not moved and not copied:
+        return None
+
+    files = current_manifest(root)
+    snap = _new_snapshot_dir(snapshots_dir(root))
+    for name in moved:
+        os.rename(root / name, snap / name)
+    for name in copied:
+        shutil.copy2(root / name, snap / name)
+
+    index = workspace_index(root)
+    for name in moved:
+        index.forget(name)
+    manifest = {
+        "id": snap.name,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "label": label,
+        "dirs": moved,
+        "root_files": copied,
+        "files": files,
+    }
+    (snap / "manifest.json").write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    return manifest
+
+
+def list_snapshots(root: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Snapshot manifests (without the per-file table), oldest first."""
+    base = snapshots_dir(root)
+    if not base.is_dir():
+        return []
+    out = []
+    for path in sorted(p for p in base.iterdir() if (p / "manifest.json").is_file()):
+        manifest = load_manifest(path.name, root)
+        out.append({k: v for k, v in manifest.items() if k != "files"} | {"file_count": len(manifest["files"])})
+    return out
+
+
+def load_manifest(snapshot_id: str, root: Optional[Path] = None) -> Dict[str, Any]:
+    path = snapshots_dir(root) / snapshot_id / "manifest.json"
+    if not path.is_file():
+        raise FileNotFoundError(f"No snapshot {snapshot_id!r} in {snapshots_dir(root)}")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _files_of(snapshot_id: Optional[str], root: Optional[Path]) -> Dict[str, Dict[str, Any]]:
+    return current_manifest(root) if snapshot_id is None else load_manifest(snapshot_id, root)["files"]
+
+
+def diff_snapshots(a: str, b: Optional[str] = None, root: Optional[Path] = None) -> Dict[str, Any]:
+    """Compare two snapshots by manifest (b=None compares against the live workspace)."""
+    files_a, files_b = _files_of(a, root), _files_of(b, root)
+    return {
+        "a": a,
+        "b": b or "workspace",
+        "added": sorted(set(files_b) - set(files_a)),
+        "removed": sorted(set(files_a) - set(files_b)),
+        "modified": sorted(p for p in set(files_a) & set(files_b) if files_a[p]["sha256"] != files_b[p]["sha256"]),
+        "unchanged": sum(1 for p in set(files_a) & set(files_b) if files_a[p]["sha256"] == files_b[p]["sha256"]),
+    }
+
+
+def diff_file(a: str, b: Optional[str], path: str, root: Optional[Path] = None) -> str:
+    """Unified diff of one file between two snapshots (b=None: the live workspace)."""
+    root = Path(root or workspace_root())
+
+    def lines(snapshot_id: Optional[str]) -> List[str]:
+        p = (root / path) if snapshot_id is None else (snapshots_dir(root) / snapshot_id / path)
+        return p.read_text(encoding="utf-8").splitlines(keepends=True) if p.is_file() else []
+
+    return "".join(difflib.unified_diff(lines(a), lines(b), fromfile=f"{a}/{path}", tofile=f"{b or 'workspace'}/{path}"))
+
+
+def restore_snapshot(snapshot_id: str, root: Optional[Path] = None) -> Dict[str, Any]:
+    """Make the workspace match a snapshot. The current tree is snapshotted first."""
+    root = Path(root or workspace_root())
+    manifest = load_manifest(snapshot_id, root)
+    source = snapshots_dir(root) / snapshot_id
+    saved = take_snapshot(label=f"before restore of {snapshot_id}", root=root)
+
+    for name in OUTPUT_DIRS:
+        (root / name).mkdir(parents=True, exist_ok=True)
+    for name in ROOT_FILES:  # already copied into the `saved` snapshot
+        (root / name).unlink(missing_ok=True)
+    index = workspace_index(root)
+    for path, meta in manifest["files"].items():
+        _copy_out(source / path, root / path)
+        index.record_write(root / path, meta["sha256"])
+    return {"ok": True, "restored": snapshot_id, "files": len(manifest["files"]),
+            "saved_as": saved["id"] if saved else None}
+
+
+def prune_snapshots(keep: int, root: Optional[Path] = None) -> List[str]:
+    """Delete all but the newest `keep` snapshots; returns the removed ids."""
+    snapshots = [s["id"] for s in list_snapshots(root)]
+    removed = snapshots[:-keep] if keep > 0 else snapshots
+    for snapshot_id in removed:
+        shutil.rmtree(snapshots_dir(root) / snapshot_id)
+    return removed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="List, diff and restore workspace snapshots")
+    parser.add_argument("--root", default=None, help="Workspace root (default: CWD)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list")
+    p_diff = sub.add_parser("diff")
+    p_diff.add_argument("a")
+    p_diff.add_argument("b", nargs="?", default=None, help="Second snapshot (default: the live workspace)")
+    p_diff.add_argument("--file", default=None, help="Show a unified diff of this file")
+    p_restore = sub.add_parser("restore")
+    p_restore.add_argument("snapshot")
+    p_prune = sub.add_parser("prune")
+    p_prune.add_argument("--keep", type=int, default=10)
+    args = parser.parse_args(argv)
+    root = Path(args.root) if args.root else None
+
+    if args.command == "list":
+        result: Any = list_snapshots(root)
+    elif args.command == "diff" and args.file:
+        print(diff_file(args.a, args.b, args.file, root), end="")
+        return 0
+    elif args.command == "diff":
+        result = diff_snapshots(args.a, args.b, root)
+    elif args.command == "restore":
+        result = restore_snapshot(args.snapshot, root)
+    else:
+        result = prune_snapshots(args.keep, root)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
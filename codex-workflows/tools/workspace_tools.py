@@ -1,28 +1,35 @@
 from __future__ import annotations
-import shutil
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from agents import function_tool
+from tools.file_tools import atomic_write
+from tools.workspace_index import workspace_index
+from tools.workspace_root import workspace_root
+from tools.workspace_snapshots import OUTPUT_DIRS, prune_snapshots, take_snapshot
 
 
-ALLOWED_OUTPUT_DIRS = ["design", "frontend", "backend", "tests"]
+ALLOWED_OUTPUT_DIRS = OUTPUT_DIRS
+KEEP_SNAPSHOTS = 20
 
 
-@function_tool
-def reset_output_dirs() -> Dict[str, Any]:
-    """Delete and recreate the standard output folders: design/, frontend/, backend/, tests/.
+def reset_workspace(label: Optional[str] = None, keep_snapshots: int = KEEP_SNAPSHOTS) -> Dict[str, Any]:
+    """Plain (non-tool) form of reset_output_dirs, used by code-driven workflows.
 
-    Returns a dict with details of which paths were removed and recreated.
+    The previous output is moved into a snapshot (see tools.workspace_snapshots), not deleted.
     """
-    cwd = Path.cwd()
+    cwd = workspace_root()
     removed: List[str] = []
     created: List[str] = []
+    index = workspace_index(cwd)
+
+    snapshot = take_snapshot(label=label, root=cwd)
+    if snapshot is not None:
+        removed = [str(cwd / name) for name in snapshot["dirs"]]
+        prune_snapshots(keep_snapshots, root=cwd)
 
     for name in ALLOWED_OUTPUT_DIRS:
+        index.forget(name)
         d = cwd / name
-        if d.exists():
-            shutil.rmtree(d)
-            removed.append(str(d))
         d.mkdir(parents=True, exist_ok=True)
         created.append(str(d))
 
@@ -30,10 +37,21 @@ def reset_output_dirs() -> Dict[str, Any]:
         "ok": True,
         "removed": removed,
         "created": created,
+        "snapshot": snapshot["id"] if snapshot else None,
         "cwd": str(cwd),
     }
 
 
+@function_tool
+def reset_output_dirs() -> Dict[str, Any]:
+    """Reset the standard output folders: design/, frontend/, backend/, tests/.
+
+    The previous contents are kept in a versioned snapshot under .snapshots/.
+    Returns a dict with the snapshot id and which paths were moved and recreated.
+    """
+    return reset_workspace()
+
+
 @function_tool
 def write_root_text_file(path: str, content: str, overwrite: bool = True) -> Dict[str, Any]:
     """Write a text file at the project root only (no subdirectories allowed).
@@ -47,11 +65,14 @@ def write_root_text_file(path: str, content: str, overwrite: bool = True) -> Dic
     if p.parts and (len(p.parts) > 1 or p.as_posix().find("/") != -1):
         return {"ok": False, "reason": "path must be root-level only", "path": str(p)}
 
-    fp = Path.cwd() / p.name
+    fp = workspace_root() / p.name
     if fp.exists() and not overwrite:
         return {"ok": False, "reason": "exists", "path": str(fp)}
 
     data = content if isinstance(content, str) else str(content)
-    fp.write_text(data, encoding="utf-8")
-    return {"ok": True, "path": str(fp), "bytes": len(data.encode("utf-8")), "overwritten": True}
+    try:
+        result = atomic_write(fp, [data.encode("utf-8")], overwrite=overwrite)
+    except FileExistsError:
+        return {"ok": False, "reason": "exists", "path": str(fp)}
+    return dict(result, ok=True, overwritten=not result["created"])
 
@@ -0,0 +1,161 @@
+"""
+Multi-file write tool: one call writes all of a role's deliverables and verifies them.
+
+Each role gets its own `write_files` tool (write_files_tool(role)) that only accepts
+paths inside the role's directories — the ownership rules the PM prompt describes,
+enforced in code. All entries are written as one transaction: every file is staged
+and fsynced first, then renamed into place; if any rename fails, the files already
+replaced are rolled back. The result includes a check_files-style report, so a
+stage's write-and-verify cycle is a single tool call.
+"""
+from __future__ import annotations
+import os
+import uuid
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+from agents import FunctionTool, function_tool
+from tools.check_files_tool import check_paths
+from tools.file_tools import AtomicWriter, fsync_dir
+from tools.workspace_index import workspace_index
+from tools.workspace_root import workspace_root
+
+# Directories each role may write to; "" is the project root (root-level files only).
+ROLE_ALLOWED_DIRS: Dict[str, List[str]] = {
+    "project_manager": [""],
+    "designer": ["design"],
+    "frontend": ["frontend"],
+    "backend": ["backend"],
+    "tester": ["tests"],
+}
+
+
+class FileEntry(BaseModel):
+    path: str
+    content: str
+
+
+def check_allowed(path: str, allowed_dirs: Optional[List[str]]) -> Tuple[str, Optional[str]]:
+    """The canonical form of `path` (POSIX separators, no "." parts), and why a role with
+    `allowed_dirs` may not write it, or None if it may. allowed_dirs=None skips the role check.
+
+    Callers must use the canonical form for everything after the check, so that the path that
+    was validated is the path that gets written.
+    """
+    p = PurePosixPath(path.replace("\\", "/"))
+    canonical = p.as_posix()
+    if p.is_absolute() or not p.parts:
+        return canonical, "path must be relative to the project root"
+    if ".." in p.parts:
+        return canonical, "path must not contain '..'"
+    if allowed_dirs is None:
+        return canonical, None
+    parent = p.parent.as_posix()
+    for d in allowed_dirs:
+        if d == "" and parent == ".":
+            return canonical, None
+        if d and (parent == d or parent.startswith(d + "/")):
+            return canonical, None
+    where = ", ".join("the project root" if d == "" else f"{d}/" for d in allowed_dirs)
+    return canonical, f"outside this role's directories ({where})"
+
+
+def write_transaction(entries: List[Tuple[str, str]], allowed_dirs: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Plain (non-tool) form of write_files: validate, write all-or-nothing, then check."""
+    rejected: Dict[str, str] = {}
+    canonical_entries: List[Tuple[str, str]] = []
+    first_seen: Dict[str, str] = {}
+    for path, content in entries:
+        canonical, reason = check_allowed(path, allowed_dirs)
+        if reason:
+            rejected[path] = reason
+        elif canonical in first_seen:
+            # "frontend/a.js", "./frontend/a.js" and "frontend\\a.js" are the same file.
+            rejected[first_seen[canonical]] = "listed more than once"
+            rejected[path] = "listed more than once"
+        else:
+            first_seen[canonical] = path
+            canonical_entries.append((canonical, content))
+    if not entries or rejected:
+        return {"ok": False, "written": [], "rejected": rejected,
+                "reason": "no files given" if not entries else "nothing was written"}
+    paths = [path for path, _ in canonical_entries]
+
+    root = workspace_root()
+    writers: List[AtomicWriter] = []
+    backups: Dict[Path, Optional[Path]] = {}
+    try:
+        for path, content in canonical_entries:
+            target = root / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            writer = AtomicWriter(target)
+            writers.append(writer)
+            writer.write(content.encode("utf-8"))
+            writer.prepare()
+        # Publish: keep a hard link to each file being replaced until every rename succeeded.
+        for writer in writers:
+            backup = None
+            if writer.path.exists():
+                backup = writer.path.with_name(f".{writer.path.name}.{uuid.uuid4().hex[:12]}.bak")
+                os.link(writer.path, backup)
+            backups[writer.path] = backup
+            os.replace(writer.tmp_path, writer.path)
+    except BaseException:
+        for target, backup in backups.items():
+            if backup is not None:
+                os.replace(backup, target)
+            else:
+                target.unlink(missing_ok=True)
+        for writer in writers:
+            writer.abort()
+        raise
+    finally:
+        for backup in backups.values():
+            if backup is not None and backup.exists():
+                backup.unlink()
+
+    index = workspace_index(root)
+    written = []
+    for writer in writers:
+        index.record_write(writer.path, writer.sha256)
+        written.append({"path": writer.path.relative_to(root).as_posix(), "bytes": writer.bytes,
+                        "sha256": writer.sha256, "created": backups[writer.path] is None})
+    for parent in {w.path.parent for w in writers}:
+        fsync_dir(parent)
+
+    check = check_paths(paths)
+    return {
+        "ok": check["ok"],
+        "written": written,
+        "rejected": {},
+        "missing": check["missing"],
+        "invalid": check["invalid"],
+        "checked_count": check["checked_count"],
+    }
+
+
+def write_files_tool(role: str) -> FunctionTool:
+    """The write_files tool for `role` (a key of ROLE_ALLOWED_DIRS)."""
+    allowed = ROLE_ALLOWED_DIRS[role]
+    where = ", ".join("the project root (no subfolders)" if d == "" else f"{d}/" for d in allowed)
+
+    def write_files(files: List[FileEntry]) -> dict:
+        """Write several UTF-8 text files in one call, all or nothing, then verify them.
+
+        Args:
+            files: Every file to write, as {path, content}; paths are relative to the project root.
+
+        Returns: {ok: bool, written: [{path, bytes, sha256, created}], rejected: {path: reason},
+            missing: list, invalid: {path: reason}}. ok is true only if every file was written
+            and passes the same checks as check_files.
+        """
+        return write_transaction([(f.path, f.content) for f in files], allowed)
+
+    return function_tool(
+        write_files,
+        name_override="write_files",
+        description_override=(
+            f"Write all of your files in ONE call (allowed: {where}). All files are written or none are; "
+            "the result already includes a check_files-style report (ok, missing, invalid)."
+        ),
+    )
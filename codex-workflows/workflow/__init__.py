@@ -0,0 +1 @@
+"""Workflow engine for the gated multi-agent pipeline."""
@@ -0,0 +1,6 @@
+"""python -m workflow: run the Bug Busters workflow (see workflow.cli)."""
+import sys
+from workflow.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
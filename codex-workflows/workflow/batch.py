@@ -0,0 +1,235 @@
+"""
+Batch mode: run many task lists concurrently, each in its own workspace.
+
+Input is a JSONL file with one spec per line:
+
+    {"id": "bug-busters", "task_list": "Goal: ...", "max_turns": 30, "timeout_s": 900}
+
+Only `task_list` is required; `id` defaults to the line number. Every run gets an
+isolated workspace (<out>/runs/<id>/) through tools.workspace_root, leases a warm
+Codex MCP server from a shared pool, and runs the DAG pipeline. Concurrency is bounded
+by a semaphore, run starts are paced by a token bucket that backs off on rate-limit
+errors, and one summary line per run is appended to <out>/summary.jsonl.
+
+Usage:
+    python -m workflow.batch specs.jsonl --out batch_runs --concurrency 8
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from agents.exceptions import MaxTurnsExceeded
+from openai import RateLimitError
+from tools.project_validation_tool import validate_tree
+from tools.workspace_index import drop_workspace_index
+from tools.workspace_root import use_workspace
+from workflow.dag import GateFailed
+from workflow.mcp_pool import MCPServerPool, codex_server_factory
+from workflow.stage_cache import StageCache
+from workflow.team import run_stage_pipeline, stage_turns
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts of up to `capacity`.
+
+    backoff() pauses every acquirer, e.g. after a provider rate-limit response.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def backoff(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+def load_specs(path: Path | str) -> List[Dict[str, Any]]:
+    specs: List[Dict[str, Any]] = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            spec = json.loads(line)
+            if not spec.get("task_list"):
+                raise ValueError(f"{path}:{lineno}: spec has no task_list")
+            run_id = re.sub(r"[^A-Za-z0-9_.-]", "_", str(spec.get("id", f"run-{lineno:04d}")))
+            if run_id in seen:
+                raise ValueError(f"{path}:{lineno}: duplicate id {run_id!r}")
+            seen.add(run_id)
+            specs.append(dict(spec, id=run_id))
+    return specs
+
+
+def _retry_after(exc: RateLimitError, attempt: int) -> float:
+    response = getattr(exc, "response", None)
+    header = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(header)
+    except (TypeError, ValueError):
+        return min(60.0, 2.0 ** attempt)
+
+
+async def run_one(
+    spec: Dict[str, Any],
+    out_dir: Path,
+    pool: MCPServerPool,
+    bucket: TokenBucket,
+    max_turns: int,
+    timeout_s: float,
+    cache: Optional[StageCache] = None,
+    rate_limit_retries: int = 3,
+) -> Dict[str, Any]:
+    run_id = spec["id"]
+    max_turns = int(spec.get("max_turns", max_turns))
+    timeout_s = float(spec.get("timeout_s", timeout_s))
+    summary: Dict[str, Any] = {"id": run_id, "status": "ok", "turns": 0, "error": None}
+    start = time.perf_counter()
+
+    with use_workspace(out_dir / "runs" / run_id) as root:
+        summary["workspace"] = str(root)
+        for attempt in range(rate_limit_retries + 1):
+            await bucket.acquire()
+            scheduler = None
+            try:
+                async with pool.lease() as server:
+                    scheduler = await asyncio.wait_for(
+                        run_stage_pipeline(server, spec["task_list"], max_turns=max_turns, cache=cache),
+                        timeout=timeout_s,
+                    )
+                summary.update(status="ok", error=None)
+                break
+            except RateLimitError as exc:
+                delay = _retry_after(exc, attempt)
+                logger.warning("Run %s rate limited; backing off %.1fs", run_id, delay)
+                bucket.backoff(delay)
+                summary.update(status="rate_limited", error=str(exc))
+            except asyncio.TimeoutError:
+                summary.update(status="timeout", error=f"exceeded {timeout_s:.0f}s")
+                break
+            except MaxTurnsExceeded as exc:
+                summary.update(status="max_turns", error=str(exc))
+                break
+            except GateFailed as exc:
+                summary.update(status="gate_failed", error=str(exc))
+                break
+            except Exception as exc:
+                logger.error("Run %s failed: %s", run_id, exc, exc_info=True)
+                summary.update(status="error", error=f"{type(exc).__name__}: {exc}")
+                break
+
+        if scheduler is not None:
+            summary["stages"] = {
+                name: {"attempts": r.attempts, "cached": r.cached, "turns": stage_turns(r),
+                       "duration_s": round(r.duration_s, 3)}
+                for name, r in scheduler.results.items()
+            }
+            summary["turns"] = sum(s["turns"] for s in summary["stages"].values())
+        summary["missing"] = validate_tree()["missing"]
+        drop_workspace_index(root)  # each run has its own root; keep the cache from growing
+
+    summary["duration_s"] = round(time.perf_counter() - start, 3)
+    logger.info("Run %s finished: status=%s turns=%d duration=%.1fs",
+                run_id, summary["status"], summary["turns"], summary["duration_s"])
+    return summary
+
+
+async def run_batch(
+    specs: List[Dict[str, Any]],
+    out_dir: Path | str,
+    concurrency: int = 4,
+    max_turns: int = 30,
+    timeout_s: float = 900.0,
+    rate: float = 1.0,
+    burst: int = 4,
+    pool: Optional[MCPServerPool] = None,
+    cache: Optional[StageCache] = None,
+) -> List[Dict[str, Any]]:
+    """Run every spec with at most `concurrency` runs in flight; returns the summaries."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = out_dir / "summary.jsonl"
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate, burst)
+    pool = pool or MCPServerPool(codex_server_factory(), size=concurrency)
+    write_lock = asyncio.Lock()
+
+    async def bounded(spec: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            summary = await run_one(spec, out_dir, pool, bucket, max_turns, timeout_s, cache=cache)
+        async with write_lock:
+            with summary_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(summary) + "\n")
+        return summary
+
+    async with pool:
+        summaries = await asyncio.gather(*(bounded(spec) for spec in specs))
+        logger.info("Batch finished: %d runs, MCP pool metrics: %s", len(summaries), pool.metrics())
+    return summaries
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run many workflow task lists concurrently")
+    parser.add_argument("specs", help="JSONL file of specs ({id, task_list, max_turns?, timeout_s?})")
+    parser.add_argument("--out", default="batch_runs", help="Output directory (workspaces + summary.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum runs in flight")
+    parser.add_argument("--max-turns", type=int, default=30, help="Default per-stage turn budget")
+    parser.add_argument("--timeout", type=float, default=900.0, help="Default per-run timeout in seconds")
+    parser.add_argument("--rate", type=float, default=1.0, help="Run starts per second (token bucket rate)")
+    parser.add_argument("--burst", type=int, default=4, help="Token bucket capacity")
+    parser.add_argument("--mcp-pool-size", type=int, default=None, help="Warm Codex MCP servers (default: concurrency)")
+    parser.add_argument("--cache-dir", default=None, help="Share a stage cache across runs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    load_dotenv(override=True)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    specs = load_specs(args.specs)
+    pool = MCPServerPool(codex_server_factory(), size=args.mcp_pool_size or args.concurrency)
+    cache = StageCache(args.cache_dir) if args.cache_dir else None
+    summaries = asyncio.run(run_batch(
+        specs, args.out, concurrency=args.concurrency, max_turns=args.max_turns, timeout_s=args.timeout,
+        rate=args.rate, burst=args.burst, pool=pool, cache=cache,
+    ))
+    failed = [s["id"] for s in summaries if s["status"] != "ok"]
+    print(f"{len(summaries) - len(failed)}/{len(summaries)} runs ok; summary: {Path(args.out) / 'summary.jsonl'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
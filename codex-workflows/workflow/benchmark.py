@@ -0,0 +1,171 @@
+"""
+Offline benchmark: replay a recorded workflow run and report per-stage costs.
+
+Record a cassette with a live run:
+    python multi_agent_workflow_with_logging.py --record cassettes/bug_busters.json
+
+Replay it with no network (model and Codex MCP responses come from the cassette;
+local function tools run for real in a temporary workspace):
+    python -m workflow.benchmark cassettes/bug_busters.json --repeat 5 --out bench.json
+
+Per stage (or per agent in handoff mode) the report lists model turns, handoffs, tool
+calls by name, wall time, time spent in tools, and framework overhead (wall time minus
+tool time; replayed model calls cost ~0). With --baseline, the run fails if turns,
+handoffs or tool calls grew, or overhead regressed beyond --max-overhead-regression.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+from agents import RunConfig, Runner
+from tools.load_test_tool import LoadThresholds
+from tools.workspace_root import use_workspace
+from tools.workspace_tools import reset_workspace
+from workflow.context_pack import ContextPack
+from workflow.instrumentation import Tracer, TracingHooks
+from workflow.replay import Cassette, ReplayMCPServer, ReplayModelProvider
+from workflow.team import STAGE_DEPS, build_handoff_team, run_stage_pipeline
+
+STAGE_AGENT_NAMES = {
+    "Project Manager": "project_manager",
+    "Designer": "designer",
+    "Frontend Developer": "frontend",
+    "Backend Developer": "backend",
+    "Tester": "tester",
+}
+
+
+async def replay_once(cassette: Cassette, realtime: bool = False) -> Tracer:
+    """Replay the cassette once in a scratch workspace and return the recorded spans."""
+    cassette.rewind()
+    tracer = Tracer()
+    mode = cassette.meta.get("mode", "dag")
+    task_list = cassette.meta["task_list"]
+    max_turns = cassette.meta.get("max_turns", 30 if mode == "dag" else 100)
+    shared_context = cassette.meta.get("shared_context", True)
+    thresholds = cassette.meta.get("load_thresholds")
+    thresholds = LoadThresholds(**thresholds) if thresholds else None
+    run_config = RunConfig(model_provider=ReplayModelProvider(cassette, realtime=realtime), tracing_disabled=True)
+    server = ReplayMCPServer(cassette, realtime=realtime)
+
+    with tempfile.TemporaryDirectory(prefix="workflow-bench-") as tmp, use_workspace(tmp):
+        if mode == "dag":
+            await run_stage_pipeline(server, task_list, max_turns=max_turns, tracer=tracer, run_config=run_config,
+                                     shared_context=shared_context, load_thresholds=thresholds)
+        else:
+            reset_workspace()
+            with tracer.span("stage", "handoff_workflow", agent="stage:handoff_workflow"):
+                team = build_handoff_team(server, ContextPack() if shared_context else None,
+                                          load_test=thresholds is not None)
+                await Runner.run(team, task_list, max_turns=max_turns,
+                                 hooks=TracingHooks(tracer), run_config=run_config)
+    return tracer
+
+
+def stage_report(tracer: Tracer) -> Dict[str, Dict[str, Any]]:
+    """Group spans by stage (DAG) or by agent (handoff mode)."""
+    stages: Dict[str, Dict[str, Any]] = {}
+
+    def entry(name: str) -> Dict[str, Any]:
+        return stages.setdefault(name, {"turns": 0, "handoffs": 0, "tool_calls": Counter(),
+                                        "wall_ms": 0.0, "tool_ms": 0.0})
+
+    has_stage_spans = any(s.category == "stage" and s.name in STAGE_DEPS for s in tracer.spans)
+    for s in tracer.spans:
+        owner = STAGE_AGENT_NAMES.get(s.agent, s.agent) if has_stage_spans else s.agent
+        if s.category == "stage" and has_stage_spans:
+            entry(s.name)["wall_ms"] += s.duration * 1000
+        elif s.category == "agent" and not has_stage_spans:
+            entry(owner)["wall_ms"] += s.duration * 1000
+        elif s.category == "llm":
+            entry(owner)["turns"] += 1
+        elif s.category == "handoff":
+            entry(owner)["handoffs"] += 1
+        elif s.category in ("tool", "mcp") and s.agent:
+            e = entry(owner)
+            e["tool_calls"][s.name] += 1
+            e["tool_ms"] += s.duration * 1000
+
+    for e in stages.values():
+        e["tool_calls"] = dict(sorted(e["tool_calls"].items()))
+        e["overhead_ms"] = max(0.0, e["wall_ms"] - e["tool_ms"])
+    return stages
+
+
+def aggregate(runs: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Median timings across repeats; counts must be identical in a deterministic replay."""
+    report: Dict[str, Any] = {"stages": {}, "totals": {}}
+    for name in runs[0]:
+        samples = [r[name] for r in runs]
+        first = samples[0]
+        report["stages"][name] = {
+            "turns": first["turns"],
+            "handoffs": first["handoffs"],
+            "tool_calls": first["tool_calls"],
+            "wall_ms": round(statistics.median(s["wall_ms"] for s in samples), 2),
+            "tool_ms": round(statistics.median(s["tool_ms"] for s in samples), 2),
+            "overhead_ms": round(statistics.median(s["overhead_ms"] for s in samples), 2),
+        }
+    stages = report["stages"].values()
+    report["totals"] = {
+        "turns": sum(s["turns"] for s in stages),
+        "handoffs": sum(s["handoffs"] for s in stages),
+        "tool_calls": sum(sum(s["tool_calls"].values()) for s in stages),
+        "overhead_ms": round(sum(s["overhead_ms"] for s in stages), 2),
+        "repeats": len(runs),
+    }
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], max_overhead_regression: float) -> List[str]:
+    problems = []
+    for key in ("turns", "handoffs", "tool_calls"):
+        if report["totals"][key] > baseline["totals"][key]:
+            problems.append(f"{key} regressed: {baseline['totals'][key]} -> {report['totals'][key]}")
+    base_overhead = baseline["totals"]["overhead_ms"]
+    if base_overhead and report["totals"]["overhead_ms"] > base_overhead * (1 + max_overhead_regression):
+        problems.append(f"overhead regressed: {base_overhead}ms -> {report['totals']['overhead_ms']}ms")
+    return problems
+
+
+async def run_benchmark(cassette: Cassette, repeat: int = 3, realtime: bool = False) -> Dict[str, Any]:
+    runs = [stage_report(await replay_once(cassette, realtime=realtime)) for _ in range(repeat)]
+    return aggregate(runs)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay a recorded workflow run and report per-stage costs")
+    parser.add_argument("cassette", help="Cassette recorded with --record")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of replays (timings are medians)")
+    parser.add_argument("--realtime", action="store_true", help="Sleep for the recorded model/MCP latencies")
+    parser.add_argument("--out", default=None, help="Write the JSON report here")
+    parser.add_argument("--baseline", default=None, help="Fail if this earlier report had fewer turns/calls")
+    parser.add_argument("--max-overhead-regression", type=float, default=0.5,
+                        help="Allowed relative overhead increase over the baseline (default 0.5 = +50%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmark(Cassette.load(args.cassette), repeat=args.repeat, realtime=args.realtime))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    if args.baseline:
+        problems = compare(report, json.loads(Path(args.baseline).read_text(encoding="utf-8")),
+                           args.max_overhead_regression)
+        for problem in problems:
+            print(f"REGRESSION: {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+"""
+Checkpoint journal so a failed DAG run can resume from the last passed gate.
+
+Each run appends JSON lines to <workspace>/.checkpoints/<run_id>.jsonl:
+
+    {"event": "start", "run_id": ..., "meta": {"task_list": ..., "max_turns": ...}}
+    {"event": "stage_passed", "stage": "designer", "artifacts": {path: sha256}, "final_output": ...,
+     "history": [...input items...], "attempts": 1, "turns": 7}
+    {"event": "finished", "status": "ok" | "failed", "error": ...}
+
+A line is written (and fsynced) as soon as a stage passes its gate. On resume, a stage
+counts as done when it passed in the journal, its artifacts still hash to the recorded
+values and every dependency is done as well; the scheduler skips those stages and
+starts at the first incomplete one.
+
+    python multi_agent_workflow_with_logging.py                      # prints "Run id: <run_id>"
+    python multi_agent_workflow_with_logging.py --resume <run_id>
+"""
+from __future__ import annotations
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+from tools.workspace_index import workspace_index
+from tools.workspace_root import workspace_root
+
+if TYPE_CHECKING:
+    from workflow.dag import Stage, StageResult
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = ".checkpoints"
+
+
+def checkpoints_dir(root: Optional[Path] = None) -> Path:
+    return Path(root or workspace_root()) / CHECKPOINT_DIR
+
+
+def new_run_id() -> str:
+    return f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+
+
+def _history(output: Any) -> List[Any]:
+    """The conversation of a finished Runner.run (empty for anything else)."""
+    to_input_list = getattr(output, "to_input_list", None)
+    if to_input_list is None:
+        return []
+    return json.loads(json.dumps(to_input_list(), default=str))
+
+
+class CheckpointJournal:
+    def __init__(self, path: Path, run_id: str, events: Optional[List[Dict[str, Any]]] = None):
+        self.path = Path(path)
+        self.run_id = run_id
+        self.events: List[Dict[str, Any]] = events or []
+
+    @classmethod
+    def create(cls, meta: Dict[str, Any], run_id: Optional[str] = None, root: Optional[Path] = None) -> "CheckpointJournal":
+        run_id = run_id or new_run_id()
+        journal = cls(checkpoints_dir(root) / f"{run_id}.jsonl", run_id)
+        if journal.path.exists():
+            raise FileExistsError(f"Checkpoint journal already exists: {journal.path}")
+        journal.append({"event": "start", "run_id": run_id, "meta": meta})
+        return journal
+
+    @classmethod
+    def load(cls, run_id: str, root: Optional[Path] = None) -> "CheckpointJournal":
+        path = checkpoints_dir(root) / f"{run_id}.jsonl"
+        if not path.is_file():
+            raise FileNotFoundError(f"No checkpoint journal for run {run_id!r} in {path.parent}")
+        events = []
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:  # a torn last line from a crash
+                    logger.warning("Ignoring unreadable checkpoint line in %s", path)
+        return cls(path, run_id, events)
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return next((e["meta"] for e in self.events if e["event"] == "start"), {})
+
+    def append(self, event: Dict[str, Any]) -> None:
+        event = dict(event, ts=datetime.now().isoformat(timespec="seconds"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(event, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.events.append(event)
+
+    def record_stage(self, result: "StageResult", outputs: Iterable[str]) -> None:
+        """Journal a stage that passed its gate, with the hashes of its artifacts."""
+        index = workspace_index()
+        artifacts = {}
+        for path in outputs:
+            entry = index.refresh(path)
+            artifacts[path] = entry.sha256 if entry is not None else None
+        output = result.output
+        self.append({
+            "event": "stage_passed",
+            "stage": result.name,
+            "artifacts": artifacts,
+            "final_output": getattr(output, "final_output", None),
+            "history": _history(output),
+            "attempts": result.attempts,
+            "cached": result.cached,
+            "turns": sum(len(getattr(o, "raw_responses", None) or []) for o in result.attempt_outputs),
+        })
+
+    def record_resumed(self, stage: str) -> None:
+        self.append({"event": "stage_resumed", "stage": stage})
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        self.append({"event": "finished", "status": status, "error": error})
+
+    def passed(self) -> Dict[str, Dict[str, Any]]:
+        """Latest stage_passed event per stage."""
+        return {e["stage"]: e for e in self.events if e["event"] == "stage_passed"}
+
+    def resumable(self, stages: Dict[str, "Stage"], order: List[str], exclude: Iterable[str] = ()) -> Dict[str, Dict[str, Any]]:
+        """Stages that can be skipped: passed, artifacts unchanged, all dependencies skippable."""
+        passed = self.passed()
+        exclude = set(exclude)
+        index = workspace_index()
+        done: Dict[str, Dict[str, Any]] = {}
+        for name in order:
+            event = passed.get(name)
+            if event is None or name in exclude:
+                continue
+            if any(dep not in done for dep in stages[name].deps):
+                continue
+            changed = []
+            for path, sha in event["artifacts"].items():
+                entry = index.refresh(path)
+                if sha is None or entry is None or entry.sha256 != sha:
+                    changed.append(path)
+            if changed:
+                logger.info("Stage %s must re-run: artifacts changed since checkpoint: %s", name, changed)
+                continue
+            done[name] = event
+        return done
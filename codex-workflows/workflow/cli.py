@@ -0,0 +1,269 @@
+"""
+Workflow command line: python -m workflow [--mode dag|handoff] [...]
+
+Startup is kept cheap for short scheduled runs: argument parsing and `--help` load no
+SDK modules (the agents package alone takes over a second to import), logging goes
+through a queue to a listener thread (workflow.log_queue), and the agents/openai
+imports happen only when a run actually starts.
+
+    python -m workflow.startup_bench          # measure startup and per-record log cost
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import logging
+import os
+from dataclasses import asdict, replace
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from workflow.log_queue import default_log_dir, setup_logging, stop_logging
+from workflow.stages import STAGE_DEPS
+
+if TYPE_CHECKING:
+    from agents import RunConfig
+    from tools.load_test_tool import LoadThresholds
+    from workflow.checkpoint import CheckpointJournal
+    from workflow.instrumentation import Tracer
+    from workflow.resilience import CallPolicy
+    from workflow.stage_cache import StageCache
+    from workflow.tiering import ModelRouter
+
+logger = logging.getLogger(__name__)
+
+TASK_LIST = """
+Goal: Build a tiny browser game to showcase a multi-agent workflow.
+
+High-level requirements:
+- Single-screen game called "Bug Busters".
+- Player clicks a moving bug to earn points.
+- Game ends after 20 seconds and shows final score.
+- Submit score to a simple backend and display a top-10 leaderboard (MANDATORY).
+
+Roles:
+- Designer: create a one-page UI/UX spec and basic wireframe.
+- Frontend Developer: implement the page and game logic.
+- Backend Developer: implement a minimal API (GET /health, GET/POST /scores) with in-memory storage; provide package.json with a start script.
+- Tester: write a quick test plan and a simple script to verify core routes.
+
+Constraints:
+- No external database—memory storage is fine.
+- Keep everything readable for beginners; no frameworks required.
+- All outputs should be small files saved in clearly named folders.
+"""
+
+
+async def run_dag(codex_mcp_server, task_list: str, max_turns: int, cache: StageCache | None = None,
+                  invalidate: list[str] | None = None, tracer: Tracer | None = None,
+                  run_config: RunConfig | None = None, checkpoint: CheckpointJournal | None = None,
+                  resume: bool = False, shared_context: bool = True,
+                  call_policies: dict[str, CallPolicy] | None = None, speculative: bool = False,
+                  load_thresholds: LoadThresholds | None = None, router: ModelRouter | None = None) -> None:
+    """Run PM -> Designer -> {Frontend, Backend} -> Tester with code-checked gates."""
+    from workflow.team import run_stage_pipeline, stage_turns
+
+    scheduler = await run_stage_pipeline(codex_mcp_server, task_list, max_turns=max_turns,
+                                         cache=cache, invalidate=invalidate or [], tracer=tracer,
+                                         run_config=run_config, checkpoint=checkpoint, resume=resume,
+                                         shared_context=shared_context, call_policies=call_policies,
+                                         speculative=speculative, load_thresholds=load_thresholds,
+                                         router=router)
+    results = scheduler.results
+
+    print("\n=== STAGE RESULTS ===")
+    for name in scheduler.order:
+        r = results[name]
+        print(f"{name}: ok={r.ok} cached={r.cached} resumed={r.resumed} speculative={r.speculative} "
+              f"attempts={r.attempts} turns={stage_turns(r)} "
+              f"duration={r.duration_s:.1f}s")
+    if cache is not None:
+        logger.info("Stage cache: hits=%d misses=%d size=%d bytes", cache.hits, cache.misses, cache.size_bytes())
+    logger.info("DAG workflow completed: %s", {n: round(r.duration_s, 2) for n, r in results.items()})
+
+
+async def run_handoffs(codex_mcp_server, task_list: str, max_turns: int, tracer: Tracer | None = None,
+                       run_config: RunConfig | None = None, shared_context: bool = True,
+                       call_policies: dict[str, CallPolicy] | None = None, load_test: bool = False,
+                       router: ModelRouter | None = None) -> None:
+    """Run the original PM-routed handoff workflow."""
+    from agents import Runner
+    from workflow.context_pack import ContextPack
+    from workflow.instrumentation import TracingHooks
+    from workflow.resilience import apply_call_policies, team_agents
+    from workflow.team import build_handoff_team
+
+    project_manager = build_handoff_team(codex_mcp_server, ContextPack() if shared_context else None,
+                                         load_test=load_test)
+    if router is not None:
+        # Tiers only: a handoff run has no per-agent gates to record outcomes from.
+        router.assign({agent.name: agent for agent in team_agents(project_manager)})
+    models = apply_call_policies(team_agents(project_manager), call_policies, run_config) if call_policies else {}
+
+    logger.info(f"Starting workflow execution with max_turns={max_turns}")
+    hooks = TracingHooks(tracer) if tracer is not None else None
+    result = await Runner.run(project_manager, task_list, max_turns=max_turns, hooks=hooks, run_config=run_config)
+    logger.info(f"Workflow completed. Final output: {result.final_output}")
+    logger.info(f"Result details: {result}")
+    print("\n=== FINAL OUTPUT ===")
+    print(result.final_output)
+    print("\n=== RESULT DETAILS ===")
+    print(f"Turns used: {getattr(result, 'turn_count', 'N/A')}")
+    print(f"Status: {getattr(result, 'status', 'N/A')}")
+    if models:
+        logger.info("Model call metrics: %s", {n: m.stats for n, m in models.items()})
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m workflow", description="Bug Busters multi-agent workflow")
+    parser.add_argument("--mode", choices=["dag", "handoff"], default="dag",
+                        help="dag: code-gated stages with parallel Frontend/Backend (default); "
+                             "handoff: original PM-routed handoffs")
+    parser.add_argument("--max-turns", type=int, default=None,
+                        help="Turn budget (per stage in dag mode; default 30, or 100 in handoff mode)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable the stage cache (dag mode) and regenerate every stage")
+    parser.add_argument("--invalidate", action="append", default=[], choices=list(STAGE_DEPS), metavar="STAGE",
+                        help="Drop cached outputs for STAGE and re-run it (repeatable); "
+                             f"one of: {', '.join(STAGE_DEPS)}")
+    parser.add_argument("--cache-dir", default=os.getenv("WORKFLOW_CACHE_DIR", ".workflow_cache"),
+                        help="Stage cache directory (default: .workflow_cache, or WORKFLOW_CACHE_DIR)")
+    parser.add_argument("--cache-max-mb", type=int, default=256,
+                        help="Stage cache size bound in MiB; least-recently-used entries are evicted")
+    parser.add_argument("--mcp-pool-size", type=int, default=1,
+                        help="Number of warm Codex MCP servers to keep (default 1)")
+    parser.add_argument("--mcp-max-calls", type=int, default=200,
+                        help="Recycle a Codex MCP server after this many tool calls")
+    parser.add_argument("--trace-file", default=None,
+                        help="Chrome-trace/Perfetto JSON output (default: <log dir>/trace_<timestamp>.json)")
+    parser.add_argument("--resume", default=None, metavar="RUN_ID",
+                        help="Continue a failed dag run: verify its checkpointed artifacts and start at the "
+                             "first incomplete stage (the run id is printed at start)")
+    parser.add_argument("--record", default=None, metavar="CASSETTE",
+                        help="Record model responses and Codex MCP results to CASSETTE for offline replay "
+                             "(python -m workflow.benchmark CASSETTE); implies --no-cache")
+    parser.add_argument("--no-context-pack", action="store_true",
+                        help="Do not give agents the shared project documents as a common prompt prefix "
+                             "(for comparing prompt-cache hit rates)")
+    parser.add_argument("--speculative", action="store_true",
+                        help="dag mode: start a stage in a scratch workspace as soon as its inputs are written, "
+                             "while the upstream stage finishes; commit it if those inputs did not change")
+    parser.add_argument("--load-gate", action="store_true",
+                        help="Gate the Backend on a load test of the generated server (needs node); in handoff "
+                             "mode the PM runs load_test_backend before handing off to the Tester")
+    parser.add_argument("--load-thresholds", default=None, metavar="FILE",
+                        help="JSON LoadThresholds for --load-gate, e.g. {\"min_rps\": 500, \"max_p99_ms\": 50} "
+                             "(default: WORKFLOW_LOAD_THRESHOLDS or built-in defaults)")
+    parser.add_argument("--call-policy", default=None, metavar="FILE",
+                        help="JSON overrides for per-agent model call timeouts, retries, hedging and stage "
+                             "budgets, e.g. {\"Designer\": {\"call_timeout_s\": 90, \"hedge\": true}}")
+    parser.add_argument("--no-resilience", action="store_true",
+                        help="Call models directly: no call timeouts, retries, hedging or stage budgets")
+    parser.add_argument("--tiering", action="store_true",
+                        help="Pick each agent's model tier (fast/standard/strong) from its recorded stage "
+                             "outcomes: demote after repeated first-try gate passes, escalate after a failure")
+    parser.add_argument("--tiering-config", default=None, metavar="FILE",
+                        help="JSON tier config for --tiering, e.g. {\"agents\": {\"Tester\": {\"start\": \"fast\"}}}")
+    parser.add_argument("--stats-dir", default=os.getenv("WORKFLOW_STATS_DIR", ".workflow_stats"),
+                        help="Where --tiering keeps per-agent outcomes (default: .workflow_stats, or "
+                             "WORKFLOW_STATS_DIR)")
+    args = parser.parse_args(argv)
+    if args.resume and args.mode != "dag":
+        parser.error("--resume is only supported in dag mode")
+    if args.speculative and args.mode != "dag":
+        parser.error("--speculative is only supported in dag mode")
+    return args
+
+
+async def run_workflow(args: argparse.Namespace) -> None:
+    """Run the workflow described by parsed command-line `args`."""
+    from dotenv import load_dotenv
+    from agents import RunConfig, set_default_openai_api
+    from tools.load_test_tool import load_thresholds
+    from workflow.checkpoint import CheckpointJournal
+    from workflow.instrumentation import Tracer
+    from workflow.mcp_pool import MCPServerPool, codex_server_factory
+    from workflow.replay import Cassette, RecordingMCPServer, RecordingModelProvider
+    from workflow.resilience import load_call_policies
+    from workflow.stage_cache import StageCache
+    from workflow.tiering import ModelRouter, TierStats, load_tiering_config
+
+    load_dotenv(override=True)
+    set_default_openai_api(os.getenv("OPENAI_API_KEY"))
+
+    logger.info("Starting multi-agent workflow (mode=%s)", args.mode)
+    tracer = Tracer()
+    max_turns = args.max_turns or (30 if args.mode == "dag" else 100)
+    task_list = TASK_LIST
+    checkpoint = None
+    if args.mode == "dag":
+        if args.resume:
+            checkpoint = CheckpointJournal.load(args.resume)
+            task_list = checkpoint.meta.get("task_list", TASK_LIST)
+            max_turns = args.max_turns or checkpoint.meta.get("max_turns", max_turns)
+        else:
+            checkpoint = CheckpointJournal.create({"task_list": TASK_LIST, "max_turns": max_turns})
+        logger.info("Run id: %s (resume with --resume %s)", checkpoint.run_id, checkpoint.run_id)
+        print(f"Run id: {checkpoint.run_id}")
+    call_policies = None if args.no_resilience else load_call_policies(args.call_policy)
+    thresholds = load_thresholds(args.load_thresholds) if args.load_gate else None
+    router = ModelRouter(load_tiering_config(args.tiering_config), TierStats(args.stats_dir)) if args.tiering else None
+    cassette = run_config = None
+    if args.record:
+        cassette = Cassette()
+        cassette.meta = {"mode": args.mode, "task_list": task_list, "max_turns": max_turns,
+                         "shared_context": not args.no_context_pack,
+                         "load_thresholds": asdict(thresholds) if thresholds else None}
+        run_config = RunConfig(model_provider=RecordingModelProvider(cassette))
+        if call_policies is not None:
+            # A hedged duplicate could be recorded too; keep the cassette to one response per turn.
+            call_policies = {agent: replace(p, hedge=False) for agent, p in call_policies.items()}
+
+    async with MCPServerPool(
+            codex_server_factory(),
+            size=args.mcp_pool_size,
+            max_calls_per_server=args.mcp_max_calls,
+            tracer=tracer,
+    ) as pool, pool.lease() as codex_mcp_server:
+        logger.info("Codex MCP server connected")
+        if cassette is not None:
+            codex_mcp_server = RecordingMCPServer(codex_mcp_server, cassette)
+
+        try:
+            if args.mode == "dag":
+                use_cache = not (args.no_cache or args.record)
+                cache = StageCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024) if use_cache else None
+                await run_dag(codex_mcp_server, task_list, max_turns, cache=cache,
+                              invalidate=args.invalidate, tracer=tracer, run_config=run_config,
+                              checkpoint=checkpoint, resume=bool(args.resume),
+                              shared_context=not args.no_context_pack, call_policies=call_policies,
+                              speculative=args.speculative, load_thresholds=thresholds, router=router)
+            else:
+                await run_handoffs(codex_mcp_server, task_list, max_turns, tracer=tracer, run_config=run_config,
+                                   shared_context=not args.no_context_pack, call_policies=call_policies,
+                                   load_test=args.load_gate, router=router)
+        except Exception as e:
+            logger.error(f"Workflow failed with error: {e}", exc_info=True)
+            raise
+        finally:
+            logger.info("MCP pool metrics: %s", pool.metrics())
+            if cassette is not None:
+                logger.info("Cassette written to %s", cassette.save(args.record))
+            trace_file = args.trace_file or default_log_dir() / f"trace_{datetime.now():%Y%m%d_%H%M%S}.json"
+            logger.info("Trace written to %s", tracer.write_chrome_trace(trace_file))
+            summary = tracer.format_summary()
+            logger.info("Run summary:\n%s", summary)
+            print("\n=== TIMING SUMMARY ===")
+            print(summary)
+            tokens = tracer.format_token_summary()
+            logger.info("Prompt cache usage:\n%s", tokens)
+            print("\n=== PROMPT CACHE (input tokens per agent) ===")
+            print(tokens)
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = parse_args(argv)
+    listener = setup_logging()
+    try:
+        asyncio.run(run_workflow(args))
+    finally:
+        stop_logging(listener)
+    return 0
@@ -0,0 +1,105 @@
+"""
+Shared context pack: the project documents every agent needs, as one byte-stable block.
+
+Without it, each specialist re-reads AGENT_TASKS.md, REQUIREMENTS.md and the design
+docs through tool calls, and its instructions start with role-specific text, so no two
+agents share a prompt prefix. With it, the documents are assembled once (after the gate
+of the stage that wrote them) and placed *before* the role instructions:
+
+    [shared block: PM docs][+ design docs]  [role instructions]
+
+Agents that need the same documents then send an identical leading prefix, which is what
+provider-side prompt caching reuses. Layers only ever append, so the Designer's prefix
+(PM docs) is also a prefix of the Frontend/Backend/Tester prompts (PM + design docs).
+
+The block is deterministic: fixed document order, normalised newlines, no paths, times
+or run ids. It is rebuilt only when a document's content hash changes.
+"""
+from __future__ import annotations
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from tools.workspace_index import workspace_index
+from tools.workspace_root import resolve
+
+PM_DOCS = ["REQUIREMENTS.md", "AGENT_TASKS.md", "TEST.md"]
+DESIGN_DOCS = ["design/design_spec.md", "design/wireframe.md"]
+
+# Documents each DAG stage receives in its shared prefix (the PM writes them, so gets none).
+STAGE_CONTEXT: Dict[str, List[str]] = {
+    "project_manager": [],
+    "designer": PM_DOCS,
+    "frontend": PM_DOCS + DESIGN_DOCS,
+    "backend": PM_DOCS + DESIGN_DOCS,
+    "tester": PM_DOCS + DESIGN_DOCS,
+}
+
+# Larger documents are cut (deterministically) so one runaway file cannot bloat every prompt.
+MAX_DOC_BYTES = 48 * 1024
+
+HEADER = (
+    "# Shared project context\n"
+    "The project documents below are current and identical for every agent. "
+    "Use them instead of reading these files again; your role instructions follow after the documents.\n"
+)
+FOOTER = "\n# Your role\n"
+
+
+def _normalise(text: str, max_bytes: int) -> str:
+    text = text.replace("\r\n", "\n").replace("\r", "\n").strip("\n")
+    data = text.encode("utf-8")
+    if len(data) > max_bytes:
+        text = data[:max_bytes].decode("utf-8", errors="ignore") + f"\n[... cut at {max_bytes} bytes ...]"
+    return text
+
+
+class ContextPack:
+    """Builds (and memoizes) the shared block for a list of documents in the active workspace."""
+
+    def __init__(self, max_doc_bytes: int = MAX_DOC_BYTES):
+        self.max_doc_bytes = max_doc_bytes
+        self.builds = 0
+        self._blocks: Dict[Tuple[Tuple[str, Optional[str]], ...], str] = {}
+        self._lock = threading.Lock()
+
+    def _fingerprint(self, docs: Sequence[str]) -> Tuple[Tuple[str, Optional[str]], ...]:
+        index = workspace_index()
+        fingerprint = []
+        for doc in docs:
+            entry = index.refresh(resolve(doc))
+            fingerprint.append((doc, entry.sha256 if entry is not None else None))
+        return tuple(fingerprint)
+
+    def block(self, docs: Sequence[str]) -> str:
+        """The shared block for `docs` ("" when there are none)."""
+        if not docs:
+            return ""
+        key = self._fingerprint(docs)
+        with self._lock:
+            cached = self._blocks.get(key)
+            if cached is not None:
+                return cached
+            parts = [HEADER]
+            for doc, sha in key:
+                if sha is None:
+                    body = "(not written yet)"
+                else:
+                    body = _normalise(resolve(doc).read_text(encoding="utf-8", errors="replace"), self.max_doc_bytes)
+                parts.append(f"\n## {doc}\n<<<\n{body}\n>>>\n")
+            parts.append(FOOTER)
+            block = "".join(parts)
+            self._blocks[key] = block
+            self.builds += 1
+            return block
+
+    def instructions(self, docs: Sequence[str], role_instructions: str, head: str = "") -> str:
+        """`head`, then the shared block, then the role text (with `head` removed from its start)."""
+        if head and role_instructions.startswith(head):
+            role_instructions = role_instructions[len(head):]
+        return head + self.block(docs) + role_instructions
+
+    def dynamic_instructions(self, docs: Sequence[str], role_instructions: str,
+                             head: str = "") -> Callable[[Any, Any], str]:
+        """Agent `instructions` callable for agents built before the documents exist (handoff mode)."""
+        def instructions(context: Any, agent: Any) -> str:
+            return self.instructions(docs, role_instructions, head)
+        return instructions
@@ -0,0 +1,401 @@
+"""
+DAG scheduler for gated multi-agent workflows.
+
+Each stage runs as soon as all of its dependencies have passed their gates,
+so independent stages (e.g. Frontend and Backend after the Designer) run
+concurrently instead of one after another behind Project Manager handoffs.
+Gates are deterministic code checks (check_paths / validate_tree), not LLM turns.
+With a CheckpointJournal, every passed gate is journaled and a resumed run skips
+stages whose journaled artifacts are unchanged.
+
+With `speculative=True`, a stage starts in a scratch workspace (workflow.speculation)
+as soon as its dependencies' outputs are ready, while they finish their remaining turns
+and final gates; it is committed if those outputs did not change, else discarded.
+"""
+from __future__ import annotations
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+from workflow.checkpoint import CheckpointJournal
+from tools.workspace_root import resolve, use_workspace
+from workflow.instrumentation import Span, Tracer
+from workflow.speculation import ScratchWorkspace, file_sha256
+from workflow.stage_cache import StageCache
+
+logger = logging.getLogger(__name__)
+
+# A stage runner receives gate feedback from the previous attempt (None on the first try).
+StageRunner = Callable[[Optional[str]], Awaitable[Any]]
+# A gate returns a check_paths-style dict: {ok: bool, missing: [...], ...}, or an awaitable
+# of one (e.g. a gate that load-tests the stage's outputs).
+Gate = Callable[[], Union[Dict[str, Any], Awaitable[Dict[str, Any]]]]
+
+
+@dataclass
+class Stage:
+    """One node of the workflow graph."""
+    name: str
+    run: StageRunner
+    deps: List[str] = field(default_factory=list)
+    gate: Optional[Gate] = None
+    max_attempts: int = 2
+    # Files the stage produces; stored in / restored from the stage cache.
+    outputs: List[str] = field(default_factory=list)
+    # Returns the stage's cache key; evaluated after its dependencies have passed.
+    cache_key: Optional[Callable[[], str]] = None
+    # Side-effect-free check that the outputs are usable, polled while the stage runs so
+    # dependents can start speculatively (defaults to `gate`).
+    ready: Optional[Gate] = None
+
+
+@dataclass
+class StageResult:
+    name: str
+    ok: bool
+    attempts: int
+    duration_s: float
+    output: Any = None
+    gate: Optional[Dict[str, Any]] = None
+    cached: bool = False
+    # Skipped because a checkpoint from an earlier attempt of this run covers it.
+    resumed: bool = False
+    # Output of every attempt (the last one is also in `output`).
+    attempt_outputs: List[Any] = field(default_factory=list)
+    # Ran speculatively in a scratch workspace and was committed.
+    speculative: bool = False
+
+
+class GateFailed(RuntimeError):
+    """Raised when a stage still fails its gate after max_attempts."""
+
+    def __init__(self, stage: str, gate: Dict[str, Any]):
+        super().__init__(f"Stage '{stage}' failed its gate: missing={gate.get('missing')} "
+                         f"invalid={gate.get('invalid') or {}}")
+        self.stage = stage
+        self.gate = gate
+
+
+def gate_feedback(gate: Dict[str, Any]) -> str:
+    """Turn a failed gate result into a correction message for the stage agent."""
+    missing = gate.get("missing") or []
+    invalid = gate.get("invalid") or {}
+    problems = []
+    if missing:
+        problems.append("The following required files are missing: " + ", ".join(missing) + ".")
+    if invalid:
+        problems.append("The following files are invalid: "
+                        + "; ".join(f"{path} {reason}" for path, reason in invalid.items()) + ".")
+    return (
+        "Gate check failed. " + " ".join(problems)
+        + " Fix them now, then reply with a one-line summary."
+    )
+
+
+async def run_gate(gate: Optional[Gate]) -> Dict[str, Any]:
+    """Evaluate a (sync or async) gate; no gate always passes."""
+    if gate is None:
+        return {"ok": True}
+    result = gate()
+    return await result if inspect.isawaitable(result) else result
+
+
+class DagScheduler:
+    """Run stages in dependency order, concurrently where the graph allows."""
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        cache: Optional[StageCache] = None,
+        invalidate: Iterable[str] = (),
+        tracer: Optional[Tracer] = None,
+        checkpoint: Optional[CheckpointJournal] = None,
+        speculative: bool = False,
+        speculation_poll_s: float = 0.25,
+    ):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            unknown = [d for d in stage.deps if d not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {unknown}")
+        self.order = self._topological_order()
+        self.results: Dict[str, StageResult] = {}
+        self.cache = cache
+        self.invalidate = set(invalidate)
+        self.tracer = tracer
+        if cache is not None:
+            for name in self.invalidate:
+                cache.invalidate(name)
+        self.checkpoint = checkpoint
+        self.resumable: Dict[str, Dict[str, Any]] = (
+            checkpoint.resumable(self.stages, self.order, exclude=self.invalidate) if checkpoint else {}
+        )
+        self.speculative = speculative
+        self.speculation_poll_s = speculation_poll_s
+        self.speculation = {"started": 0, "committed": 0, "discarded": 0}
+        self._ready: Dict[str, asyncio.Event] = {name: asyncio.Event() for name in self.stages}
+        self._dependents = {name: [s.name for s in stages if name in s.deps] for name in self.stages}
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Cycle detected at stage '{name}'")
+            state[name] = 1
+            for dep in self.stages[name].deps:
+                visit(dep)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def levels(self) -> List[List[str]]:
+        """Group stages into waves that can run concurrently (for logging/inspection)."""
+        depth: Dict[str, int] = {}
+        for name in self.order:
+            deps = self.stages[name].deps
+            depth[name] = 1 + max((depth[d] for d in deps), default=-1)
+        waves: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name in self.order:
+            waves[depth[name]].append(name)
+        return waves
+
+    async def _run_stage(self, stage: Stage, tasks: Dict[str, "asyncio.Task[StageResult]"]) -> StageResult:
+        speculation = None
+        try:
+            if stage.deps:
+                if self.speculative and stage.name not in self.resumable:
+                    speculation = await self._speculate(stage, tasks)
+                await asyncio.gather(*(tasks[d] for d in stage.deps))
+            return await self._run_ready_stage(stage, speculation)
+        finally:
+            if speculation is not None:
+                scratch, task, _ = speculation
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                scratch.discard()
+                result = self.results.get(stage.name)
+                if result is None or not result.speculative:
+                    self.speculation["discarded"] += 1
+            self._ready[stage.name].set()
+
+    async def _run_ready_stage(self, stage: Stage, speculation) -> StageResult:
+        start = time.perf_counter()
+        if stage.name in self.resumable:
+            resumed = await self._resume_from_checkpoint(stage, start)
+            if resumed is not None:
+                return resumed
+
+        key = stage.cache_key() if self.cache is not None and stage.cache_key else None
+        if key and stage.name not in self.invalidate:
+            cached = await self._restore_from_cache(stage, key, start)
+            if cached is not None:
+                return cached
+
+        if speculation is not None:
+            result = await self._join_speculation(stage, *speculation)
+            if result is not None:
+                return self._passed(stage, result, key, time.perf_counter() - result.duration_s)
+
+        logger.info("Stage %s starting", stage.name)
+        feedback: Optional[str] = None
+        output: Any = None
+        gate: Optional[Dict[str, Any]] = None
+        attempt_outputs: List[Any] = []
+        watcher = None
+        if self.speculative and self._dependents[stage.name]:
+            before = {path: file_sha256(resolve(path)) for path in stage.outputs}
+            watcher = asyncio.create_task(self._watch_ready(stage, before))
+        try:
+            for attempt in range(1, stage.max_attempts + 1):
+                output = await stage.run(feedback)
+                attempt_outputs.append(output)
+                gate = await run_gate(stage.gate)
+                if gate.get("ok"):
+                    break
+                logger.warning("Stage %s gate failed (attempt %d/%d): missing=%s invalid=%s changed=%s",
+                               stage.name, attempt, stage.max_attempts, gate.get("missing"),
+                               gate.get("invalid"), gate.get("changed"))
+                feedback = gate_feedback(gate)
+            else:
+                raise GateFailed(stage.name, gate or {})
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+        result = StageResult(
+            name=stage.name,
+            ok=True,
+            attempts=attempt,
+            duration_s=time.perf_counter() - start,
+            output=output,
+            gate=gate,
+            attempt_outputs=attempt_outputs,
+        )
+        return self._passed(stage, result, key, start)
+
+    def _passed(self, stage: Stage, result: StageResult, key: Optional[str], start: float) -> StageResult:
+        self.results[stage.name] = result
+        self._trace(result, start)
+        logger.info("Stage %s passed gate in %.2fs (attempts=%d, speculative=%s)",
+                    stage.name, result.duration_s, result.attempts, result.speculative)
+        if key:
+            self.cache.store(key, stage.name, stage.outputs)
+        if self.checkpoint is not None:
+            self.checkpoint.record_stage(result, stage.outputs)
+        return result
+
+    # -- speculation ------------------------------------------------------------
+    async def _watch_ready(self, stage: Stage, before: Dict[str, Optional[str]]) -> None:
+        """Signal dependents once this stage's outputs differ from `before` (their hashes when
+        the stage started) and pass its readiness check."""
+        check = stage.ready or stage.gate
+        if check is None:
+            return
+        while True:
+            fresh = any(file_sha256(resolve(path)) != sha for path, sha in before.items()) or not before
+            if fresh and (await run_gate(check)).get("ok"):
+                logger.info("Stage %s outputs ready; dependents may start speculatively", stage.name)
+                self._ready[stage.name].set()
+                return
+            await asyncio.sleep(self.speculation_poll_s)
+
+    async def _speculate(self, stage: Stage, tasks: Dict[str, "asyncio.Task[StageResult]"]):
+        """Wait until each dependency is finished or ready; start `stage` in a scratch workspace
+        if any of them is still running. Returns (scratch, task, started_at) or None."""
+        async def ready_or_done(dep: str) -> None:
+            ready = asyncio.create_task(self._ready[dep].wait())
+            try:
+                await asyncio.wait({tasks[dep], ready}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                ready.cancel()
+
+        await asyncio.gather(*(ready_or_done(d) for d in stage.deps))
+        deps = [tasks[d] for d in stage.deps]
+        if all(t.done() for t in deps) or any(t.done() and (t.cancelled() or t.exception()) for t in deps):
+            return None
+        scratch = ScratchWorkspace.create(stage.name, [p for d in stage.deps for p in self.stages[d].outputs])
+        self.speculation["started"] += 1
+        logger.info("Stage %s starting speculatively in %s", stage.name, scratch.root)
+
+        async def run() -> Any:
+            with use_workspace(scratch.root):
+                output = await stage.run(None)
+                return output, await run_gate(stage.gate)
+
+        return scratch, asyncio.create_task(run(), name=f"speculative:{stage.name}"), time.perf_counter()
+
+    async def _join_speculation(self, stage: Stage, scratch: ScratchWorkspace, task: "asyncio.Task[Any]",
+                                started: float) -> Optional[StageResult]:
+        """Commit a finished speculative run whose inputs are unchanged; None means re-run normally."""
+        if not scratch.inputs_unchanged():
+            logger.info("Stage %s speculation discarded: dependency outputs changed", stage.name)
+            return None
+        try:
+            output, spec_gate = await task
+        except Exception as exc:
+            logger.warning("Stage %s speculation failed (%s); re-running", stage.name, exc)
+            return None
+        if not spec_gate.get("ok"):
+            logger.info("Stage %s speculation discarded: gate failed in scratch", stage.name)
+            return None
+        changed = scratch.commit()
+        gate = await run_gate(stage.gate)
+        if not gate.get("ok"):
+            logger.warning("Stage %s speculation failed its gate after commit; re-running", stage.name)
+            return None
+        self.speculation["committed"] += 1
+        logger.info("Stage %s speculation committed: %s", stage.name, changed)
+        return StageResult(
+            name=stage.name,
+            ok=True,
+            attempts=1,
+            duration_s=time.perf_counter() - started,
+            output=output,
+            gate=gate,
+            attempt_outputs=[output],
+            speculative=True,
+        )
+
+    async def _resume_from_checkpoint(self, stage: Stage, start: float) -> Optional[StageResult]:
+        gate = await run_gate(stage.gate)
+        if not gate.get("ok"):
+            logger.warning("Stage %s checkpoint failed its gate; re-running", stage.name)
+            return None
+        result = StageResult(
+            name=stage.name,
+            ok=True,
+            attempts=0,
+            duration_s=time.perf_counter() - start,
+            output=self.resumable[stage.name].get("final_output"),
+            gate=gate,
+            resumed=True,
+        )
+        self.results[stage.name] = result
+        self._trace(result, start)
+        self.checkpoint.record_resumed(stage.name)
+        logger.info("Stage %s resumed from checkpoint", stage.name)
+        return result
+
+    async def _restore_from_cache(self, stage: Stage, key: str, start: float) -> Optional[StageResult]:
+        if self.cache.restore(key) is None:
+            return None
+        gate = await run_gate(stage.gate)
+        if not gate.get("ok"):
+            logger.warning("Stage %s cache entry failed its gate; re-running", stage.name)
+            return None
+        result = StageResult(
+            name=stage.name,
+            ok=True,
+            attempts=0,
+            duration_s=time.perf_counter() - start,
+            gate=gate,
+            cached=True,
+        )
+        self.results[stage.name] = result
+        self._trace(result, start)
+        logger.info("Stage %s restored from cache", stage.name)
+        if self.checkpoint is not None:
+            self.checkpoint.record_stage(result, stage.outputs)
+        return result
+
+    def _trace(self, result: StageResult, start: float) -> None:
+        if self.tracer is None:
+            return
+        self.tracer.add(Span(
+            category="stage",
+            name=result.name,
+            agent=f"stage:{result.name}",
+            start=start,
+            end=start + result.duration_s,
+            retries=max(0, result.attempts - 1),
+            args={"cached": result.cached, "resumed": result.resumed, "attempts": result.attempts,
+                  "speculative": result.speculative},
+        ))
+
+    async def run(self) -> Dict[str, StageResult]:
+        """Run the whole graph. Raises GateFailed (or the stage's own error) on failure."""
+        logger.info("DAG waves: %s", self.levels())
+        tasks: Dict[str, asyncio.Task[StageResult]] = {}
+        for name in self.order:
+            tasks[name] = asyncio.create_task(self._run_stage(self.stages[name], tasks), name=f"stage:{name}")
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return self.results
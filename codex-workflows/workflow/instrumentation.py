@@ -0,0 +1,251 @@
+"""
+Latency and token instrumentation for workflow runs.
+
+A Tracer collects spans: DAG stages, agent turns, LLM calls, function tool calls, MCP
+tool calls (via the MCP pool) and handoffs. Each span records wall time, tokens, payload
+bytes, errors and retries. At the end of a run the tracer can
+- write a Chrome trace / Perfetto JSON file (open in chrome://tracing or ui.perfetto.dev),
+- print an aggregated per-agent / per-tool summary table, and
+- print per-agent prompt-cache usage (cached vs. uncached input tokens).
+
+TracingHooks plugs the tracer into the Agents SDK run lifecycle:
+
+    tracer = Tracer()
+    await Runner.run(agent, input, hooks=TracingHooks(tracer))
+    tracer.write_chrome_trace("logs/trace.json")
+    print(tracer.format_summary())
+"""
+from __future__ import annotations
+import json
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from agents import RunHooks
+
+
+def payload_bytes(value: Any) -> int:
+    """Approximate serialized size of a tool/LLM payload."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if not isinstance(value, str):
+        try:
+            value = json.dumps(value, default=str)
+        except (TypeError, ValueError):
+            value = str(value)
+    return len(value.encode("utf-8"))
+
+
+@dataclass
+class Span:
+    category: str  # stage | agent | llm | tool | mcp | handoff
+    name: str
+    agent: str
+    start: float
+    end: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    retries: int = 0
+    error: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.end - self.start)
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.t0 = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def add(self, span: Span) -> Span:
+        if not span.end:
+            span.end = self.now()
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, category: str, name: str, agent: str = "", **fields: Any) -> Iterator[Span]:
+        """Time a block; the yielded span can be updated (tokens, bytes, ...) before it closes."""
+        s = Span(category=category, name=name, agent=agent, start=self.now(), **fields)
+        try:
+            yield s
+        except BaseException as exc:
+            s.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            self.add(s)
+
+    # -- export ---------------------------------------------------------------
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace event format: one complete ("X") event per span, one lane per agent."""
+        lanes: Dict[str, int] = {}
+        events: List[Dict[str, Any]] = []
+        for s in sorted(self.spans, key=lambda s: s.start):
+            lane = s.agent or s.category
+            tid = lanes.setdefault(lane, len(lanes) + 1)
+            args = {k: v for k, v in (
+                ("input_tokens", s.input_tokens), ("output_tokens", s.output_tokens),
+                ("cached_tokens", s.cached_tokens), ("bytes_in", s.bytes_in),
+                ("bytes_out", s.bytes_out), ("retries", s.retries), ("error", s.error),
+            ) if v}
+            args.update(s.args)
+            events.append({
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X" if s.duration else "i",
+                "ts": round((s.start - self.t0) * 1e6, 1),
+                "dur": round(s.duration * 1e6, 1),
+                "pid": 1,
+                "tid": tid,
+                "args": args,
+            })
+        for lane, tid in lanes.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": lane}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path | str) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        return path
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregate spans by (category, agent, name), slowest total first."""
+        groups: Dict[Tuple[str, str, str], List[Span]] = {}
+        for s in self.spans:
+            groups.setdefault((s.category, s.agent, s.name), []).append(s)
+        rows = []
+        for (category, agent, name), spans in groups.items():
+            durations = [s.duration * 1000 for s in spans]
+            rows.append({
+                "category": category,
+                "agent": agent,
+                "name": name,
+                "count": len(spans),
+                "total_ms": round(sum(durations), 1),
+                "p50_ms": round(statistics.median(durations), 1),
+                "max_ms": round(max(durations), 1),
+                "input_tokens": sum(s.input_tokens for s in spans),
+                "output_tokens": sum(s.output_tokens for s in spans),
+                "cached_tokens": sum(s.cached_tokens for s in spans),
+                "bytes_in": sum(s.bytes_in for s in spans),
+                "bytes_out": sum(s.bytes_out for s in spans),
+                "retries": sum(s.retries for s in spans),
+                "errors": sum(1 for s in spans if s.error),
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def format_summary(self) -> str:
+        columns = ["category", "agent", "name", "count", "total_ms", "p50_ms", "max_ms",
+                   "input_tokens", "output_tokens", "bytes_in", "bytes_out", "retries", "errors"]
+        return _format_table(columns, self.summary())
+
+    def token_summary(self) -> List[Dict[str, Any]]:
+        """Per-agent prompt-cache usage over all LLM calls: cached vs. uncached input tokens."""
+        groups: Dict[str, List[Span]] = {}
+        for s in self.spans:
+            if s.category == "llm":
+                groups.setdefault(s.agent, []).append(s)
+        rows = []
+        for agent, spans in sorted(groups.items()):
+            input_tokens = sum(s.input_tokens for s in spans)
+            cached = sum(s.cached_tokens for s in spans)
+            rows.append({
+                "agent": agent,
+                "calls": len(spans),
+                "input_tokens": input_tokens,
+                "cached_tokens": cached,
+                "uncached_tokens": input_tokens - cached,
+                "cache_hit_pct": round(100.0 * cached / input_tokens, 1) if input_tokens else 0.0,
+                "p50_llm_ms": round(statistics.median(s.duration * 1000 for s in spans), 1),
+            })
+        return rows
+
+    def format_token_summary(self) -> str:
+        columns = ["agent", "calls", "input_tokens", "cached_tokens", "uncached_tokens", "cache_hit_pct", "p50_llm_ms"]
+        return _format_table(columns, self.token_summary())
+
+
+def _format_table(columns: List[str], records: List[Dict[str, Any]]) -> str:
+    rows = [[str(r[c]) for c in columns] for r in records]
+    widths = [max([len(c)] + [len(row[i]) for row in rows]) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(v.ljust(w) for v, w in zip(row, widths)) for row in rows)
+    return "\n".join(lines)
+
+
+class TracingHooks(RunHooks):
+    """Agents SDK run hooks that record agent, LLM, tool and handoff spans into a Tracer."""
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+        self._open: Dict[Any, Span] = {}
+
+    def _begin(self, key: Any, category: str, name: str, agent: str, **fields: Any) -> None:
+        self._open[key] = Span(category=category, name=name, agent=agent, start=self.tracer.now(), **fields)
+
+    def _finish(self, key: Any) -> Optional[Span]:
+        span = self._open.pop(key, None)
+        if span is not None:
+            self.tracer.add(span)
+        return span
+
+    @staticmethod
+    def _tool_key(context: Any, agent: Any, tool: Any) -> Any:
+        call_id = getattr(context, "tool_call_id", None)
+        return ("tool", call_id) if call_id else ("tool", id(context), agent.name, tool.name)
+
+    async def on_agent_start(self, context, agent) -> None:
+        self._begin(("agent", id(context), agent.name), "agent", agent.name, agent.name)
+
+    async def on_agent_end(self, context, agent, output) -> None:
+        span = self._finish(("agent", id(context), agent.name))
+        if span is not None:
+            span.bytes_out = payload_bytes(output)
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+        self._begin(("llm", id(context), agent.name), "llm", "model_call", agent.name,
+                    bytes_in=payload_bytes(system_prompt) + payload_bytes(input_items))
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        span = self._finish(("llm", id(context), agent.name))
+        if span is None:
+            return
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            span.input_tokens = usage.input_tokens
+            span.output_tokens = usage.output_tokens
+            details = getattr(usage, "input_tokens_details", None)
+            span.cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        span.bytes_out = payload_bytes([getattr(item, "model_dump", lambda: item)() for item in response.output])
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        self._begin(self._tool_key(context, agent, tool), "tool", tool.name, agent.name,
+                    bytes_in=payload_bytes(getattr(context, "tool_arguments", None)))
+
+    async def on_tool_end(self, context, agent, tool, result) -> None:
+        span = self._finish(self._tool_key(context, agent, tool))
+        if span is not None:
+            span.bytes_out = payload_bytes(result)
+
+    async def on_handoff(self, context, from_agent, to_agent) -> None:
+        now = self.tracer.now()
+        self.tracer.add(Span(category="handoff", name=f"{from_agent.name} -> {to_agent.name}",
+                             agent=from_agent.name, start=now, end=now))
@@ -0,0 +1,71 @@
+"""
+Non-blocking workflow logging.
+
+The root logger gets a single QueueHandler; a QueueListener thread owns the real
+handlers (rotating workflow_execution.log, a per-run workflow_<run_id>.log and stderr),
+so formatting and file I/O stay off the asyncio event loop. Log files are opened on
+the first record, not at setup.
+
+    listener = setup_logging()
+    try:
+        ...
+    finally:
+        stop_logging(listener)               # drains the queue and closes the files
+"""
+from __future__ import annotations
+import logging
+import os
+import queue
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def default_log_dir() -> Path:
+    # Default logs directory under project; override with WORKFLOW_LOG_DIR
+    return Path(os.getenv("WORKFLOW_LOG_DIR", str(Path(__file__).resolve().parent.parent / "logs")))
+
+
+def setup_logging(log_dir: Optional[Path | str] = None, level_name: Optional[str] = None,
+                  run_id: Optional[str] = None) -> QueueListener:
+    """Route all logging through a queue to file and stream handlers; returns the started listener."""
+    level_name = (level_name or os.getenv("WORKFLOW_LOG_LEVEL", "INFO")).upper()
+    level = getattr(logging, level_name, logging.INFO)
+    log_dir = Path(log_dir) if log_dir is not None else default_log_dir()
+    log_dir.mkdir(parents=True, exist_ok=True)
+    run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+    main_log = log_dir / "workflow_execution.log"
+    run_log = log_dir / f"workflow_{run_id}.log"
+
+    formatter = logging.Formatter(fmt=FORMAT)
+    handlers = [
+        RotatingFileHandler(main_log, maxBytes=10 * 1024 * 1024, backupCount=5, delay=True),
+        logging.FileHandler(run_log, delay=True),
+        logging.StreamHandler(),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    # Clear existing handlers to prevent duplicates on reload
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(records))
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+
+    logging.getLogger(__name__).info("Logging initialized. main=%s per_run=%s level=%s",
+                                     main_log, run_log, level_name)
+    return listener
+
+
+def stop_logging(listener: QueueListener) -> None:
+    """Flush every queued record to its handlers, then close them."""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
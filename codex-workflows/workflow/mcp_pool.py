@@ -0,0 +1,275 @@
+"""
+Pool of long-lived Codex MCP servers shared across workflow runs.
+
+Instead of spawning `codex mcp-server` inside `async with` for every run, the pool keeps
+N connected servers warm and leases them to concurrent runs:
+
+    async with MCPServerPool(size=2) as pool:
+        async with pool.lease() as codex_mcp_server:
+            agents = build_stage_agents(codex_mcp_server)
+            ...
+
+A leased server is a PooledMCPServer proxy that counts tool calls, notices crashes and,
+when the pool has a Tracer, records an "mcp" span per tool call.
+Servers are recycled (cleanup + reconnect) after `max_calls_per_server` calls, after a
+call raises, or when a health check fails. `metrics()` exposes pool counters.
+
+Each server's connect/cleanup runs inside its own owner task, so recycling from any
+run is safe for transports that require enter/exit in the same task.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from agents.mcp import MCPServer, MCPServerStdio
+from workflow.instrumentation import Span, Tracer, payload_bytes
+
+logger = logging.getLogger(__name__)
+
+# Read timeout for one MCP request (a Codex tool call). Long enough for a large write, short
+# enough that a wedged server is noticed (the call raises and the pool recycles the server).
+# Override with CODEX_MCP_TIMEOUT_SECONDS.
+DEFAULT_SESSION_TIMEOUT_SECONDS = float(os.getenv("CODEX_MCP_TIMEOUT_SECONDS", "600"))
+
+
+def codex_server_factory(
+    command: str = "codex",
+    args: Optional[List[str]] = None,
+    client_session_timeout_seconds: float = DEFAULT_SESSION_TIMEOUT_SECONDS,
+) -> Callable[[], MCPServer]:
+    """Factory for the Codex CLI MCP server (same parameters the workflow scripts used)."""
+    def factory() -> MCPServer:
+        return MCPServerStdio(
+            name="Codex CLI",
+            params={"command": command, "args": args if args is not None else ["mcp-server"]},
+            client_session_timeout_seconds=client_session_timeout_seconds,
+        )
+    return factory
+
+
+class _Slot:
+    """One pooled server plus the task that owns its connection."""
+
+    def __init__(self, index: int, factory: Callable[[], MCPServer]):
+        self.index = index
+        self.factory = factory
+        self.server: Optional[MCPServer] = None
+        self.calls = 0
+        self.generation = 0
+        self.unhealthy = False
+        self.last_used = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    async def _own(self, server: MCPServer, ready: asyncio.Future, stop: asyncio.Event) -> None:
+        try:
+            await server.connect()
+        except BaseException as exc:
+            if not ready.done():
+                ready.set_exception(exc)
+            await server.cleanup()
+            return
+        ready.set_result(None)
+        try:
+            await stop.wait()
+        finally:
+            await server.cleanup()
+
+    async def start(self) -> None:
+        server = self.factory()
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._own(server, ready, self._stop), name=f"mcp-pool-slot-{self.index}")
+        await ready
+        self.server = server
+        self.calls = 0
+        self.unhealthy = False
+        self.generation += 1
+        self.last_used = time.monotonic()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await self._task
+        except Exception as exc:  # cleanup of a crashed process may raise
+            logger.debug("MCP pool slot %d cleanup error: %s", self.index, exc)
+        self._task = None
+        self.server = None
+
+
+class PooledMCPServer(MCPServer):
+    """Proxy handed to agents while a pooled server is leased.
+
+    Tool calls are counted against the slot and a failing call marks the slot unhealthy.
+    Everything else is delegated to the underlying server.
+    """
+
+    def __init__(self, pool: "MCPServerPool", slot: _Slot):
+        # MCPServer.__init__ is intentionally not called: configuration attributes are
+        # read from the wrapped server through __getattr__.
+        self._pool = pool
+        self._slot = slot
+        self._inner = slot.server
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.__dict__["_inner"], item)
+
+    @property
+    def name(self) -> str:
+        return self._inner.name
+
+    async def connect(self):
+        """No-op: pooled servers are connected by the pool."""
+
+    async def cleanup(self):
+        """No-op: pooled servers are cleaned up by the pool."""
+
+    async def list_tools(self, run_context=None, agent=None):
+        return await self._inner.list_tools(run_context, agent)
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]], meta: Optional[Dict[str, Any]] = None):
+        self._slot.calls += 1
+        self._pool._calls_total += 1
+        tracer = self._pool.tracer
+        start = time.perf_counter()
+        result = error = None
+        try:
+            if meta is None:
+                result = await self._inner.call_tool(tool_name, arguments)
+            else:
+                result = await self._inner.call_tool(tool_name, arguments, meta)
+            return result
+        except Exception as exc:
+            self._slot.unhealthy = True
+            self._pool._call_failures += 1
+            error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            if tracer is not None:
+                tracer.add(Span(
+                    category="mcp", name=tool_name, agent=f"mcp:{self._inner.name}#{self._slot.index}",
+                    start=start, bytes_in=payload_bytes(arguments), error=error,
+                    bytes_out=payload_bytes(result.model_dump() if result is not None else None),
+                ))
+
+    async def list_prompts(self):
+        return await self._inner.list_prompts()
+
+    async def get_prompt(self, name: str, arguments: Optional[Dict[str, Any]] = None):
+        return await self._inner.get_prompt(name, arguments)
+
+
+class MCPServerPool:
+    def __init__(
+        self,
+        factory: Optional[Callable[[], MCPServer]] = None,
+        size: int = 2,
+        max_calls_per_server: int = 200,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 10.0,
+        tracer: Optional[Tracer] = None,
+    ):
+        if size < 1:
+            raise ValueError("pool size must be >= 1")
+        self.factory = factory or codex_server_factory()
+        self.size = size
+        self.max_calls_per_server = max_calls_per_server
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.tracer = tracer
+        self._slots = [_Slot(i, self.factory) for i in range(size)]
+        self._idle: asyncio.Queue[_Slot] = asyncio.Queue()
+        self._started = False
+        self._leases_total = 0
+        self._leased = 0
+        self._calls_total = 0
+        self._call_failures = 0
+        self._recycles = 0
+        self._health_check_failures = 0
+        self._wait_seconds_total = 0.0
+
+    async def start(self) -> "MCPServerPool":
+        if self._started:
+            return self
+        await asyncio.gather(*(slot.start() for slot in self._slots))
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+        self._started = True
+        logger.info("MCP pool started: size=%d", self.size)
+        return self
+
+    async def close(self) -> None:
+        await asyncio.gather(*(slot.stop() for slot in self._slots))
+        self._started = False
+        logger.info("MCP pool closed: %s", self.metrics())
+
+    async def __aenter__(self) -> "MCPServerPool":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _recycle(self, slot: _Slot, reason: str) -> None:
+        logger.info("Recycling MCP server slot %d (generation %d): %s", slot.index, slot.generation, reason)
+        self._recycles += 1
+        await slot.stop()
+        await slot.start()
+
+    async def _healthy(self, slot: _Slot) -> bool:
+        if time.monotonic() - slot.last_used < self.health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(slot.server.list_tools(), timeout=self.health_check_timeout)
+            return True
+        except Exception as exc:
+            self._health_check_failures += 1
+            logger.warning("MCP server slot %d failed health check: %s", slot.index, exc)
+            return False
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[PooledMCPServer]:
+        """Lease a warm server for the duration of one workflow run."""
+        if not self._started:
+            await self.start()
+        waited = time.perf_counter()
+        slot = await self._idle.get()
+        self._wait_seconds_total += time.perf_counter() - waited
+        try:
+            if slot.unhealthy:
+                await self._recycle(slot, "previous call failed")
+            elif slot.calls >= self.max_calls_per_server:
+                await self._recycle(slot, f"reached {slot.calls} calls")
+            elif not await self._healthy(slot):
+                await self._recycle(slot, "health check failed")
+        except BaseException:
+            self._idle.put_nowait(slot)
+            raise
+
+        self._leases_total += 1
+        self._leased += 1
+        try:
+            yield PooledMCPServer(self, slot)
+        finally:
+            self._leased -= 1
+            slot.last_used = time.monotonic()
+            self._idle.put_nowait(slot)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "leased": self._leased,
+            "leases_total": self._leases_total,
+            "calls_total": self._calls_total,
+            "call_failures": self._call_failures,
+            "recycles": self._recycles,
+            "health_check_failures": self._health_check_failures,
+            "lease_wait_seconds_total": round(self._wait_seconds_total, 6),
+            "calls_per_slot": [slot.calls for slot in self._slots],
+            "generations": [slot.generation for slot in self._slots],
+        }
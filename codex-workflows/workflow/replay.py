@@ -0,0 +1,273 @@
+"""
+Record/replay of model responses and MCP tool calls for offline workflow runs.
+
+Recording wraps the real model provider and Codex MCP server and writes every model
+response and MCP tool result to a cassette (JSON). Replay serves the same responses
+back in order, with no network, so a workflow can be re-run deterministically. Local
+function tools (check_files, write_text_file, ...) still execute for real.
+
+Model responses are keyed by a hash of the agent's system instructions, because the
+Model interface does not see the agent. Each agent therefore replays its own sequence
+even when DAG stages interleave. MCP results are keyed by tool name and arguments.
+
+    cassette = Cassette()
+    run_config = RunConfig(model_provider=RecordingModelProvider(cassette))
+    ... run the workflow with run_config and RecordingMCPServer(server, cassette) ...
+    cassette.save("cassettes/bug_busters.json")
+
+    cassette = Cassette.load("cassettes/bug_busters.json")
+    run_config = RunConfig(model_provider=ReplayModelProvider(cassette))
+    ... run the workflow with run_config and ReplayMCPServer(cassette) ...
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from pydantic import TypeAdapter
+from agents import ModelResponse, Usage
+from agents.mcp import MCPServer
+from agents.models.interface import Model, ModelProvider
+from agents.models.multi_provider import MultiProvider
+from mcp.types import CallToolResult, Tool as MCPTool
+from openai.types.responses import ResponseOutputItem
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+from tools.workspace_root import workspace_root
+
+CASSETTE_VERSION = 1
+
+_OUTPUT_ITEM = TypeAdapter(ResponseOutputItem)
+
+
+class ReplayMismatch(RuntimeError):
+    """The run asked for a response the cassette does not have."""
+
+
+def stream_key(system_instructions: Optional[str]) -> str:
+    return hashlib.sha256((system_instructions or "").encode("utf-8")).hexdigest()[:16]
+
+
+def call_key(tool_name: str, arguments: Optional[Dict[str, Any]]) -> str:
+    # Workspace paths (e.g. Codex's "cwd") differ between recording and replay.
+    payload = json.dumps(arguments or {}, sort_keys=True, default=str)
+    payload = payload.replace(str(workspace_root()), "<workspace>")
+    return f"{tool_name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+
+def serialize_response(response: ModelResponse) -> Dict[str, Any]:
+    usage = response.usage
+    return {
+        "output": [item.model_dump(mode="json", exclude_none=True) for item in response.output],
+        "usage": {
+            "requests": usage.requests,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "total_tokens": usage.total_tokens,
+            "input_tokens_details": usage.input_tokens_details.model_dump(mode="json"),
+            "output_tokens_details": usage.output_tokens_details.model_dump(mode="json"),
+        },
+        "response_id": response.response_id,
+    }
+
+
+def deserialize_response(data: Dict[str, Any]) -> ModelResponse:
+    u = data["usage"]
+    usage = Usage(
+        requests=u["requests"],
+        input_tokens=u["input_tokens"],
+        output_tokens=u["output_tokens"],
+        total_tokens=u["total_tokens"],
+        input_tokens_details=InputTokensDetails.model_validate(u["input_tokens_details"]),
+        output_tokens_details=OutputTokensDetails.model_validate(u["output_tokens_details"]),
+    )
+    return ModelResponse(
+        output=[_OUTPUT_ITEM.validate_python(item) for item in data["output"]],
+        usage=usage,
+        response_id=data.get("response_id"),
+    )
+
+
+class Cassette:
+    """Recorded model responses and MCP results for one workflow run."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        self.meta: Dict[str, Any] = data.get("meta", {})
+        self.models: Dict[str, List[Dict[str, Any]]] = data.get("models", {})
+        self.mcp_tools: Optional[List[Dict[str, Any]]] = data.get("mcp_tools")
+        self.mcp_calls: Dict[str, List[Dict[str, Any]]] = data.get("mcp_calls", {})
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path | str) -> "Cassette":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+        return cls(data)
+
+    def save(self, path: Path | str) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "version": CASSETTE_VERSION,
+            "meta": self.meta,
+            "models": self.models,
+            "mcp_tools": self.mcp_tools,
+            "mcp_calls": self.mcp_calls,
+        }, indent=1), encoding="utf-8")
+        return path
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._cursors.clear()
+
+    def append(self, bucket: Dict[str, List[Dict[str, Any]]], key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            bucket.setdefault(key, []).append(entry)
+
+    def next(self, bucket: Dict[str, List[Dict[str, Any]]], key: str, kind: str) -> Dict[str, Any]:
+        with self._lock:
+            cursor_key = f"{kind}:{key}"
+            index = self._cursors.get(cursor_key, 0)
+            entries = bucket.get(key, [])
+            if index >= len(entries):
+                raise ReplayMismatch(f"No recorded {kind} #{index + 1} for key {key} (have {len(entries)})")
+            self._cursors[cursor_key] = index + 1
+            return entries[index]
+
+
+class RecordingModel(Model):
+    def __init__(self, inner: Model, cassette: Cassette, model_name: Optional[str]):
+        self.inner = inner
+        self.cassette = cassette
+        self.model_name = model_name
+
+    async def get_response(self, system_instructions, input, *args, **kwargs) -> ModelResponse:
+        start = time.perf_counter()
+        response = await self.inner.get_response(system_instructions, input, *args, **kwargs)
+        entry = serialize_response(response)
+        entry["latency_s"] = round(time.perf_counter() - start, 4)
+        entry["model"] = self.model_name
+        self.cassette.append(self.cassette.models, stream_key(system_instructions), entry)
+        return response
+
+    def stream_response(self, *args, **kwargs):
+        raise NotImplementedError("Recording supports Runner.run only (no streaming)")
+
+
+class ReplayModel(Model):
+    def __init__(self, cassette: Cassette, realtime: bool = False):
+        self.cassette = cassette
+        self.realtime = realtime
+
+    async def get_response(self, system_instructions, input, *args, **kwargs) -> ModelResponse:
+        entry = self.cassette.next(self.cassette.models, stream_key(system_instructions), "model response")
+        if self.realtime:
+            await asyncio.sleep(entry.get("latency_s", 0.0))
+        return deserialize_response(entry)
+
+    def stream_response(self, *args, **kwargs):
+        raise NotImplementedError("Replay supports Runner.run only (no streaming)")
+
+
+class RecordingModelProvider(ModelProvider):
+    def __init__(self, cassette: Cassette, inner: Optional[ModelProvider] = None):
+        self.cassette = cassette
+        self.inner = inner or MultiProvider()
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return RecordingModel(self.inner.get_model(model_name), self.cassette, model_name)
+
+
+class ReplayModelProvider(ModelProvider):
+    def __init__(self, cassette: Cassette, realtime: bool = False):
+        self.cassette = cassette
+        self.realtime = realtime
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return ReplayModel(self.cassette, realtime=self.realtime)
+
+
+class RecordingMCPServer(MCPServer):
+    """Proxy that records the tool list and every tool result of a (connected) MCP server."""
+
+    def __init__(self, inner: MCPServer, cassette: Cassette):
+        # Configuration attributes are read from the wrapped server (see __getattr__).
+        self._inner = inner
+        self._cassette = cassette
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.__dict__["_inner"], item)
+
+    @property
+    def name(self) -> str:
+        return self._inner.name
+
+    async def connect(self):
+        await self._inner.connect()
+
+    async def cleanup(self):
+        await self._inner.cleanup()
+
+    async def list_tools(self, run_context=None, agent=None):
+        tools = await self._inner.list_tools(run_context, agent)
+        if self._cassette.mcp_tools is None:
+            self._cassette.mcp_tools = [t.model_dump(mode="json", exclude_none=True) for t in tools]
+        return tools
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]], meta: Optional[Dict[str, Any]] = None):
+        start = time.perf_counter()
+        if meta is None:
+            result = await self._inner.call_tool(tool_name, arguments)
+        else:
+            result = await self._inner.call_tool(tool_name, arguments, meta)
+        self._cassette.append(self._cassette.mcp_calls, call_key(tool_name, arguments), {
+            "result": result.model_dump(mode="json", exclude_none=True),
+            "latency_s": round(time.perf_counter() - start, 4),
+        })
+        return result
+
+    async def list_prompts(self):
+        return await self._inner.list_prompts()
+
+    async def get_prompt(self, name: str, arguments: Optional[Dict[str, Any]] = None):
+        return await self._inner.get_prompt(name, arguments)
+
+
+class ReplayMCPServer(MCPServer):
+    """Offline stand-in for the Codex MCP server that serves recorded results."""
+
+    def __init__(self, cassette: Cassette, name: str = "Codex CLI", realtime: bool = False):
+        super().__init__()
+        self._cassette = cassette
+        self._name = name
+        self.realtime = realtime
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def connect(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def list_tools(self, run_context=None, agent=None):
+        return [MCPTool.model_validate(t) for t in (self._cassette.mcp_tools or [])]
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]], meta: Optional[Dict[str, Any]] = None):
+        entry = self._cassette.next(self._cassette.mcp_calls, call_key(tool_name, arguments), "MCP result")
+        if self.realtime:
+            await asyncio.sleep(entry.get("latency_s", 0.0))
+        return CallToolResult.model_validate(entry["result"])
+
+    async def list_prompts(self):
+        raise NotImplementedError("ReplayMCPServer does not serve prompts")
+
+    async def get_prompt(self, name: str, arguments: Optional[Dict[str, Any]] = None):
+        raise NotImplementedError("ReplayMCPServer does not serve prompts")
@@ -0,0 +1,247 @@
+"""
+Resilient model calls: per-call timeouts, retries with exponential backoff, hedged
+requests and per-stage time budgets, configured per agent.
+
+A stalled completion used to stall the whole pipeline: nothing bounded a model call and
+Runner.run has no per-turn deadline. ResilientModel wraps the model an agent would use:
+
+- every call gets `call_timeout_s`; timeouts and transient provider errors (connection
+  errors, 408/409/429/5xx) are retried up to `retries` times with jittered exponential
+  backoff (a Retry-After header wins);
+- with `hedge`, a duplicate call is fired once the first has been outstanding for the
+  agent's observed p95 latency (`hedge_delay_s` until `hedge_min_samples` calls have
+  been seen); the first successful response wins and the other call is cancelled;
+- `stage_timeout_s` bounds a whole DAG stage, all attempts included: each retry gets
+  only what is left of it (enforced by workflow.team.build_stages).
+
+Policies are keyed by agent name, with "*" as the fallback, and can be overridden from
+a JSON file ({"Designer": {"call_timeout_s": 90, "hedge": true}, "*": {...}}):
+
+    policies = load_call_policies("call_policies.json")
+    apply_call_policies(agents, policies, run_config)
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional
+import openai
+from agents import Agent, RunConfig
+from agents.models.interface import Model, ModelProvider
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    call_timeout_s: float = 180.0  # one model call (per attempt, hedges included)
+    stage_timeout_s: Optional[float] = 1800.0  # a whole DAG stage, all attempts and turns
+    retries: int = 3
+    backoff_s: float = 1.0  # first retry delay; doubles per retry
+    backoff_max_s: float = 30.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_delay_s: float = 30.0  # used until enough latencies have been observed
+    hedge_min_samples: int = 5
+
+
+# Keyed by agent name; "*" applies to agents without an entry.
+DEFAULT_CALL_POLICIES: Dict[str, CallPolicy] = {
+    "*": CallPolicy(),
+    "Project Manager": CallPolicy(call_timeout_s=120.0, stage_timeout_s=900.0),
+    "Designer": CallPolicy(call_timeout_s=120.0, stage_timeout_s=900.0, hedge=True),
+    "Frontend Developer": CallPolicy(call_timeout_s=240.0, stage_timeout_s=1800.0),
+    "Backend Developer": CallPolicy(call_timeout_s=240.0, stage_timeout_s=1800.0),
+    "Tester": CallPolicy(call_timeout_s=120.0, stage_timeout_s=900.0, hedge=True),
+}
+
+TRANSIENT_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class StageTimeout(Exception):
+    """A DAG stage exceeded its `stage_timeout_s` budget."""
+
+    def __init__(self, stage: str, budget_s: float):
+        self.stage = stage
+        self.budget_s = budget_s
+        super().__init__(f"Stage '{stage}' exceeded its {budget_s:.0f}s budget")
+
+
+def load_call_policies(path: Optional[Path | str] = None) -> Dict[str, CallPolicy]:
+    """DEFAULT_CALL_POLICIES, with per-agent fields overridden from a JSON file."""
+    policies = dict(DEFAULT_CALL_POLICIES)
+    if path is None:
+        return policies
+    known = {f.name for f in fields(CallPolicy)}
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    for agent, overrides in data.items():
+        unknown = set(overrides) - known
+        if unknown:
+            raise ValueError(f"Unknown call policy fields for {agent!r}: {sorted(unknown)}")
+        policies[agent] = replace(policies.get(agent, policies["*"]), **overrides)
+    return policies
+
+
+def policy_for(policies: Dict[str, CallPolicy], agent_name: str) -> CallPolicy:
+    return policies.get(agent_name) or policies.get("*") or CallPolicy()
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code in TRANSIENT_STATUS
+
+
+def backoff_delay(policy: CallPolicy, retry: int, exc: Optional[BaseException] = None) -> float:
+    """Delay before retry number `retry` (0-based): Retry-After if given, else jittered 2^n backoff."""
+    response = getattr(exc, "response", None)
+    header = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(policy.backoff_max_s, float(header))
+    except (TypeError, ValueError):
+        delay = min(policy.backoff_max_s, policy.backoff_s * 2 ** retry)
+        return delay * random.uniform(0.5, 1.0)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per agent, for hedge delays."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, agent: str, seconds: float) -> None:
+        self._samples.setdefault(agent, deque(maxlen=self.window)).append(seconds)
+
+    def count(self, agent: str) -> int:
+        return len(self._samples.get(agent, ()))
+
+    def quantile(self, agent: str, q: float) -> Optional[float]:
+        samples = sorted(self._samples.get(agent, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def hedge_delay(self, agent: str, policy: CallPolicy) -> float:
+        if self.count(agent) < policy.hedge_min_samples:
+            return policy.hedge_delay_s
+        return self.quantile(agent, policy.hedge_quantile)
+
+
+class ResilientModel(Model):
+    """Wraps one agent's model with its CallPolicy. Streaming is passed through unchanged."""
+
+    def __init__(self, inner: Model, agent_name: str, policy: CallPolicy,
+                 tracker: Optional[LatencyTracker] = None, model_name: Any = None):
+        self.inner = inner
+        self.agent_name = agent_name
+        self.policy = policy
+        self.tracker = tracker if tracker is not None else LatencyTracker()
+        self.model_name = model_name
+        self.stats = {"calls": 0, "retries": 0, "timeouts": 0, "hedges": 0, "hedge_wins": 0, "failures": 0}
+
+    def __str__(self) -> str:
+        # Same as the wrapped agent.model, so stage cache fingerprints do not change.
+        return str(self.model_name)
+
+    async def _hedged(self, call) -> Any:
+        """Run `call()`; with hedging, fire a duplicate after the hedge delay. First success wins."""
+        first = asyncio.ensure_future(call())
+        if not self.policy.hedge:
+            return await first
+        pending = {first}
+        hedge: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.tracker.hedge_delay(self.agent_name, self.policy))
+            if not done:
+                self.stats["hedges"] += 1
+                hedge = asyncio.ensure_future(call())
+                pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in (first, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def get_response(self, *args, **kwargs):
+        self.stats["calls"] += 1
+        retry = 0
+        while True:
+            start = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    self._hedged(lambda: self.inner.get_response(*args, **kwargs)), self.policy.call_timeout_s)
+            except Exception as exc:
+                if isinstance(exc, asyncio.TimeoutError):
+                    self.stats["timeouts"] += 1
+                if not is_transient(exc) or retry >= self.policy.retries:
+                    self.stats["failures"] += 1
+                    raise
+                delay = backoff_delay(self.policy, retry, exc)
+                retry += 1
+                self.stats["retries"] += 1
+                logger.warning("%s model call failed (%s); retry %d/%d in %.1fs", self.agent_name,
+                               type(exc).__name__, retry, self.policy.retries, delay)
+                await asyncio.sleep(delay)
+                continue
+            self.tracker.record(self.agent_name, time.monotonic() - start)
+            return response
+
+    def stream_response(self, *args, **kwargs):
+        return self.inner.stream_response(*args, **kwargs)
+
+
+def team_agents(entry: Agent) -> List[Agent]:
+    """The entry agent plus every agent reachable through handoffs."""
+    seen: Dict[int, Agent] = {}
+    stack = [entry]
+    while stack:
+        agent = stack.pop()
+        if id(agent) in seen:
+            continue
+        seen[id(agent)] = agent
+        stack.extend(h for h in agent.handoffs if isinstance(h, Agent))
+    return list(seen.values())
+
+
+def apply_call_policies(
+    agents: Iterable[Agent],
+    policies: Dict[str, CallPolicy],
+    run_config: Optional[RunConfig] = None,
+    tracker: Optional[LatencyTracker] = None,
+) -> Dict[str, ResilientModel]:
+    """Give each agent a ResilientModel around the model `run_config`'s provider would use.
+
+    Agents are changed in place (handoff targets keep working); returns the wrapped models by
+    agent name, whose `stats` report retries, timeouts and hedges.
+    """
+    provider: ModelProvider = (run_config or RunConfig()).model_provider
+    tracker = tracker if tracker is not None else LatencyTracker()
+    models: Dict[str, ResilientModel] = {}
+    for agent in agents:
+        if isinstance(agent.model, ResilientModel):
+            models[agent.name] = agent.model
+            continue
+        name = agent.model if isinstance(agent.model, str) or agent.model is None else None
+        inner = agent.model if isinstance(agent.model, Model) else provider.get_model(name)
+        agent.model = models[agent.name] = ResilientModel(
+            inner, agent.name, policy_for(policies, agent.name), tracker, model_name=agent.model)
+    return models
+
+
+def call_metrics(models: Dict[str, ResilientModel]) -> Dict[str, Dict[str, Any]]:
+    return {name: dict(model.stats, policy=asdict(model.policy)) for name, model in models.items()}
@@ -0,0 +1,85 @@
+"""
+Scratch workspaces for speculative stage execution.
+
+In speculative mode (DagScheduler(speculative=True)) a stage may start before its
+dependencies have *finished*: as soon as every dependency's outputs pass its readiness
+check, the stage runs in a scratch copy of the workspace while the dependencies finish
+their remaining turns and final gates. Once they have passed, the speculation is
+committed if the dependency outputs it started from are unchanged (its changed files
+are copied into the real workspace); otherwise it is discarded and the stage runs
+normally.
+
+    scratch = ScratchWorkspace.create("frontend", deps_outputs)
+    with use_workspace(scratch.root):
+        ...                                  # run the stage
+    if scratch.inputs_unchanged():
+        scratch.commit()                     # copies what the stage wrote
+    scratch.discard()
+"""
+from __future__ import annotations
+import hashlib
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from tools.file_tools import atomic_write
+from tools.workspace_index import drop_workspace_index
+from tools.workspace_root import workspace_root
+from tools.workspace_snapshots import OUTPUT_DIRS, ROOT_FILES, current_manifest
+
+
+def file_sha256(path: Path) -> Optional[str]:
+    """sha256 of a file's bytes, or None if it does not exist."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class ScratchWorkspace:
+    """A private copy of the workflow files (root docs + output dirs) of `origin`."""
+
+    def __init__(self, stage: str, origin: Path, root: Path, inputs: Dict[str, Optional[str]],
+                 baseline: Dict[str, str]):
+        self.stage = stage
+        self.origin = origin
+        self.root = root
+        self.inputs = inputs  # dependency outputs -> sha256 at speculation start
+        self.baseline = baseline  # every copied file -> sha256
+
+    @classmethod
+    def create(cls, stage: str, input_paths: List[str], origin: Optional[Path] = None) -> "ScratchWorkspace":
+        origin = Path(origin or workspace_root())
+        # Hash before copying: a dependency write in between then shows up as a changed input.
+        inputs = {path: file_sha256(origin / path) for path in input_paths}
+        root = Path(tempfile.mkdtemp(prefix=f"speculative-{stage}-"))
+        for name in ROOT_FILES + OUTPUT_DIRS:
+            src = origin / name
+            if src.is_dir():
+                shutil.copytree(src, root / name)
+            elif src.is_file():
+                shutil.copy2(src, root / name)
+        baseline = {path: info["sha256"] for path, info in current_manifest(root).items()}
+        return cls(stage, origin, root, inputs, baseline)
+
+    def inputs_unchanged(self) -> bool:
+        """True if the dependency outputs in the real workspace still match the speculation's start."""
+        return all(file_sha256(self.origin / path) == sha for path, sha in self.inputs.items())
+
+    def changed_files(self) -> List[str]:
+        """Files the speculative run created or modified in the scratch workspace."""
+        return sorted(path for path, info in current_manifest(self.root).items()
+                      if self.baseline.get(path) != info["sha256"])
+
+    def commit(self) -> List[str]:
+        """Copy the speculative run's changes into the real workspace (one atomic write per file)."""
+        changed = self.changed_files()
+        for path in changed:
+            target = self.origin / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(target, [(self.root / path).read_bytes()])
+        return changed
+
+    def discard(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+        drop_workspace_index(self.root)
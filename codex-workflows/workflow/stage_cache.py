@@ -0,0 +1,172 @@
+"""
+Content-addressed cache of workflow stage outputs.
+
+A stage's cache key is a hash of everything that determines its output: the agent's
+instructions, model and model settings, plus the contents of the stage's input files.
+Output files are stored once per content hash under objects/, and each entry manifest
+(entries/<key>.json) maps output paths to those hashes. When the key matches, the
+outputs are restored instead of re-invoking the agent.
+
+The store is size-bounded: least-recently-used entries are evicted first, then any
+objects no longer referenced by an entry are deleted.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from tools.workspace_root import workspace_root
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+MISSING_MARKER = b"\0<missing>\0"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class StageCache:
+    def __init__(self, root: Path | str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects = self.root / "objects"
+        self.entries = self.root / "entries"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.entries.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    # -- keys -----------------------------------------------------------------
+    @staticmethod
+    def key(parts: Iterable[str], input_files: Iterable[str], base: Optional[Path] = None) -> str:
+        """Hash the given fingerprint strings and the contents of each input file (in order)."""
+        base = base or workspace_root()
+        h = hashlib.sha256()
+        for part in parts:
+            encoded = part.encode("utf-8")
+            h.update(len(encoded).to_bytes(8, "big"))
+            h.update(encoded)
+        for rel in input_files:
+            h.update(rel.encode("utf-8"))
+            fp = base / rel
+            data = fp.read_bytes() if fp.is_file() else MISSING_MARKER
+            h.update(len(data).to_bytes(8, "big"))
+            h.update(data)
+        return h.hexdigest()
+
+    # -- objects --------------------------------------------------------------
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def _put_object(self, data: bytes) -> str:
+        digest = _sha256(data)
+        op = self._object_path(digest)
+        if not op.exists():
+            op.parent.mkdir(parents=True, exist_ok=True)
+            tmp = op.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, op)
+        return digest
+
+    # -- entries --------------------------------------------------------------
+    def _entry_path(self, key: str) -> Path:
+        return self.entries / f"{key}.json"
+
+    def _load_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        ep = self._entry_path(key)
+        try:
+            return json.loads(ep.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _save_entry(self, entry: Dict[str, Any]) -> None:
+        ep = self._entry_path(entry["key"])
+        tmp = ep.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, ep)
+
+    def restore(self, key: str, base: Optional[Path] = None) -> Optional[List[str]]:
+        """Restore a cached stage's outputs into `base` (default: the workspace root).
+
+        Returns the restored paths, or None on a miss.
+        """
+        base = base or workspace_root()
+        entry = self._load_entry(key)
+        if entry is None or not all(self._object_path(d).is_file() for d in entry["files"].values()):
+            self.misses += 1
+            return None
+        for rel, digest in entry["files"].items():
+            dest = base / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_bytes(self._object_path(digest).read_bytes())
+        entry["last_used"] = time.time()
+        self._save_entry(entry)
+        self.hits += 1
+        logger.info("Stage cache hit: stage=%s key=%s files=%d", entry["stage"], key[:12], len(entry["files"]))
+        return list(entry["files"])
+
+    def store(self, key: str, stage: str, outputs: Iterable[str], base: Optional[Path] = None) -> Dict[str, Any]:
+        """Store the stage's output files under `key` and enforce the size bound."""
+        base = base or workspace_root()
+        files: Dict[str, str] = {}
+        size = 0
+        for rel in outputs:
+            fp = base / rel
+            if not fp.is_file():
+                continue
+            data = fp.read_bytes()
+            files[rel] = self._put_object(data)
+            size += len(data)
+        now = time.time()
+        entry = {"key": key, "stage": stage, "files": files, "bytes": size, "created": now, "last_used": now}
+        self._save_entry(entry)
+        self.evict()
+        return entry
+
+    def _all_entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        for ep in self.entries.glob("*.json"):
+            entry = self._load_entry(ep.stem)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    def invalidate(self, stage: str) -> int:
+        """Drop every entry for `stage`. Returns the number of entries removed."""
+        removed = 0
+        for entry in self._all_entries():
+            if entry["stage"] == stage:
+                self._entry_path(entry["key"]).unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            self._collect_garbage()
+        logger.info("Stage cache invalidated: stage=%s entries=%d", stage, removed)
+        return removed
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.objects.glob("*/*") if p.is_file())
+
+    def evict(self) -> int:
+        """Evict least-recently-used entries until the object store fits in max_bytes."""
+        evicted = 0
+        if self.size_bytes() <= self.max_bytes:
+            return evicted
+        for entry in sorted(self._all_entries(), key=lambda e: e["last_used"]):
+            self._entry_path(entry["key"]).unlink(missing_ok=True)
+            evicted += 1
+            self._collect_garbage()
+            if self.size_bytes() <= self.max_bytes:
+                break
+        logger.info("Stage cache evicted %d entries", evicted)
+        return evicted
+
+    def _collect_garbage(self) -> None:
+        live = {d for entry in self._all_entries() for d in entry["files"].values()}
+        for op in self.objects.glob("*/*"):
+            if op.is_file() and op.name not in live:
+                op.unlink(missing_ok=True)
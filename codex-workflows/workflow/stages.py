@@ -0,0 +1,34 @@
+"""
+The DAG stage graph: what each stage writes, reads and waits for.
+
+Plain data with no SDK imports, so the CLI can offer the stage names (e.g. for
+--invalidate) without loading the agents package.
+"""
+from typing import Dict, List
+
+# Files each stage must produce before its dependents may start.
+STAGE_OUTPUTS: Dict[str, List[str]] = {
+    "project_manager": ["REQUIREMENTS.md", "TEST.md", "AGENT_TASKS.md"],
+    "designer": ["design/design_spec.md", "design/wireframe.md"],
+    "frontend": ["frontend/index.html", "frontend/styles.css", "frontend/game.js"],
+    "backend": ["backend/server.js", "backend/package.json"],
+    "tester": ["tests/TEST_PLAN.md"],
+}
+
+# PM -> Designer -> {Frontend, Backend} -> Tester
+STAGE_DEPS: Dict[str, List[str]] = {
+    "project_manager": [],
+    "designer": ["project_manager"],
+    "frontend": ["designer"],
+    "backend": ["designer"],
+    "tester": ["frontend", "backend"],
+}
+
+# Files each stage reads; their contents are part of the stage cache key.
+STAGE_INPUTS: Dict[str, List[str]] = {
+    "project_manager": [],
+    "designer": ["AGENT_TASKS.md", "REQUIREMENTS.md"],
+    "frontend": ["AGENT_TASKS.md", "REQUIREMENTS.md", "design/design_spec.md", "design/wireframe.md"],
+    "backend": ["AGENT_TASKS.md", "REQUIREMENTS.md"],
+    "tester": ["AGENT_TASKS.md", "TEST.md"] + STAGE_OUTPUTS["frontend"] + STAGE_OUTPUTS["backend"],
+}
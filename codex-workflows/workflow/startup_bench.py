@@ -0,0 +1,121 @@
+"""
+Startup benchmark for the workflow CLI.
+
+Measures, in fresh interpreters, the wall time of `python -m workflow --help` and of
+importing workflow.cli, next to the cost of importing the agents SDK (what every run
+used to pay before parsing its arguments). Also measures the per-record cost of a log
+call made on the event loop with queued logging (workflow.log_queue) versus writing
+synchronously to the same file and stream handlers.
+
+    python -m workflow.startup_bench --repeat 10 --max-help-ms 500
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import io
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+from workflow.log_queue import FORMAT, setup_logging, stop_logging
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+COMMANDS: Dict[str, List[str]] = {
+    "interpreter": ["-c", "pass"],
+    "import_cli": ["-c", "import workflow.cli"],
+    "cli_help": ["-m", "workflow", "--help"],
+    "import_agents_sdk": ["-c", "import agents"],
+}
+
+
+def time_command(args: List[str], repeat: int) -> Dict[str, float]:
+    """Median/min wall time in ms of `python <args>` run from the project directory."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=PROJECT_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 1), "min_ms": round(min(samples), 1)}
+
+
+async def _emit(count: int) -> float:
+    log = logging.getLogger("workflow.startup_bench.emit")
+    start = time.perf_counter()
+    for i in range(count):
+        log.info("record %d of %d: %s", i, count, "x" * 80)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def log_emit_cost(records: int) -> Dict[str, float]:
+    """Microseconds per log call on the event loop: queued vs. synchronous handlers."""
+    root = logging.getLogger()
+    saved = (root.level, list(root.handlers))
+    stderr = sys.stderr
+    result = {}
+    try:
+        sys.stderr = io.StringIO()  # keep the stream handlers' output off the terminal
+        with tempfile.TemporaryDirectory(prefix="log-bench-") as tmp:
+            for h in list(root.handlers):
+                root.removeHandler(h)
+            root.setLevel(logging.INFO)
+            formatter = logging.Formatter(FORMAT)
+            handlers = [logging.FileHandler(Path(tmp) / "sync.log"), logging.StreamHandler()]
+            for handler in handlers:
+                handler.setFormatter(formatter)
+                root.addHandler(handler)
+            result["sync_us"] = round(asyncio.run(_emit(records)), 2)
+            for handler in handlers:
+                root.removeHandler(handler)
+                handler.close()
+
+            listener = setup_logging(tmp, "INFO", run_id="bench")
+            try:
+                result["queued_us"] = round(asyncio.run(_emit(records)), 2)
+            finally:
+                stop_logging(listener)
+    finally:
+        sys.stderr = stderr
+        for h in list(root.handlers):
+            root.removeHandler(h)
+        root.setLevel(saved[0])
+        for h in saved[1]:
+            root.addHandler(h)
+    return result
+
+
+def run_startup_bench(repeat: int = 5, records: int = 5000) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"repeat": repeat, "python": sys.version.split()[0]}
+    report["startup"] = {name: time_command(args, repeat) for name, args in COMMANDS.items()}
+    report["log_emit"] = dict(log_emit_cost(records), records=records)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure workflow CLI startup and logging cost")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per command (default 5)")
+    parser.add_argument("--records", type=int, default=5000, help="log records per logging mode (default 5000)")
+    parser.add_argument("--max-help-ms", type=float, default=None,
+                        help="fail (exit 1) if the median `python -m workflow --help` exceeds this")
+    parser.add_argument("--out", default=None, help="also write the JSON report here")
+    args = parser.parse_args(argv)
+    report = run_startup_bench(args.repeat, args.records)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    help_ms = report["startup"]["cli_help"]["median_ms"]
+    if args.max_help_ms is not None and help_ms > args.max_help_ms:
+        print(f"REGRESSION: `python -m workflow --help` took {help_ms} ms > {args.max_help_ms}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,504 @@
+"""
+Agent team definitions for the Bug Busters workflow.
+
+Two layouts are provided:
+- build_handoff_team: the original PM-routed team where every transition is an LLM handoff.
+- build_stage_agents + build_stages: one agent per DAG stage; gates are checked in code
+  by workflow.dag, so the Frontend and Backend stages run concurrently.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+from agents import Agent, RunConfig, RunHooks, Runner
+from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
+from tools.check_files_tool import check_files, check_paths
+from tools.file_tools import CHUNKED_WRITE_TOOLS, abort_unfinished_writes, ensure_dir
+from tools.load_test_tool import LoadThresholds, load_gate, load_test_backend
+from tools.project_validation_tool import validate_expected_tree, validate_tree
+from tools.workspace_root import workspace_root
+from tools.workspace_tools import reset_output_dirs, reset_workspace
+from tools.write_files_tool import write_files_tool
+from workflow.checkpoint import CheckpointJournal
+from workflow.context_pack import STAGE_CONTEXT, ContextPack
+from workflow.dag import DagScheduler, GateFailed, Stage, StageResult
+from workflow.instrumentation import Tracer, TracingHooks
+from workflow.resilience import CallPolicy, ResilientModel, StageTimeout, apply_call_policies, policy_for
+from workflow.stage_cache import StageCache
+from workflow.stages import STAGE_DEPS, STAGE_INPUTS, STAGE_OUTPUTS
+from workflow.tiering import ModelRouter
+
+logger = logging.getLogger(__name__)
+
+FILE_IO_LINE = (
+    "File IO: Write all of your deliverables in ONE write_files call; its report already verifies them "
+    "(no separate check_files call needed). Otherwise use Codex MCP with "
+    "{\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
+)
+LARGE_FILE_LINE = (
+    "For files over ~20 KB, write in pieces: open_text_file, append_text_chunk (in order), commit_text_file."
+)
+DONE_LINE = "When complete, reply with a one-line summary of the files you wrote. Do not ask questions."
+TESTER_HANDOFF_LINE = "Only when check_files returns ok: true, hand off to the Tester with transfer_to_tester."
+LOAD_TEST_STEP = (
+    "Only when check_files returns ok: true, call load_test_backend().\n"
+    "               If it returns ok: false, send its violations to the Backend Developer with "
+    "transfer_to_backend_developer and re-run it when they return.\n"
+    "               Only when load_test_backend returns ok: true, hand off to the Tester with transfer_to_tester."
+)
+
+
+def build_handoff_team(codex_mcp_server, context_pack: Optional[ContextPack] = None,
+                       load_test: bool = False) -> Agent:
+    """Build the PM-routed team and return the Project Manager (the entry agent).
+
+    With a `context_pack`, each specialist's instructions are RECOMMENDED_PROMPT_PREFIX, then
+    the shared project documents, then its role text (resolved on every turn, since the PM
+    writes the documents during the run). With `load_test`, the PM also gates the Backend on
+    load_test_backend before handing off to the Tester.
+    """
+    designer = Agent(
+        name="Designer",
+        instructions=(
+            f"""{RECOMMENDED_PROMPT_PREFIX}"""
+            "You are the Designer.\n"
+            "Your only source of truth is AGENT_TASKS.md and REQUIREMENTS.md from the Project Manager.\n"
+            "Do not assume anything not written there.\n\n"
+            "Deliverables (write to /design):\n"
+            "- design_spec.md – one page describing UI/UX layout\n"
+            "- wireframe.md – simple text/ASCII wireframe if specified\n\n"
+            "Keep the output short and implementation-friendly.\n"
+            "When complete, DO NOT give a final answer; hand off to the Project Manager with transfer_to_project_manager as the last line.\n"
+            "File IO: Create /design/design_spec.md and /design/wireframe.md in ONE write_files call.\n"
+            "If write_files is unavailable, then use Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
+        ),
+        # Avoid web search to reduce noisy image_url content
+        # tools=[WebSearchTool()],
+        tools=[write_files_tool("designer"), check_files],
+        mcp_servers=[codex_mcp_server],
+    )
+    logger.info("Designer agent created")
+
+    frontend = Agent(
+        name="Frontend Developer",
+        instructions=(
+            f"""{RECOMMENDED_PROMPT_PREFIX}"""
+            "Read AGENT_TASKS.md and design_spec.md. Implement exactly what is described.\n\n"
+            "Deliverables (write to /frontend):\n"
+            "- index.html\n- styles.css (or inline)\n- game.js (or main.js)\n\n"
+            "Follow the Designer's DOM structure; no extra features.\n"
+            "When complete, DO NOT give a final answer; hand off to the Project Manager with transfer_to_project_manager as the last line.\n"
+            "File IO: Write all of your deliverables in ONE write_files call; otherwise use Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
+        ),
+        tools=[write_files_tool("frontend"), check_files],
+        mcp_servers=[codex_mcp_server],
+    )
+    logger.info("Frontend Developer agent created")
+
+    backend = Agent(
+        name="Backend Developer",
+        instructions=(
+            f"""{RECOMMENDED_PROMPT_PREFIX}"""
+            "Read AGENT_TASKS.md and REQUIREMENTS.md. Implement the API endpoints.\n\n"
+            "Deliverables (write to /backend):\n"
+            "- package.json (with a start script)\n"
+            "- server.js (minimal API per requirements; in-memory storage)\n\n"
+            "Keep code simple and readable; no DB.\n"
+            "When complete, DO NOT give a final answer; hand off to the Project Manager with transfer_to_project_manager as the last line.\n"
+            "File IO: Write all of your deliverables in ONE write_files call; otherwise use Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
+        ),
+        tools=[write_files_tool("backend"), check_files],
+        mcp_servers=[codex_mcp_server],
+    )
+    logger.info("Backend Developer agent created")
+
+    tester = Agent(
+        name="Tester",
+        instructions=(
+            f"""{RECOMMENDED_PROMPT_PREFIX}"""
+            "Read AGENT_TASKS.md and TEST.md. Verify outputs meet acceptance criteria.\n\n"
+            "Deliverables (write to /tests):\n"
+            "- TEST_PLAN.md\n- test.sh (optional)\n\n"
+            "Keep it minimal.\n"
+            "When complete, DO NOT give a final answer; hand off to the Project Manager with transfer_to_project_manager as the last line.\n"
+            "File IO: Write all of your deliverables in ONE write_files call; otherwise use Codex MCP with {\"approval-policy\":\"never\",\"sandbox\":\"workspace-write\"}."
+        ),
+        tools=[write_files_tool("tester"), check_files],
+        mcp_servers=[codex_mcp_server],
+    )
+    logger.info("Tester agent created")
+
+    project_manager = Agent(
+        name="Project Manager",
+        instructions=(
+            f"""{RECOMMENDED_PROMPT_PREFIX}"""
+            """
+            You are the Project Manager.
+
+            Objective:
+            Convert the input task list into three project-root files the team will execute against.
+
+            Deliverables (write in project root):
+            - REQUIREMENTS.md
+            - TEST.md
+            - AGENT_TASKS.md
+
+            Process (STRICT, GATED, OWNERSHIP):
+            0) MANDATORY CLEANUP: call reset_output_dirs() at the start to remove any previous artifacts in design/, frontend/, backend/, tests/.
+            1) Ensure directories exist: design/, frontend/, backend/, tests/ (use ensure_dir).
+            2) Create the three ROOT files in ONE write_files call (ROOT ONLY; it rejects files inside subfolders).
+               Its result already VERIFIES them (same report as check_files).
+               If it returns ok: false, fix the files it lists and call write_files again.
+               Only when it returns ok: true, hand off to the Designer with transfer_to_designer.
+
+            3) Wait for the Designer to return. VERIFY design files exist using check_files(["design/design_spec.md", "design/wireframe.md"]).
+               If check_files returns ok: false, ask Designer to correct and re-check, then immediately transfer_to_designer.
+               Only when check_files returns ok: true, hand off to BOTH (MANDATORY):
+                  - Frontend Developer with transfer_to_frontend_developer
+                  - Backend Developer with transfer_to_backend_developer
+
+            4) MANDATORY ACK: Wait for BOTH Frontend and Backend to return (each must transfer_to_project_manager at least once).
+               VERIFY using check_files([
+                  "frontend/index.html", "frontend/styles.css", "frontend/game.js",
+                  "backend/server.js", "backend/package.json"
+               ]).
+               If check_files returns ok: false, request the owning agent to fix and re-check, then transfer to that agent.
+               Only when check_files returns ok: true, hand off to the Tester with transfer_to_tester.
+
+            5) When the Tester returns, perform FINAL VALIDATION using validate_expected_tree().
+               - If ok: true, you may conclude with a short final statement.
+               - If ok: false, route missing files to the proper agent based on their path:
+                   design/* -> transfer_to_designer; frontend/* -> transfer_to_frontend_developer; backend/* -> transfer_to_backend_developer; root files -> create them or fix via your own actions, then re-check.
+               - Do NOT produce a final answer until validate_expected_tree().ok is true.
+
+            Rules:
+            - You may only create ROOT files using write_files. You MUST NOT create or edit files in design/, frontend/, backend/, or tests/.
+            - When writing into a new subfolder, ensure the folder exists first using ensure_dir.
+            - Always use check_files and validate_expected_tree tools to verify gates before proceeding.
+            - Never proceed to the next step if check_files returns ok: false.
+            - Use precise, concise messages. Focus on actions and checks, not status monologues.
+            - Use transfer_to_designer (not transfer_to_designer()) - no parentheses.
+            - Do NOT produce a final answer until after step 4 (Tester returns). Always continue with the appropriate transfer token.
+            """
+        ),
+        # Omit reasoning settings for broad model compatibility
+        tools=[reset_output_dirs, ensure_dir, write_files_tool("project_manager"), check_files, validate_expected_tree],
+        handoffs=[designer, frontend, backend, tester],
+        mcp_servers=[codex_mcp_server],
+    )
+    if load_test:
+        project_manager.instructions = project_manager.instructions.replace(TESTER_HANDOFF_LINE, LOAD_TEST_STEP)
+        project_manager.tools.append(load_test_backend)
+    logger.info("Project Manager agent created")
+
+    if context_pack is not None:
+        for agent, stage in ((designer, "designer"), (frontend, "frontend"), (backend, "backend"), (tester, "tester")):
+            agent.instructions = context_pack.dynamic_instructions(
+                STAGE_CONTEXT[stage], agent.instructions, head=RECOMMENDED_PROMPT_PREFIX)
+
+    # Specialists return to PM
+    designer.handoffs = [project_manager]
+    frontend.handoffs = [project_manager]
+    backend.handoffs  = [project_manager]
+    tester.handoffs   = [project_manager]
+    logger.info("Handoff connections established")
+
+    return project_manager
+
+
+def build_stage_agents(codex_mcp_server) -> Dict[str, Agent]:
+    """Build one agent per DAG stage. No handoffs: routing is done by the scheduler."""
+    project_manager = Agent(
+        name="Project Manager",
+        instructions=(
+            "You are the Project Manager.\n"
+            "Convert the input task list into three project-root files the team will execute against:\n"
+            "- REQUIREMENTS.md\n- TEST.md\n- AGENT_TASKS.md (one section per role: Designer, Frontend Developer, "
+            "Backend Developer, Tester)\n\n"
+            "Resolve ambiguities with minimal assumptions; be specific.\n"
+            "Write all three files in ONE write_files call (ROOT ONLY); its report verifies them, "
+            "so only call it again to fix what it flags.\n"
+            "You MUST NOT create or edit files in design/, frontend/, backend/, or tests/.\n"
+            + DONE_LINE
+        ),
+        tools=[write_files_tool("project_manager"), check_files],
+    )
+
+    designer = Agent(
+        name="Designer",
+        instructions=(
+            "You are the Designer.\n"
+            "Your only source of truth is AGENT_TASKS.md and REQUIREMENTS.md from the Project Manager.\n"
+            "Do not assume anything not written there.\n\n"
+            "Deliverables (write to /design):\n"
+            "- design_spec.md – one page describing UI/UX layout\n"
+            "- wireframe.md – simple text/ASCII wireframe if specified\n\n"
+            "Keep the output short and implementation-friendly.\n"
+            + FILE_IO_LINE + "\n" + DONE_LINE
+        ),
+        tools=[write_files_tool("designer"), check_files],
+        mcp_servers=[codex_mcp_server],
+    )
+
+    frontend = Agent(
+        name="Frontend Developer",
+        instructions=(
+            "Read AGENT_TASKS.md and design_spec.md. Implement exactly what is described.\n\n"
+            "Deliverables (write to /frontend):\n"
+            "- index.html\n- styles.css\n- game.js\n\n"
+            "Follow the Designer's DOM structure; no extra features.\n"
+            + FILE_IO_LINE + "\n" + LARGE_FILE_LINE + "\n" + DONE_LINE
+        ),
+        tools=[write_files_tool("frontend"), *CHUNKED_WRITE_TOOLS, check_files],
+        mcp_servers=[codex_mcp_server],
+    )
+
+    backend = Agent(
+        name="Backend Developer",
+        instructions=(
+            "Read AGENT_TASKS.md and REQUIREMENTS.md. Implement the API endpoints.\n\n"
+            "Deliverables (write to /backend):\n"
+            "- package.json (with a start script)\n"
+            "- server.js (minimal API per requirements; in-memory storage)\n\n"
+            "Keep code simple and readable; no DB.\n"
+            + FILE_IO_LINE + "\n" + LARGE_FILE_LINE + "\n" + DONE_LINE
+        ),
+        tools=[write_files_tool("backend"), *CHUNKED_WRITE_TOOLS, check_files],
+        mcp_servers=[codex_mcp_server],
+    )
+
+    tester = Agent(
+        name="Tester",
+        instructions=(
+            "Read AGENT_TASKS.md and TEST.md. Verify outputs meet acceptance criteria.\n\n"
+            "Deliverables (write to /tests):\n"
+            "- TEST_PLAN.md\n- test.sh (optional)\n\n"
+            "Keep it minimal.\n"
+            + FILE_IO_LINE + "\n" + DONE_LINE
+        ),
+        tools=[write_files_tool("tester"), check_files, validate_expected_tree],
+        mcp_servers=[codex_mcp_server],
+    )
+
+    logger.info("Stage agents created")
+    return {
+        "project_manager": project_manager,
+        "designer": designer,
+        "frontend": frontend,
+        "backend": backend,
+        "tester": tester,
+    }
+
+
+def stage_gate(name: str, load_thresholds: Optional[LoadThresholds] = None):
+    """Deterministic gate for a stage: its outputs exist and pass their content checks
+    (and, for the Tester, the full tree). Reports what changed since the last attempt.
+
+    With `load_thresholds`, the Backend gate also load-tests the generated server
+    (tools.load_test_tool) and fails on a threshold violation.
+    """
+    if name == "backend" and load_thresholds is not None:
+        async def load_gate_() -> dict:
+            result = check_paths(STAGE_OUTPUTS[name], gate=name)
+            if not result["ok"]:
+                return result
+            report = await load_gate("backend", load_thresholds, **LOAD_GATE_OPTIONS)
+            logger.info("Backend load test: ok=%s rps=%s latency=%s memory=%s", report["ok"],
+                        report.get("rps"), report.get("latency_ms"), report.get("memory"))
+            if report["ok"]:
+                return dict(result, load_test=report)
+            return dict(result, ok=False, load_test=report,
+                        invalid={"backend/server.js": "failed the load test: " + "; ".join(report["violations"])})
+        return load_gate_
+
+    def gate() -> dict:
+        result = check_paths(STAGE_OUTPUTS[name], gate=name)
+        if name == "tester":
+            tree = validate_tree(gate="tester:tree")
+            result = dict(
+                result,
+                ok=result["ok"] and tree["ok"],
+                missing=result["missing"] + tree["missing"],
+                invalid={**result["invalid"], **tree["invalid"]},
+                changed=result["changed"] + tree["changed"],
+            )
+        return result
+    return gate
+
+
+# How the Backend load gate drives the server (see tools.load_test_tool.run_load_test).
+LOAD_GATE_OPTIONS = {"duration_s": 5.0, "concurrency": 16}
+
+
+def stage_input(name: str, task_list: str, feedback: Optional[str]) -> str:
+    if name == "project_manager":
+        text = task_list
+    else:
+        text = (
+            "Produce your deliverables for this project. The project-root files "
+            "(REQUIREMENTS.md, TEST.md, AGENT_TASKS.md) are already written.\n\n"
+            f"Original task list:\n{task_list}"
+        )
+    text += (
+        f"\n\nWorkspace root: {workspace_root()}. Relative paths in file tools resolve against it; "
+        "if you use Codex MCP, pass it as \"cwd\"."
+    )
+    if feedback:
+        text += f"\n\n{feedback}"
+    return text
+
+
+def agent_fingerprint(agent: Agent) -> List[str]:
+    """Everything about an agent that shapes its output: instructions, model, settings, tools."""
+    settings = agent.model_settings.to_json_dict() if agent.model_settings else {}
+    return [
+        agent.name,
+        str(agent.instructions),
+        str(agent.model),
+        json.dumps(settings, sort_keys=True, default=str),
+        ",".join(sorted(getattr(t, "name", type(t).__name__) for t in agent.tools)),
+    ]
+
+
+def build_stages(
+    agents: Dict[str, Agent],
+    task_list: str,
+    max_turns: int = 30,
+    hooks: Optional[RunHooks] = None,
+    run_config: Optional[RunConfig] = None,
+    context_pack: Optional[ContextPack] = None,
+    stage_timeouts: Optional[Dict[str, Optional[float]]] = None,
+    load_thresholds: Optional[LoadThresholds] = None,
+) -> List[Stage]:
+    """Describe PM -> Designer -> {Frontend, Backend} -> Tester as DAG stages.
+
+    With a `context_pack`, a stage's agent gets the shared project documents (built once its
+    dependencies' gates have passed) ahead of its role instructions. `stage_timeouts` bounds
+    a whole stage, all of its attempts and turns: the clock starts with the first attempt,
+    each retry gets only what is left, and StageTimeout is raised once it runs out.
+    With `load_thresholds`, the Backend gate includes a load test.
+    """
+    deadlines: Dict[str, float] = {}
+
+    def runner(name: str):
+        async def run(feedback: Optional[str]):
+            agent = agents[name]
+            if context_pack is not None and STAGE_CONTEXT[name]:
+                agent = agent.clone(instructions=context_pack.instructions(STAGE_CONTEXT[name], agent.instructions))
+            run = Runner.run(agent, stage_input(name, task_list, feedback),
+                             max_turns=max_turns, hooks=hooks, run_config=run_config)
+            budget = (stage_timeouts or {}).get(name)
+            if budget is None:
+                with abort_unfinished_writes():
+                    return await run
+            if feedback is None or name not in deadlines:  # first attempt starts the stage clock
+                deadlines[name] = time.monotonic() + budget
+            remaining = deadlines[name] - time.monotonic()
+            if remaining <= 0:
+                run.close()
+                raise StageTimeout(name, budget)
+            try:
+                with abort_unfinished_writes():
+                    return await asyncio.wait_for(run, remaining)
+            except asyncio.TimeoutError:
+                raise StageTimeout(name, budget) from None
+        return run
+
+    def cache_key(name: str):
+        inputs = list(STAGE_INPUTS[name])
+        if context_pack is not None:
+            inputs += [doc for doc in STAGE_CONTEXT[name] if doc not in inputs]
+        fingerprint = ["context-pack" if context_pack is not None else "no-context-pack"]
+        return lambda: StageCache.key(agent_fingerprint(agents[name]) + fingerprint + [task_list], inputs)
+
+    return [
+        Stage(
+            name=name,
+            run=runner(name),
+            deps=STAGE_DEPS[name],
+            gate=stage_gate(name, load_thresholds),
+            outputs=STAGE_OUTPUTS[name],
+            cache_key=cache_key(name),
+            ready=lambda name=name: check_paths(STAGE_OUTPUTS[name]),
+        )
+        for name in STAGE_DEPS
+    ]
+
+
+def stage_turns(result: StageResult) -> int:
+    """Model turns used by a stage across all of its attempts (0 when restored or resumed)."""
+    return sum(len(getattr(o, "raw_responses", None) or []) for o in result.attempt_outputs)
+
+
+async def run_stage_pipeline(
+    codex_mcp_server,
+    task_list: str,
+    max_turns: int = 30,
+    cache: Optional[StageCache] = None,
+    invalidate: Iterable[str] = (),
+    tracer: Optional[Tracer] = None,
+    run_config: Optional[RunConfig] = None,
+    checkpoint: Optional[CheckpointJournal] = None,
+    resume: bool = False,
+    shared_context: bool = True,
+    call_policies: Optional[Dict[str, CallPolicy]] = None,
+    speculative: bool = False,
+    load_thresholds: Optional[LoadThresholds] = None,
+    router: Optional[ModelRouter] = None,
+) -> DagScheduler:
+    """Reset the active workspace and run every stage; returns the finished scheduler.
+
+    With `resume`, the workspace is kept and stages the checkpoint journal covers are skipped.
+    With `shared_context`, stages after the PM get the shared project documents (a ContextPack)
+    as a common prompt prefix. With `call_policies`, every agent's model calls get timeouts,
+    retries and hedging (workflow.resilience) and each stage its time budget. With
+    `speculative`, stages start in a scratch workspace as soon as their inputs are written.
+    With `load_thresholds`, the Backend gate load-tests the generated server. With `router`,
+    each agent runs on its current model tier and the stage outcomes are recorded afterwards.
+    """
+    if resume:
+        if checkpoint is None:
+            raise ValueError("resume requires a checkpoint journal")
+        logger.info("Resuming run %s in %s", checkpoint.run_id, workspace_root())
+    else:
+        reset = reset_workspace()
+        logger.info("Workspace reset: root=%s removed=%s", reset["cwd"], reset["removed"])
+
+    agents = build_stage_agents(codex_mcp_server)
+    if router is not None:
+        router.assign(agents)
+    models: Dict[str, ResilientModel] = {}
+    stage_timeouts: Dict[str, Optional[float]] = {}
+    if call_policies is not None:
+        models = apply_call_policies(agents.values(), call_policies, run_config)
+        stage_timeouts = {name: policy_for(call_policies, agent.name).stage_timeout_s for name, agent in agents.items()}
+    hooks = TracingHooks(tracer) if tracer is not None else None
+    stages = build_stages(agents, task_list, max_turns=max_turns, hooks=hooks, run_config=run_config,
+                          context_pack=ContextPack() if shared_context else None, stage_timeouts=stage_timeouts,
+                          load_thresholds=load_thresholds)
+    scheduler = DagScheduler(stages, cache=cache, invalidate=invalidate, tracer=tracer, checkpoint=checkpoint,
+                             speculative=speculative)
+    if scheduler.resumable:
+        logger.info("Skipping stages covered by the checkpoint: %s", sorted(scheduler.resumable))
+    failed: List[str] = []
+    try:
+        await scheduler.run()
+    except BaseException as exc:
+        if isinstance(exc, (GateFailed, StageTimeout)):
+            failed.append(exc.stage)
+        if checkpoint is not None:
+            checkpoint.finish("failed", f"{type(exc).__name__}: {exc}")
+        raise
+    finally:
+        if router is not None:
+            router.record(scheduler.results, failed=failed,
+                          turns={name: stage_turns(r) for name, r in scheduler.results.items()})
+        if models:
+            logger.info("Model call metrics: %s", {n: m.stats for n, m in models.items()})
+        if speculative:
+            logger.info("Speculation: %s", scheduler.speculation)
+    if checkpoint is not None:
+        checkpoint.finish("ok")
+    return scheduler
@@ -0,0 +1,198 @@
+"""
+Adaptive per-agent model tiers.
+
+Each agent runs on a tier (fast -> standard -> strong) picked from a local stats store
+that records every stage outcome: whether its gate passed on the first attempt, the
+turns it used and its wall time.
+
+- A gate failure (or a failed stage) escalates the agent one tier, up to its ceiling.
+- `demote_after` consecutive first-try passes demote it one tier, down to its floor.
+  Each past failure at the lower tier adds another `demote_after` passes to that bar,
+  so an agent that keeps failing on the cheap model stops bouncing back to it.
+
+    router = ModelRouter(load_tiering_config("tiers.json"), TierStats(".workflow_stats"))
+    router.assign(agents)            # agent.model (+ reasoning effort) from each tier
+    ...                              # run the stages
+    router.record(scheduler.results, failed=...)
+
+The config is JSON ({"tiers": [{"name", "model", "reasoning_effort"}], "agents": {name:
+{"start", "floor", "ceiling"}}, "demote_after": n}); missing parts use the defaults below.
+"""
+from __future__ import annotations
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from agents import Agent, ModelSettings
+from openai.types.shared import Reasoning
+from tools.file_tools import atomic_write
+from workflow.dag import StageResult
+
+logger = logging.getLogger(__name__)
+
+STATS_DIR = ".workflow_stats"
+HISTORY_LIMIT = 50  # outcomes kept per agent
+
+
+@dataclass(frozen=True)
+class Tier:
+    name: str
+    model: str
+    reasoning_effort: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class AgentTiers:
+    start: str = "standard"
+    floor: str = "fast"
+    ceiling: str = "strong"
+
+
+@dataclass
+class TieringConfig:
+    tiers: List[Tier] = field(default_factory=lambda: [
+        Tier("fast", "gpt-5-mini", "low"),
+        Tier("standard", "gpt-5"),
+        Tier("strong", "gpt-5", "high"),
+    ])
+    # Keyed by agent name; "*" applies to agents without an entry.
+    agents: Dict[str, AgentTiers] = field(default_factory=lambda: {
+        "*": AgentTiers(),
+        # Mostly mechanical: three structured files from the task list.
+        "Project Manager": AgentTiers(start="fast"),
+    })
+    demote_after: int = 3
+
+    def names(self) -> List[str]:
+        return [t.name for t in self.tiers]
+
+    def tier(self, name: str) -> Tier:
+        for t in self.tiers:
+            if t.name == name:
+                return t
+        raise KeyError(f"Unknown tier {name!r}; known: {self.names()}")
+
+    def bounds(self, agent: str) -> AgentTiers:
+        return self.agents.get(agent) or self.agents.get("*") or AgentTiers()
+
+
+def load_tiering_config(path: Optional[Path | str] = None) -> TieringConfig:
+    """TieringConfig from JSON, falling back to the defaults for anything not given."""
+    config = TieringConfig()
+    if path is None:
+        return config
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if "tiers" in data:
+        config.tiers = [Tier(**t) for t in data["tiers"]]
+    for agent, bounds in data.get("agents", {}).items():
+        config.agents[agent] = AgentTiers(**bounds)
+    if "demote_after" in data:
+        config.demote_after = int(data["demote_after"])
+    names = config.names()
+    for agent, bounds in config.agents.items():
+        unknown = {bounds.start, bounds.floor, bounds.ceiling} - set(names)
+        if unknown:
+            raise ValueError(f"Agent {agent!r} uses unknown tiers {sorted(unknown)}; known: {names}")
+    return config
+
+
+class TierStats:
+    """Per-agent tier state and recent outcomes, persisted as one JSON file."""
+
+    def __init__(self, root: Path | str = STATS_DIR):
+        self.path = Path(root) / "tiers.json"
+        self._lock = threading.Lock()
+        self.data: Dict[str, Dict[str, Any]] = {}
+        if self.path.is_file():
+            try:
+                self.data = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning("Ignoring unreadable tier stats at %s", self.path)
+
+    def agent(self, name: str) -> Dict[str, Any]:
+        return self.data.setdefault(name, {"tier": None, "streak": 0, "failures": {}, "history": []})
+
+    def save(self) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path, [json.dumps(self.data, indent=2, sort_keys=True).encode("utf-8")])
+
+
+class ModelRouter:
+    def __init__(self, config: TieringConfig, stats: TierStats):
+        self.config = config
+        self.stats = stats
+        self.assigned: Dict[str, str] = {}  # stage -> agent name
+
+    def current(self, agent: str) -> str:
+        tier = self.stats.agent(agent)["tier"]
+        return tier if tier in self.config.names() else self.config.bounds(agent).start
+
+    def assign(self, agents: Dict[str, Agent]) -> Dict[str, str]:
+        """Set each agent's model (and reasoning effort) from its current tier; returns {agent: tier}."""
+        tiers = {}
+        for stage, agent in agents.items():
+            tier = self.config.tier(self.current(agent.name))
+            agent.model = tier.model
+            if tier.reasoning_effort:
+                agent.model_settings = agent.model_settings.resolve(
+                    ModelSettings(reasoning=Reasoning(effort=tier.reasoning_effort)))
+            self.assigned[stage] = agent.name
+            tiers[agent.name] = tier.name
+        logger.info("Model tiers: %s", {name: f"{t} ({self.config.tier(t).model})" for name, t in tiers.items()})
+        return tiers
+
+    def _step(self, tier: str, delta: int, agent: str) -> str:
+        names = self.config.names()
+        bounds = self.config.bounds(agent)
+        low, high = names.index(bounds.floor), names.index(bounds.ceiling)
+        return names[max(low, min(high, names.index(tier) + delta))]
+
+    def observe(self, agent: str, first_try: bool, attempts: int = 1, turns: int = 0,
+                duration_s: float = 0.0) -> str:
+        """Record one stage outcome for `agent` and move its tier; returns the tier for next time."""
+        state = self.stats.agent(agent)
+        tier = self.current(agent)
+        state["history"] = (state["history"] + [{
+            "ts": round(time.time(), 3), "tier": tier, "first_try": first_try,
+            "attempts": attempts, "turns": turns, "duration_s": round(duration_s, 3),
+        }])[-HISTORY_LIMIT:]
+        if not first_try:
+            state["failures"][tier] = state["failures"].get(tier, 0) + 1
+            state["streak"] = 0
+            new = self._step(tier, +1, agent)
+        else:
+            state["streak"] += 1
+            lower = self._step(tier, -1, agent)
+            needed = self.config.demote_after * (1 + state["failures"].get(lower, 0))
+            new = tier
+            if lower != tier and state["streak"] >= needed:
+                new, state["streak"] = lower, 0
+        if new != tier:
+            logger.info("Tier for %s: %s -> %s (%s)", agent, tier, new,
+                        "gate failure" if not first_try else f"{needed} first-try passes")
+        state["tier"] = new
+        return new
+
+    def record(self, results: Dict[str, StageResult], failed: Iterable[str] = (),
+               turns: Optional[Dict[str, int]] = None) -> Dict[str, str]:
+        """Feed a run's stage results (and stages that failed outright) into the stats store.
+
+        Cached and resumed stages say nothing about the model and are skipped.
+        """
+        changes = {}
+        turns = turns or {}
+        for stage, result in results.items():
+            if stage not in self.assigned or result.cached or result.resumed:
+                continue
+            changes[self.assigned[stage]] = self.observe(
+                self.assigned[stage], first_try=result.attempts == 1, attempts=result.attempts,
+                turns=turns.get(stage, 0), duration_s=result.duration_s)
+        for stage in failed:
+            if stage in self.assigned and stage not in results:
+                changes[self.assigned[stage]] = self.observe(self.assigned[stage], first_try=False, attempts=0)
+        self.stats.save()
+        return changes